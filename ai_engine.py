@@ -5,10 +5,24 @@ Handles communication with Ollama and manages AI-powered
 text analysis and editing processes.
 """
 
-import requests
-from typing import List, Dict, Any
+import contextlib
+import os
+import time
+import httpx
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable
 from fastapi import HTTPException
 
+from .draft_chunker import chunk_context, edit_chunks_in_order, split_draft
+from .generation_scheduler import GenerationScheduler
+from .health_monitor import HealthMonitor
+from .llm_backend import LLMBackend, OllamaPool, parse_endpoints
+from .metrics import GenerationMetrics, MetricsRegistry
+from .ollama_client import OllamaClient, OllamaError
+from .prompt_budget import PromptBudget
+from .prompt_cache_stats import PromptCacheStats
+from .style_cache import StyleGuideCache
+from .tracing import Tracer
+
 
 class AIEngine:
     """
@@ -18,18 +32,63 @@ class AIEngine:
     high-level methods for style analysis and content improvement.
     """
     
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3:8b"):
+    # Streamed tokens between progress reports in process_complete_workflow
+    PROGRESS_EVERY_TOKENS = 50
+    
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        model: str = "llama3:8b",
+        client: Optional[LLMBackend] = None,
+        style_cache: Optional[StyleGuideCache] = None,
+        scheduler: Optional[GenerationScheduler] = None,
+        prompt_budget: Optional[PromptBudget] = None,
+        chunk_tokens: Optional[int] = None,
+        chunk_concurrency: Optional[int] = None,
+        keep_alive: Optional[str] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        tracer: Optional[Tracer] = None
+    ):
         """
         Initialize the AI engine.
         
         Args:
-            base_url (str): Ollama server base URL
+            base_url (str): Ollama server base URL, used when ``OLLAMA_HOSTS``
+                does not list several
             model (str): Model name to use for generation
+            client (LLMBackend): Generation backend; if omitted, an ``OllamaPool``
+                over the configured servers is created
+            style_cache (StyleGuideCache): Style guide cache; one is created if omitted
+            scheduler (GenerationScheduler): Admission control for generations;
+                one is created if omitted
+            prompt_budget (PromptBudget): Token budget for reference articles
+                in prompts; one is created if omitted
+            chunk_tokens (int): Drafts longer than this many estimated tokens
+                are edited in chunks (``EDIT_CHUNK_TOKENS``)
+            chunk_concurrency (int): Chunks of one draft edited at the same
+                time (``EDIT_CHUNK_CONCURRENCY``)
+            keep_alive (str): How long Ollama keeps the model, and with it the
+                cached prompt prefix, loaded after a request (``OLLAMA_KEEP_ALIVE``)
+            metrics (MetricsRegistry): Registry for generation metrics; one is
+                created if omitted
+            tracer (Tracer): Records per-stage spans; one is created if omitted
         """
         self.base_url = base_url
         self.model = model
-        self.generate_url = f"{base_url}/api/generate"
-        self.health_url = f"{base_url}/"
+        self.client = client or OllamaPool(parse_endpoints(os.getenv("OLLAMA_HOSTS"), base_url), OllamaClient)
+        self.style_cache = style_cache or StyleGuideCache()
+        self.scheduler = scheduler or GenerationScheduler()
+        self.prompt_budget = prompt_budget or PromptBudget()
+        self.chunk_tokens = chunk_tokens or int(os.getenv("EDIT_CHUNK_TOKENS", 1200))
+        self.chunk_concurrency = chunk_concurrency or int(os.getenv("EDIT_CHUNK_CONCURRENCY", 3))
+        self.keep_alive = keep_alive or os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        self.prompt_cache_stats = PromptCacheStats()
+        self.metrics = metrics or MetricsRegistry()
+        if isinstance(self.client, OllamaPool) and self.client.observer is None:
+            self.client.observer = GenerationMetrics(self.metrics).observe
+        self.tracer = tracer or Tracer()
+        self.generate_path = "/api/generate"
+        self.health_monitor = HealthMonitor(self.client, model)
         
         # Generation parameters
         self.generation_params = {
@@ -38,43 +97,74 @@ class AIEngine:
             "num_predict": 2000
         }
     
-    async def health_check(self) -> Dict[str, Any]:
+    async def health_check(self, deep: bool = False) -> Dict[str, Any]:
         """
-        Check if Ollama service is available and working.
+        Report AI service health from the background monitor's last probe.
         
+        Args:
+            deep (bool): Also run (or reuse a recent) tiny test generation
+            
         Returns:
             Dict[str, Any]: Health check results
         """
-        try:
-            # Check if Ollama is running
-            health_response = requests.get(self.health_url, timeout=5)
-            if health_response.status_code != 200:
-                return {
-                    "status": "error",
-                    "message": "Ollama server not responding",
-                    "details": f"HTTP {health_response.status_code}"
-                }
-            
-            # Test model generation
-            test_response = await self._generate_text("Say hello in one sentence.")
+        state = self.health_monitor.snapshot()
+        probe_info = {"checked_at": state["checked_at"], "age_seconds": state["age_seconds"]}
+        
+        if not state["ollama_up"]:
             return {
-                "status": "success",
-                "message": "AI engine is operational",
-                "test_output": test_response[:100] + "..." if len(test_response) > 100 else test_response
+                "status": "error",
+                "message": "Ollama server not responding",
+                "details": state["error"],
+                **probe_info
             }
-        except Exception as e:
+        
+        if not state["model_available"]:
             return {
                 "status": "error",
-                "message": str(e),
-                "details": "Failed to connect to AI service"
+                "message": f"Model {self.model} is not available",
+                "details": state["error"],
+                **probe_info
             }
+        
+        result = {"status": "success", "message": "AI engine is operational", **probe_info}
+        
+        if deep:
+            deep_state = await self.health_monitor.deep_check()
+            if deep_state["status"] != "success":
+                return {
+                    "status": "error",
+                    "message": "Test generation failed",
+                    "details": deep_state["error"],
+                    **probe_info
+                }
+            result["test_output"] = deep_state["output"]
+        
+        return result
     
-    async def analyze_writing_style(self, reference_articles: List[str]) -> str:
+    async def analyze_writing_style(
+        self,
+        reference_articles: List[str],
+        retry: bool = False,
+        holding_slot: bool = False,
+        fitted: bool = False
+    ) -> str:
         """
         Analyze writing style from reference articles.
         
+        References over the prompt budget are reduced to representative
+        excerpts first, unless ``fitted`` says the caller already ran them
+        through ``prompt_budget.fit`` (to report what was cut). Results are cached by a hash of the normalized
+        (budgeted) references, model and generation parameters, so repeated
+        reference sets skip the LLM. A generation slot is only taken on a
+        cache miss, so call it without holding one unless ``holding_slot``.
+        Concurrent misses only share an analysis with callers that wait for
+        a slot the same way, so a slot holder never waits on another slot.
+        
         Args:
             reference_articles (List[str]): List of reference article texts
+            retry (bool): Wait for a slot instead of failing when the queue is full
+            holding_slot (bool): The caller already holds a generation slot
+            fitted (bool): The references are already fitted to the budget
             
         Returns:
             str: Style analysis and guide
@@ -82,8 +172,22 @@ class AIEngine:
         if not reference_articles:
             raise HTTPException(status_code=400, detail="No reference articles provided")
         
-        prompt = self._create_style_analysis_prompt(reference_articles)
-        return await self._generate_text(prompt)
+        with self.tracer.span("analyze_style", references=len(reference_articles)) as span:
+            references = reference_articles if fitted else self.prompt_budget.fit(reference_articles)[0]
+            cache_key = self.style_cache.make_key(references, self.model, self.generation_params)
+            span.set_attribute("cached", True)
+            
+            async def analyze() -> str:
+                span.set_attribute("cached", False)
+                with self.tracer.span("prompt_build"):
+                    prompt = self._create_style_analysis_prompt(references)
+                if holding_slot:
+                    return await self._generate_text(prompt)
+                async with self.generation_slot(retry=retry):
+                    return await self._generate_text(prompt)
+            
+            slot_policy = "held" if holding_slot else ("retry" if retry else "fail")
+            return await self.style_cache.get_or_compute(cache_key, analyze, slot_policy)
     
     async def edit_content(self, draft_content: str, style_guide: str) -> str:
         """
@@ -99,60 +203,239 @@ class AIEngine:
         if not draft_content or not style_guide:
             raise HTTPException(status_code=400, detail="Missing content or style guide")
         
+        with self.tracer.span("edit_content", draft_chars=len(draft_content)):
+            with self.tracer.span("prompt_build"):
+                prompt = self._create_editing_prompt(draft_content, style_guide)
+                prefix = self._create_editing_prefix(style_guide)
+            return await self._generate_text(prompt, prefix)
+    
+    async def stream_edit_content(self, draft_content: str, style_guide: str) -> AsyncIterator[str]:
+        """
+        Edit content according to the style guide, yielding tokens as they arrive.
+        
+        Args:
+            draft_content (str): Original draft content
+            style_guide (str): Style guide from analysis
+            
+        Yields:
+            str: Generated text fragments in order
+        """
+        if not draft_content or not style_guide:
+            raise HTTPException(status_code=400, detail="Missing content or style guide")
+        
         prompt = self._create_editing_prompt(draft_content, style_guide)
-        return await self._generate_text(prompt)
+        async for token in self._stream_text(prompt, self._create_editing_prefix(style_guide)):
+            yield token
     
-    async def process_complete_workflow(self, reference_articles: List[str], draft_content: str) -> str:
+    def split_draft(self, draft_content: str) -> List[str]:
+        """
+        Split a draft into the chunks it is edited in.
+        
+        Args:
+            draft_content (str): Draft content
+        
+        Returns:
+            List[str]: Chunks in order; the whole draft if it is short enough
+        """
+        return split_draft(draft_content, self.chunk_tokens)
+    
+    async def edit_long_content(
+        self,
+        draft_content: str,
+        style_guide: str,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        retry: bool = True
+    ) -> str:
+        """
+        Edit a draft of any length, taking generation slots as needed.
+        
+        Drafts within ``chunk_tokens`` are edited in one generation. Longer
+        drafts are split on heading and paragraph boundaries and the chunks
+        are edited concurrently against the same style guide, so no single
+        generation runs into ``num_predict`` or the request timeout. Call it
+        without holding a generation slot.
+        
+        Args:
+            draft_content (str): Original draft content
+            style_guide (str): Style guide from analysis
+            on_progress (Callable): Optional callback receiving chunk progress
+            retry (bool): Wait for a slot instead of failing when the queue is full
+        
+        Returns:
+            str: Edited content
+        """
+        if not draft_content or not style_guide:
+            raise HTTPException(status_code=400, detail="Missing content or style guide")
+        
+        chunks = self.split_draft(draft_content)
+        if len(chunks) == 1:
+            async with self.generation_slot(retry=retry):
+                return await self.edit_content(draft_content, style_guide)
+        
+        parts = []
+        async for part in self.stream_edited_chunks(chunks, style_guide, on_progress, retry):
+            parts.append(part)
+        return "".join(parts)
+    
+    def stream_edited_chunks(
+        self,
+        chunks: List[str],
+        style_guide: str,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        retry: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Edit draft chunks concurrently, yielding the stitched result in order.
+        
+        At most ``chunk_concurrency`` chunks are edited at a time, each in its
+        own generation slot. Each edited chunk is yielded once every chunk
+        before it is done, already joined to its predecessor by the
+        continuity pass. A failed chunk fails the edit and cancels the rest.
+        
+        Args:
+            chunks (List[str]): Draft chunks from ``split_draft``
+            style_guide (str): Style guide from analysis
+            on_progress (Callable): Optional callback receiving chunk progress
+            retry (bool): Wait for a slot instead of failing when the queue is full
+        
+        Returns:
+            AsyncIterator[str]: Consecutive pieces of the edited document
+        """
+        prefix = self._create_editing_prefix(style_guide)
+        
+        async def edit_chunk(index: int) -> str:
+            with self.tracer.span("edit_chunk", index=index, chunks=len(chunks)):
+                with self.tracer.span("prompt_build"):
+                    prompt = self._create_chunk_editing_prompt(chunks, index, style_guide)
+                async with self.generation_slot(retry=retry):
+                    return await self._generate_text(prompt, prefix)
+        
+        return edit_chunks_in_order(chunks, edit_chunk, self.chunk_concurrency, on_progress)
+
+    async def process_complete_workflow(
+        self,
+        reference_articles: List[str],
+        draft_content: str,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        style_guide: Optional[str] = None
+    ) -> str:
         """
         Complete workflow: analyze style and edit content.
         
+        Generation slots are taken as needed, so call it without holding
+        one. Long drafts are edited in chunks (see ``edit_long_content``).
+        With ``on_progress`` a single-chunk edit is streamed, so a long
+        generation is never cut off by the overall request timeout, and the
+        callback receives stage changes and a running token or chunk count.
+        
         Args:
             reference_articles (List[str]): Reference articles for style analysis
             draft_content (str): Draft content to edit
+            on_progress (Callable): Optional progress callback taking an event dict
+            style_guide (str): Precomputed style guide (e.g. from a stored
+                profile); skips the analysis step
             
         Returns:
             str: Final edited content
         """
+        report = on_progress or (lambda event: None)
+        
         # Step 1: Analyze writing style
-        style_guide = await self.analyze_writing_style(reference_articles)
+        if not style_guide:
+            report({"stage": "analyzing"})
+            style_guide = await self.analyze_writing_style(reference_articles, retry=True)
         
         # Step 2: Edit content using style guide
-        edited_content = await self.edit_content(draft_content, style_guide)
+        if on_progress is None or len(self.split_draft(draft_content)) > 1:
+            return await self.edit_long_content(draft_content, style_guide, on_progress)
+        
+        async with self.generation_slot(retry=True):
+            report({"stage": "editing", "tokens": 0})
+            parts = []
+            with self.tracer.span("edit_content", draft_chars=len(draft_content), stream=True):
+                async for token in self.stream_edit_content(draft_content, style_guide):
+                    parts.append(token)
+                    if len(parts) % self.PROGRESS_EVERY_TOKENS == 0:
+                        report({"stage": "editing", "tokens": len(parts)})
+        
+        return "".join(parts).strip()
+    
+    @contextlib.asynccontextmanager
+    async def generation_slot(self, retry: bool = False) -> AsyncIterator[None]:
+        """
+        Hold a generation slot, recording the time spent queued as a span.
         
-        return edited_content
+        Args:
+            retry (bool): Wait for a slot instead of failing when the queue is full
+        """
+        async with self.scheduler.slot(retry=retry) as ticket:
+            self.tracer.record("queue_wait", ticket.wait_time)
+            yield
+    
+    async def start(self) -> None:
+        """Start background health probing of Ollama and, for a pool, of each server."""
+        await self.health_monitor.start()
+        if isinstance(self.client, OllamaPool):
+            await self.client.start()
+    
+    def backend_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get the load and health of each Ollama server.
+        
+        Returns:
+            List[Dict[str, Any]]: One entry per server
+        """
+        if isinstance(self.client, OllamaPool):
+            return self.client.stats()
+        return [{"url": self.base_url}]
     
-    async def _generate_text(self, prompt: str) -> str:
+    async def close(self) -> None:
+        """Stop health probing and release pooled connections held by the Ollama client."""
+        await self.health_monitor.stop()
+        await self.client.aclose()
+    
+    async def _generate_text(self, prompt: str, prefix: str = "") -> str:
         """
         Generate text using Ollama API.
         
         Args:
             prompt (str): Input prompt for generation
+            prefix (str): Static start of the prompt, for prompt cache stats
             
         Returns:
             str: Generated text response
         """
+        route_key = self._route_key(prefix)
         try:
-            response = requests.post(
-                self.generate_url,
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": self.generation_params
-                },
-                timeout=120  # 2 minute timeout
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "").strip()
-            else:
-                error_detail = f"AI API error: {response.status_code} - {response.text}"
-                raise HTTPException(status_code=500, detail=error_detail)
+            with self.tracer.span("generate", model=self.model, prompt_chars=len(prompt)):
+                response = await self.client.post(
+                    self.generate_path,
+                    json={
+                        "model": self.model,
+                        "prompt": prompt,
+                        "stream": False,
+                        "keep_alive": self.keep_alive,
+                        "options": self.generation_params
+                    },
+                    route_key=route_key
+                )
                 
-        except requests.exceptions.Timeout:
+                if response.status_code == 200:
+                    with self.tracer.span("parse"):
+                        result = response.json()
+                        self.prompt_cache_stats.record(prefix, prompt, result, route_key)
+                        text = result.get("response", "").strip()
+                    self.tracer.record_ollama_phases(result)
+                    return text
+                else:
+                    error_detail = f"AI API error: {response.status_code} - {response.text}"
+                    raise HTTPException(status_code=500, detail=error_detail)
+                
+        except HTTPException:
+            raise
+        except httpx.TimeoutException:
             raise HTTPException(status_code=500, detail="AI request timed out")
-        except requests.exceptions.ConnectionError:
+        except httpx.ConnectError:
             raise HTTPException(
                 status_code=500,
                 detail="Could not connect to AI service. Make sure Ollama is running."
@@ -160,6 +443,79 @@ class AIEngine:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"AI processing error: {str(e)}")
     
+    async def _stream_text(self, prompt: str, prefix: str = "") -> AsyncIterator[str]:
+        """
+        Generate text using Ollama's streaming API.
+        
+        Args:
+            prompt (str): Input prompt for generation
+            prefix (str): Static start of the prompt, for prompt cache stats
+            
+        Yields:
+            str: Generated text fragments as soon as Ollama emits them
+        """
+        started = time.perf_counter()
+        route_key = self._route_key(prefix)
+        try:
+            async for chunk in self.client.stream_generate({
+                "model": self.model,
+                "prompt": prompt,
+                "keep_alive": self.keep_alive,
+                "options": self.generation_params
+            }, route_key=route_key):
+                token = chunk.get("response", "")
+                if token:
+                    yield token
+                if chunk.get("done"):
+                    self.prompt_cache_stats.record(prefix, prompt, chunk, route_key)
+                    self.tracer.record("generate", time.perf_counter() - started, model=self.model, stream=True)
+                    self.tracer.record_ollama_phases(chunk)
+        except OllamaError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        except httpx.TimeoutException:
+            raise HTTPException(status_code=500, detail="AI request timed out")
+        except httpx.ConnectError:
+            raise HTTPException(
+                status_code=500,
+                detail="Could not connect to AI service. Make sure Ollama is running."
+            )
+    
+    def _route_key(self, prefix: str) -> Optional[str]:
+        """
+        Key that keeps prompts with the same prefix on the same Ollama server.
+        
+        Edits against one style guide (e.g. one style profile) share their
+        prefix, so they land where it is already cached.
+        
+        Args:
+            prefix (str): Static start of the prompt
+        
+        Returns:
+            Optional[str]: Route key, or None to use the least loaded server
+        """
+        return self.prompt_cache_stats.prefix_key(prefix) if prefix else None
+
+    def _create_chunk_editing_prompt(self, chunks: List[str], index: int, style_guide: str) -> str:
+        """
+        Create a prompt for editing one chunk of a long draft.
+        
+        The prompt starts with the same prefix as ``_create_editing_prompt``
+        so every chunk reuses Ollama's cached evaluation of it, followed by
+        the chunk's place in the draft (see ``chunk_context``).
+        
+        Args:
+            chunks (List[str]): All chunks of the draft
+            index (int): Chunk to edit
+            style_guide (str): Style guide from analysis
+        
+        Returns:
+            str: Formatted prompt for chunk editing
+        """
+        return self._create_editing_prefix(style_guide) + chunk_context(chunks, index) + f"""
+DRAFT TO EDIT:
+{chunks[index]}
+"""
+
     def _create_style_analysis_prompt(self, reference_articles: List[str]) -> str:
         """
         Create a prompt for style analysis.
@@ -211,26 +567,26 @@ Please provide a detailed analysis covering:
 Create a concise but comprehensive style guide that can be used to edit future content to match this writing style.
 """
     
-    def _create_editing_prompt(self, draft_content: str, style_guide: str) -> str:
+    def _create_editing_prefix(self, style_guide: str) -> str:
         """
-        Create a prompt for content editing.
+        Create the static start of every editing prompt for a style guide.
+        
+        Instructions and style guide come before the draft and never vary
+        between drafts, so Ollama can reuse its evaluation of this prefix
+        across edits, batch items and chunks while the model stays loaded.
         
         Args:
-            draft_content (str): Original draft
             style_guide (str): Style guide from analysis
-            
+        
         Returns:
-            str: Formatted prompt for content editing
+            str: Prompt prefix
         """
         return f"""
-You are an expert content editor. Your task is to edit the following draft to match the provided style guide exactly.
+You are an expert content editor. Your task is to edit the draft at the end of this prompt to match the provided style guide exactly.
 
 STYLE GUIDE TO FOLLOW:
 {style_guide}
 
-DRAFT TO EDIT:
-{draft_content}
-
 EDITING INSTRUCTIONS:
 1. Maintain the core message and key information from the original draft
 2. Adjust tone, voice, and style to match the style guide
@@ -241,4 +597,20 @@ EDITING INSTRUCTIONS:
 7. Ensure the final piece feels authentic to the original brand voice
 
 Please provide only the edited version of the article. Do not include explanations or commentary about the changes made.
-"""
\ No newline at end of file
+"""
+    
+    def _create_editing_prompt(self, draft_content: str, style_guide: str) -> str:
+        """
+        Create a prompt for content editing.
+        
+        Args:
+            draft_content (str): Original draft
+            style_guide (str): Style guide from analysis
+        
+        Returns:
+            str: Formatted prompt for content editing
+        """
+        return self._create_editing_prefix(style_guide) + f"""
+DRAFT TO EDIT:
+{draft_content}
+"""
@@ -5,18 +5,41 @@ Defines all API endpoints for the application including
 file upload, text processing, and AI generation routes.
 """
 
-from typing import List, Dict, Any
+import json
+import os
+from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
 from .file_processor import FileProcessor
 from .ai_engine import AIEngine
+from .batch_runner import map_as_completed
+from .job_manager import JobManager
+from .loop_watchdog import LoopWatchdog
+from .metrics import CONTENT_TYPE, stats_callbacks
+from .style_profiles import StyleProfileStore
 
 
 class GenerateEditRequest(BaseModel):
     """Request model for content generation."""
-    reference_articles: List[str]
+    reference_articles: List[str] = []
     draft_content: str
+    style_profile_id: Optional[str] = None
+
+
+class BatchEditRequest(BaseModel):
+    """Request model for editing many drafts against one reference set."""
+    reference_articles: List[str] = []
+    drafts: List[str]
+    style_profile_id: Optional[str] = None
+    concurrency: Optional[int] = None
+
+
+class StyleProfileRequest(BaseModel):
+    """Request model for creating a style profile."""
+    reference_articles: List[str]
+    name: Optional[str] = None
 
 
 class APIResponse(BaseModel):
@@ -26,28 +49,89 @@ class APIResponse(BaseModel):
     message: str = ""
 
 
-def create_api_routes(file_processor: FileProcessor, ai_engine: AIEngine) -> APIRouter:
+def create_api_routes(
+    file_processor: FileProcessor,
+    ai_engine: AIEngine,
+    style_profiles: Optional[StyleProfileStore] = None,
+    job_manager: Optional[JobManager] = None,
+    loop_watchdog: Optional[LoopWatchdog] = None
+) -> APIRouter:
     """
     Create and configure API routes.
     
     Args:
         file_processor (FileProcessor): File processing instance
         ai_engine (AIEngine): AI engine instance
+        style_profiles (StyleProfileStore): Style profile store; one is created if omitted
+        job_manager (JobManager): Background job registry; one is created if omitted
+        loop_watchdog (LoopWatchdog): Event-loop lag and blocking-call detector;
+            one is created if omitted (it only runs when enabled)
         
     Returns:
         APIRouter: Configured API router
     """
     router = APIRouter(prefix="/api", tags=["API"])
+    style_profiles = style_profiles or StyleProfileStore()
+    job_manager = job_manager or JobManager()
+    loop_watchdog = loop_watchdog or LoopWatchdog()
+    batch_concurrency = int(os.getenv("BATCH_CONCURRENCY", 4))
+    batch_max_drafts = int(os.getenv("BATCH_MAX_DRAFTS", 100))
+    extraction_batch_max_files = int(os.getenv("EXTRACTION_BATCH_MAX_FILES", 50))
+    _register_stats_metrics(file_processor, ai_engine, job_manager)
+    if loop_watchdog.enabled:
+        loop_watchdog.register_metrics(ai_engine.metrics)
+    
+    async def resolve_style_guide(
+        reference_articles: List[str],
+        style_profile_id: Optional[str],
+        retry: bool = False,
+        holding_slot: bool = False,
+        fitted: bool = False
+    ) -> str:
+        """Get the style guide from a stored profile or by analyzing references (``fitted`` as for ``analyze_writing_style``)."""
+        if style_profile_id:
+            profile = await style_profiles.get(style_profile_id)
+            if profile is None:
+                raise HTTPException(status_code=404, detail="Style profile not found")
+            style_guide = StyleProfileStore.style_guide_for(profile, ai_engine.model)
+            if style_guide:
+                return style_guide
+            reference_articles, fitted = profile["reference_articles"], False
+        
+        if not reference_articles:
+            raise HTTPException(status_code=400, detail="No reference articles provided")
+        
+        return await ai_engine.analyze_writing_style(reference_articles, retry, holding_slot, fitted)
+    
+    @router.on_event("startup")
+    async def startup():
+        """Start probing Ollama, and the loop watchdog if enabled, on application startup."""
+        await ai_engine.start()
+        await loop_watchdog.start()
+    
+    @router.on_event("shutdown")
+    async def shutdown():
+        """Cancel unfinished jobs, stop the loop watchdog, release pooled Ollama connections and stop extraction workers on shutdown."""
+        await job_manager.shutdown()
+        await loop_watchdog.stop()
+        await ai_engine.close()
+        file_processor.close()
     
     @router.get("/health")
-    async def health_check():
+    async def health_check(deep: bool = False):
         """
         Check overall system health including AI service.
         
+        Served from the background monitor's last probe; pass ``deep=true``
+        to also run a tiny test generation.
+        
+        Args:
+            deep (bool): Include a (recently cached) generation probe
+            
         Returns:
             Dict: Health status information
         """
-        ai_health = await ai_engine.health_check()
+        ai_health = await ai_engine.health_check(deep=deep)
         
         return {
             "status": "healthy",
@@ -56,22 +140,53 @@ def create_api_routes(file_processor: FileProcessor, ai_engine: AIEngine) -> API
             "supported_formats": list(file_processor.SUPPORTED_EXTENSIONS)
         }
     
+    @router.get("/health/live")
+    async def liveness_check():
+        """
+        Liveness probe that never touches the AI service.
+        
+        Returns:
+            Dict: Liveness status
+        """
+        return {"status": "alive"}
+    
+    @router.get("/health/ready")
+    async def readiness_check():
+        """
+        Readiness probe answered from the monitor's cached state.
+        
+        Returns:
+            JSONResponse: 200 when Ollama and the model are available, 503 otherwise
+        """
+        state = ai_engine.health_monitor.snapshot()
+        return JSONResponse(status_code=200 if state["ready"] else 503, content=state)
+    
     @router.post("/extract-text")
-    async def extract_text_from_file(file: UploadFile = File(...)):
+    async def extract_text_from_file(
+        file: UploadFile = File(...),
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None
+    ):
         """
         Extract text content from uploaded file.
         
         Args:
             file (UploadFile): Uploaded file
+            max_pages (int): Extract at most this many PDF pages
+            max_chars (int): Stop once this many characters are extracted
             
         Returns:
-            Dict: Extracted text content
+            Dict: Extracted text content, whether it was served from the cache,
+                and pages processed versus total for PDFs
         """
         try:
-            text = await file_processor.extract_text_from_upload(file)
+            if (max_pages is not None and max_pages < 1) or (max_chars is not None and max_chars < 1):
+                raise HTTPException(status_code=400, detail="max_pages and max_chars must be positive")
+            
+            document = await file_processor.extract_document(file, max_pages=max_pages, max_chars=max_chars)
             return APIResponse(
                 success=True,
-                data={"text": text, "filename": file.filename},
+                data={**document, "filename": file.filename},
                 message="Text extracted successfully"
             ).dict()
         except HTTPException:
@@ -79,6 +194,59 @@ def create_api_routes(file_processor: FileProcessor, ai_engine: AIEngine) -> API
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Text extraction failed: {str(e)}")
     
+    @router.post("/extract-text/batch")
+    async def extract_text_from_files(
+        files: List[UploadFile] = File(...),
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None
+    ):
+        """
+        Extract text from many uploaded files in one request.
+        
+        Files are extracted concurrently on the worker pool. The response is
+        newline-delimited JSON with one ``result`` or ``error`` event per file,
+        in completion order and tagged with the file's ``index`` and
+        ``filename``, ending with a ``done`` event that summarizes the batch.
+        
+        Args:
+            files (List[UploadFile]): Uploaded files
+            max_pages (int): Extract at most this many pages of each PDF
+            max_chars (int): Stop once this many characters are extracted per file
+            
+        Returns:
+            StreamingResponse: NDJSON event stream
+        """
+        if len(files) > extraction_batch_max_files:
+            raise HTTPException(status_code=400, detail=f"Too many files (max {extraction_batch_max_files})")
+        
+        if (max_pages is not None and max_pages < 1) or (max_chars is not None and max_chars < 1):
+            raise HTTPException(status_code=400, detail="max_pages and max_chars must be positive")
+        
+        async def extract(file: UploadFile) -> Dict[str, Any]:
+            return await file_processor.extract_document(file, max_pages=max_pages, max_chars=max_chars)
+        
+        async def event_stream():
+            succeeded = 0
+            limit = file_processor.pool.max_workers
+            async for index, document, error in map_as_completed(files, extract, limit):
+                filename = files[index].filename
+                if error is None:
+                    succeeded += 1
+                    yield _ndjson({"type": "result", "index": index, "filename": filename, **document})
+                elif isinstance(error, HTTPException):
+                    yield _ndjson({"type": "error", "index": index, "filename": filename, "detail": error.detail})
+                else:
+                    yield _ndjson({
+                        "type": "error",
+                        "index": index,
+                        "filename": filename,
+                        "detail": f"Text extraction failed: {str(error)}"
+                    })
+            
+            yield _ndjson({"type": "done", "total": len(files), "succeeded": succeeded, "failed": len(files) - succeeded})
+        
+        return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+    
     @router.post("/analyze-style")
     async def analyze_writing_style(request: Dict[str, List[str]]):
         """
@@ -95,11 +263,12 @@ def create_api_routes(file_processor: FileProcessor, ai_engine: AIEngine) -> API
             if not reference_articles:
                 raise HTTPException(status_code=400, detail="No reference articles provided")
             
-            style_guide = await ai_engine.analyze_writing_style(reference_articles)
+            references, budget_report = ai_engine.prompt_budget.fit(reference_articles)
+            style_guide = await ai_engine.analyze_writing_style(references, fitted=True)
             
             return APIResponse(
                 success=True,
-                data={"style_guide": style_guide},
+                data={"style_guide": style_guide, "reference_budget": budget_report},
                 message="Style analysis completed"
             ).dict()
         except HTTPException:
@@ -113,7 +282,8 @@ def create_api_routes(file_processor: FileProcessor, ai_engine: AIEngine) -> API
         Edit content according to provided style guide.
         
         Args:
-            request: Dictionary containing draft_content and style_guide
+            request: Dictionary containing draft_content and either
+                style_guide or style_profile_id
             
         Returns:
             Dict: Edited content
@@ -121,11 +291,15 @@ def create_api_routes(file_processor: FileProcessor, ai_engine: AIEngine) -> API
         try:
             draft_content = request.get("draft_content", "")
             style_guide = request.get("style_guide", "")
+            style_profile_id = request.get("style_profile_id", "")
+            
+            if style_profile_id and not style_guide:
+                style_guide = await resolve_style_guide([], style_profile_id)
             
             if not draft_content or not style_guide:
                 raise HTTPException(status_code=400, detail="Missing content or style guide")
             
-            edited_content = await ai_engine.edit_content(draft_content, style_guide)
+            edited_content = await ai_engine.edit_long_content(draft_content, style_guide, retry=False)
             
             return APIResponse(
                 success=True,
@@ -149,21 +323,27 @@ def create_api_routes(file_processor: FileProcessor, ai_engine: AIEngine) -> API
             Dict: Final edited article
         """
         try:
-            if not request.reference_articles:
+            if not request.reference_articles and not request.style_profile_id:
                 raise HTTPException(status_code=400, detail="No reference articles provided")
             
             if not request.draft_content.strip():
                 raise HTTPException(status_code=400, detail="No draft content provided")
             
-            # Process complete workflow
-            edited_article = await ai_engine.process_complete_workflow(
-                request.reference_articles,
-                request.draft_content
-            )
+            references, budget_report = request.reference_articles, None
+            if request.reference_articles and not request.style_profile_id:
+                references, budget_report = ai_engine.prompt_budget.fit(request.reference_articles)
+            
+            # Process complete workflow, reusing a stored profile when given
+            style_guide = await resolve_style_guide(references, request.style_profile_id, fitted=True)
+            edited_article = await ai_engine.edit_long_content(request.draft_content, style_guide, retry=False)
+            
+            data = {"edited_article": edited_article}
+            if budget_report is not None:
+                data["reference_budget"] = budget_report
             
             return APIResponse(
                 success=True,
-                data={"edited_article": edited_article},
+                data=data,
                 message="Article editing completed successfully"
             ).dict()
         except HTTPException:
@@ -171,6 +351,334 @@ def create_api_routes(file_processor: FileProcessor, ai_engine: AIEngine) -> API
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Article generation failed: {str(e)}")
     
+    @router.post("/generate-edit/stream")
+    async def stream_complete_edit(request: GenerateEditRequest):
+        """
+        Complete workflow with the edited article streamed as it is generated.
+        
+        The response is newline-delimited JSON: ``status`` events mark the
+        analysis and editing stages, ``token`` events carry generated text,
+        and the stream ends with a ``done`` or ``error`` event. Long drafts
+        are edited in concurrent chunks; each ``token`` event then carries
+        a whole chunk, in draft order, and ``status`` events report chunk
+        progress.
+        
+        Args:
+            request (GenerateEditRequest): Request with reference articles and draft
+            
+        Returns:
+            StreamingResponse: NDJSON event stream
+        """
+        if not request.reference_articles and not request.style_profile_id:
+            raise HTTPException(status_code=400, detail="No reference articles provided")
+        
+        if not request.draft_content.strip():
+            raise HTTPException(status_code=400, detail="No draft content provided")
+        
+        ai_engine.scheduler.ensure_capacity()
+        
+        async def event_stream():
+            ticket = None
+            try:
+                ticket = ai_engine.scheduler.submit()
+                async for position in ai_engine.scheduler.queue_positions(ticket):
+                    yield _ndjson({"type": "queued", "position": position})
+                ai_engine.tracer.record("queue_wait", ticket.wait_time)
+                
+                yield _ndjson({"type": "status", "stage": "analyzing"})
+                references = request.reference_articles
+                if request.reference_articles and not request.style_profile_id:
+                    references, budget_report = ai_engine.prompt_budget.fit(request.reference_articles)
+                    if budget_report["truncated"]:
+                        yield _ndjson({"type": "status", "stage": "references_trimmed", "reference_budget": budget_report})
+                style_guide = await resolve_style_guide(
+                    references, request.style_profile_id, holding_slot=True, fitted=True
+                )
+                
+                chunks = ai_engine.split_draft(request.draft_content)
+                if len(chunks) > 1:
+                    # Chunks take their own slots; holding this one could starve them
+                    ai_engine.scheduler.release(ticket)
+                    ticket = None
+                    yield _ndjson({"type": "status", "stage": "editing", "chunks_total": len(chunks)})
+                    async for piece in ai_engine.stream_edited_chunks(chunks, style_guide):
+                        yield _ndjson({"type": "token", "content": piece})
+                else:
+                    yield _ndjson({"type": "status", "stage": "editing"})
+                    async for token in ai_engine.stream_edit_content(request.draft_content, style_guide):
+                        yield _ndjson({"type": "token", "content": token})
+                
+                yield _ndjson({"type": "done"})
+            except HTTPException as e:
+                yield _ndjson({"type": "error", "detail": e.detail})
+            except Exception as e:
+                yield _ndjson({"type": "error", "detail": f"Article generation failed: {str(e)}"})
+            finally:
+                if ticket is not None:
+                    ai_engine.scheduler.release(ticket)
+        
+        return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+    
+    @router.post("/generate-edit/batch")
+    async def batch_complete_edit(request: BatchEditRequest):
+        """
+        Edit many drafts against one reference set.
+        
+        The references are analyzed once and the resulting style guide is
+        shared by every draft; the edits then run concurrently, at most
+        ``concurrency`` at a time (capped by ``BATCH_CONCURRENCY``), each
+        in its own generation slot, or one slot per chunk for long drafts.
+        The response is newline-delimited JSON with one ``result`` or
+        ``error`` event per draft, in completion order and tagged with the
+        draft's ``index``, ending with a ``done`` event that summarizes the
+        batch.
+        
+        Args:
+            request (BatchEditRequest): Reference articles (or a style profile
+                ID) and the drafts to edit
+            
+        Returns:
+            StreamingResponse: NDJSON event stream
+        """
+        if not request.reference_articles and not request.style_profile_id:
+            raise HTTPException(status_code=400, detail="No reference articles provided")
+        
+        if not request.drafts:
+            raise HTTPException(status_code=400, detail="No drafts provided")
+        
+        if len(request.drafts) > batch_max_drafts:
+            raise HTTPException(status_code=400, detail=f"Too many drafts (max {batch_max_drafts})")
+        
+        limit = min(request.concurrency or batch_concurrency, batch_concurrency)
+        
+        async def event_stream():
+            yield _ndjson({"type": "status", "stage": "analyzing", "total": len(request.drafts)})
+            try:
+                style_guide = await resolve_style_guide(request.reference_articles, request.style_profile_id, retry=True)
+            except HTTPException as e:
+                yield _ndjson({"type": "error", "detail": e.detail})
+                return
+            except Exception as e:
+                yield _ndjson({"type": "error", "detail": f"Style analysis failed: {str(e)}"})
+                return
+            
+            async def edit_draft(draft_content: str) -> str:
+                if not draft_content.strip():
+                    raise HTTPException(status_code=400, detail="No draft content provided")
+                return await ai_engine.edit_long_content(draft_content, style_guide)
+            
+            yield _ndjson({"type": "status", "stage": "editing", "concurrency": limit})
+            succeeded = 0
+            async for index, edited_article, error in map_as_completed(request.drafts, edit_draft, limit):
+                if error is None:
+                    succeeded += 1
+                    yield _ndjson({"type": "result", "index": index, "edited_article": edited_article})
+                elif isinstance(error, HTTPException):
+                    yield _ndjson({"type": "error", "index": index, "detail": error.detail})
+                else:
+                    yield _ndjson({"type": "error", "index": index, "detail": f"Content editing failed: {str(error)}"})
+            
+            yield _ndjson({
+                "type": "done",
+                "total": len(request.drafts),
+                "succeeded": succeeded,
+                "failed": len(request.drafts) - succeeded
+            })
+        
+        return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+    
+    @router.post("/jobs", status_code=202)
+    async def create_generation_job(request: GenerateEditRequest):
+        """
+        Start the complete workflow as a background job.
+        
+        The job waits for a generation slot instead of being rejected when
+        the queue is full, and streams the edit so long drafts are not lost
+        to the request timeout.
+        
+        Args:
+            request (GenerateEditRequest): Request with reference articles (or
+                a style profile ID) and draft
+            
+        Returns:
+            Dict: Job ID and initial status
+        """
+        if not request.reference_articles and not request.style_profile_id:
+            raise HTTPException(status_code=400, detail="No reference articles provided")
+        
+        if not request.draft_content.strip():
+            raise HTTPException(status_code=400, detail="No draft content provided")
+        
+        style_guide = None
+        reference_articles = request.reference_articles
+        if request.style_profile_id:
+            profile = await style_profiles.get(request.style_profile_id)
+            if profile is None:
+                raise HTTPException(status_code=404, detail="Style profile not found")
+            style_guide = StyleProfileStore.style_guide_for(profile, ai_engine.model)
+            reference_articles = profile["reference_articles"]
+        
+        async def work(report):
+            # Traced on its own: the job outlives this request's trace
+            with ai_engine.tracer.span("job", root=True):
+                report({"stage": "queued"})
+                edited_article = await ai_engine.process_complete_workflow(
+                    reference_articles,
+                    request.draft_content,
+                    on_progress=report,
+                    style_guide=style_guide
+                )
+            return {"edited_article": edited_article}
+        
+        job = job_manager.submit(work)
+        
+        return APIResponse(
+            success=True,
+            data=job.to_dict(),
+            message="Job accepted"
+        ).dict()
+    
+    @router.get("/jobs/{job_id}")
+    async def get_generation_job(job_id: str):
+        """
+        Get a job's status, latest progress and, once finished, its result.
+        
+        Args:
+            job_id (str): Job ID
+            
+        Returns:
+            Dict: Job status
+        """
+        job = job_manager.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found or expired")
+        
+        return APIResponse(success=True, data=job.to_dict()).dict()
+    
+    @router.get("/jobs/{job_id}/events")
+    async def stream_generation_job_events(job_id: str):
+        """
+        Subscribe to a job's progress as newline-delimited JSON events.
+        
+        Past events are replayed first; the stream ends with the terminal status.
+        
+        Args:
+            job_id (str): Job ID
+            
+        Returns:
+            StreamingResponse: NDJSON event stream
+        """
+        job = job_manager.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found or expired")
+        
+        async def event_stream():
+            async for event in job_manager.events(job):
+                yield _ndjson(event)
+        
+        return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+    
+    @router.delete("/jobs/{job_id}")
+    async def cancel_generation_job(job_id: str):
+        """
+        Cancel a pending or running job.
+        
+        Args:
+            job_id (str): Job ID
+            
+        Returns:
+            Dict: Cancellation confirmation
+        """
+        if not await job_manager.cancel(job_id):
+            raise HTTPException(status_code=404, detail="Job not found or already finished")
+        
+        return APIResponse(success=True, message="Job cancelled").dict()
+    
+    @router.post("/style-profiles")
+    async def create_style_profile(request: StyleProfileRequest):
+        """
+        Analyze reference articles once and store the result as a profile.
+        
+        Args:
+            request (StyleProfileRequest): Reference articles and optional name
+            
+        Returns:
+            Dict: Profile ID, metadata and style guide
+        """
+        try:
+            if not request.reference_articles:
+                raise HTTPException(status_code=400, detail="No reference articles provided")
+            
+            references, budget_report = ai_engine.prompt_budget.fit(request.reference_articles)
+            style_guide = await ai_engine.analyze_writing_style(references, fitted=True)
+            profile = await style_profiles.create(
+                request.reference_articles,
+                style_guide=style_guide,
+                name=request.name,
+                model=ai_engine.model
+            )
+            
+            return APIResponse(
+                success=True,
+                data={
+                    **StyleProfileStore.summarize(profile),
+                    "style_guide": style_guide,
+                    "reference_budget": budget_report
+                },
+                message="Style profile created"
+            ).dict()
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Style profile creation failed: {str(e)}")
+    
+    @router.get("/style-profiles")
+    async def list_style_profiles():
+        """
+        List stored style profiles.
+        
+        Returns:
+            Dict: Profile summaries, newest first
+        """
+        profiles = await style_profiles.list()
+        return APIResponse(success=True, data={"profiles": profiles}).dict()
+    
+    @router.get("/style-profiles/{profile_id}")
+    async def get_style_profile(profile_id: str):
+        """
+        Get a stored style profile.
+        
+        Args:
+            profile_id (str): Profile ID
+            
+        Returns:
+            Dict: Profile metadata and style guide
+        """
+        profile = await style_profiles.get(profile_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Style profile not found")
+        
+        return APIResponse(
+            success=True,
+            data={**StyleProfileStore.summarize(profile), "style_guide": profile["style_guide"]}
+        ).dict()
+    
+    @router.delete("/style-profiles/{profile_id}")
+    async def delete_style_profile(profile_id: str):
+        """
+        Delete a stored style profile.
+        
+        Args:
+            profile_id (str): Profile ID
+            
+        Returns:
+            Dict: Deletion confirmation
+        """
+        if not await style_profiles.delete(profile_id):
+            raise HTTPException(status_code=404, detail="Style profile not found")
+        
+        return APIResponse(success=True, message="Style profile deleted").dict()
+    
     @router.get("/models")
     async def get_available_models():
         """
@@ -186,4 +694,97 @@ def create_api_routes(file_processor: FileProcessor, ai_engine: AIEngine) -> API
             "status": "operational"
         }
     
-    return router
\ No newline at end of file
+    @router.get("/queue")
+    async def get_queue_status():
+        """
+        Get generation queue depth, wait times and admission counters.
+        
+        Returns:
+            Dict: Scheduler metrics
+        """
+        return ai_engine.scheduler.stats()
+    
+    @router.get("/backends")
+    async def get_backend_status():
+        """
+        Get the load and health of each Ollama server.
+        
+        Returns:
+            Dict: Per-server URL, availability, outstanding requests and errors
+        """
+        return {"backends": ai_engine.backend_stats()}
+    
+    @router.get("/cache-stats")
+    async def get_cache_stats():
+        """
+        Get style guide, extracted text and prompt prefix cache counters.
+        
+        Returns:
+            Dict: Hit/miss counts and tier sizes, plus prompt tokens Ollama
+            reused from its cache and the estimated prompt-eval time saved
+        """
+        return {
+            "style_guides": ai_engine.style_cache.stats(),
+            "extractions": file_processor.cache.stats(),
+            "prompt_cache": ai_engine.prompt_cache_stats.stats()
+        }
+    
+    @router.get("/metrics")
+    async def get_metrics():
+        """
+        Get request, generation, extraction, cache and queue metrics.
+        
+        HTTP request metrics are included when the application installs
+        ``MetricsMiddleware`` with ``ai_engine.metrics``.
+        
+        Returns:
+            Response: Metrics in the Prometheus text exposition format
+        """
+        text = ai_engine.metrics.render()
+        if file_processor.metrics is not ai_engine.metrics:
+            text += file_processor.metrics.render()
+        return Response(text, media_type=CONTENT_TYPE)
+    
+    return router
+
+
+def _register_stats_metrics(file_processor: FileProcessor, ai_engine: AIEngine, job_manager: JobManager) -> None:
+    """Export the counters the scheduler, caches, jobs and Ollama pool already keep as scrape-time metrics."""
+    registry = ai_engine.metrics
+    stats_callbacks(registry, "scheduler", {"generation": ai_engine.scheduler.stats}, [
+        ("active", "active", "gauge", "Generations running"),
+        ("queued", "queued", "gauge", "Generations waiting for a slot"),
+        ("admitted", "admitted_total", "counter", "Generations admitted"),
+        ("rejected", "rejected_total", "counter", "Generations rejected because the queue was full"),
+        ("timed_out", "timed_out_total", "counter", "Generations that timed out waiting for a slot"),
+        ("completed", "completed_total", "counter", "Generations completed")
+    ])
+    stats_callbacks(registry, "cache", {"style_guides": ai_engine.style_cache.stats, "extractions": file_processor.cache.stats}, [
+        ("hits", "hits_total", "counter", "Cache hits"),
+        ("misses", "misses_total", "counter", "Cache misses"),
+        ("hit_ratio", "hit_ratio", "gauge", "Cache hits over lookups")
+    ])
+    stats_callbacks(registry, "prompt_cache", {"ollama": ai_engine.prompt_cache_stats.stats}, [
+        ("estimated_reused_tokens", "reused_tokens_total", "counter", "Prompt tokens Ollama reused from its cache (estimated)"),
+        ("estimated_saved_seconds", "saved_seconds_total", "counter", "Prompt-eval seconds saved by cache reuse (estimated)"),
+        ("reuse_ratio", "reuse_ratio", "gauge", "Reused prompt tokens over tokens that would have been evaluated")
+    ])
+    registry.callback(
+        "jobs", "Stored background jobs by status",
+        lambda: {(status,): count for status, count in job_manager.stats()["by_status"].items()}, labelnames=("status",)
+    )
+    registry.callback(
+        "ollama_backend_up", "Whether each Ollama server is taking requests",
+        lambda: {(backend["url"],): float(backend.get("available", True)) for backend in ai_engine.backend_stats()},
+        labelnames=("endpoint",)
+    )
+    registry.callback(
+        "ollama_backend_outstanding", "Requests in flight on each Ollama server",
+        lambda: {(backend["url"],): backend.get("outstanding", 0) for backend in ai_engine.backend_stats()},
+        labelnames=("endpoint",)
+    )
+
+
+def _ndjson(event: Dict[str, Any]) -> str:
+    """Serialize one streaming event as a newline-delimited JSON line."""
+    return json.dumps(event) + "\n"
@@ -0,0 +1,51 @@
+"""
+Batch Runner Module
+
+Runs one coroutine per item with bounded concurrency and yields each
+outcome as soon as it finishes, so one failure never sinks the batch.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Sequence, Tuple
+
+BatchOutcome = Tuple[int, Any, Optional[Exception]]
+
+
+async def map_as_completed(
+    items: Sequence[Any],
+    worker: Callable[[Any], Awaitable[Any]],
+    limit: int,
+) -> AsyncIterator[BatchOutcome]:
+    """
+    Apply ``worker`` to every item, at most ``limit`` at a time.
+
+    Outcomes are yielded in completion order, not input order. If the
+    consumer stops early (e.g. the client disconnects), unfinished work is
+    cancelled.
+
+    Args:
+        items (Sequence[Any]): Inputs to process
+        worker (Callable[[Any], Awaitable[Any]]): Coroutine function run per item
+        limit (int): Maximum concurrent workers
+
+    Yields:
+        BatchOutcome: ``(index, result, None)`` on success or
+        ``(index, None, exception)`` on failure
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(index: int, item: Any) -> BatchOutcome:
+        async with semaphore:
+            try:
+                return index, await worker(item), None
+            except Exception as e:
+                return index, None, e
+
+    tasks = [asyncio.create_task(run(index, item)) for index, item in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
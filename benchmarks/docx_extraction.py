@@ -0,0 +1,131 @@
+"""
+DOCX Extraction Benchmark
+
+Compares the streaming extractor in ``docx_stream`` with the previous
+python-docx object-model path and the ElementTree fallback on generated
+documents, reporting wall time and peak Python memory.
+
+Usage:
+    python benchmarks/docx_extraction.py --paragraphs 20000 --repeat 3
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+import zipfile
+from typing import Callable, Dict, List
+
+from docx import Document
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from docx_stream import extract_docx_text  # noqa: E402
+
+
+def build_document(paragraphs: int, table_rows: int) -> bytes:
+    """
+    Generate a .docx file with body paragraphs, a table and a header.
+
+    Args:
+        paragraphs (int): Number of body paragraphs
+        table_rows (int): Rows in the generated 4-column table
+
+    Returns:
+        bytes: The .docx file content
+    """
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = "Quarterly style guide"
+    sentence = "The quick brown fox jumps over the lazy dog while the editor reviews tone and cadence. "
+    for index in range(paragraphs):
+        document.add_paragraph(f"{index}: " + sentence * 3)
+
+    table = document.add_table(rows=table_rows, cols=4)
+    for row_index, row in enumerate(table.rows):
+        for cell_index, cell in enumerate(row.cells):
+            cell.text = f"r{row_index}c{cell_index}"
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def python_docx_path(content: bytes) -> str:
+    """Previous primary path: full python-docx object model, body paragraphs only."""
+    document = Document(io.BytesIO(content))
+    return "\n".join(paragraph.text for paragraph in document.paragraphs)
+
+
+def elementtree_fallback(content: bytes) -> str:
+    """Previous fallback: parse document.xml whole and join every text node."""
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        root = ET.fromstring(archive.read("word/document.xml"))
+        return " ".join(elem.text for elem in root.iter() if elem.text)
+
+
+def streaming_path(content: bytes) -> str:
+    """Streaming iterparse extractor."""
+    return extract_docx_text(io.BytesIO(content))
+
+
+def measure(extract: Callable[[bytes], str], content: bytes, repeat: int) -> Dict[str, float]:
+    """
+    Time an extractor and record its peak traced memory.
+
+    Args:
+        extract (Callable[[bytes], str]): Extractor under test
+        content (bytes): .docx file content
+        repeat (int): Timed runs
+
+    Returns:
+        Dict[str, float]: Median and best seconds, peak MiB and output length
+    """
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = extract(content)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    extract(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_s": statistics.median(timings),
+        "best_s": min(timings),
+        "peak_mib": peak / (1024 * 1024),
+        "chars": len(text),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print one row per extractor."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=20000, help="body paragraphs in the generated document")
+    parser.add_argument("--table-rows", type=int, default=500, help="rows in the generated table")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per extractor")
+    args = parser.parse_args()
+
+    content = build_document(args.paragraphs, args.table_rows)
+    print(f"document: {len(content) / 1024:.0f} KiB, {args.paragraphs} paragraphs, {args.table_rows} table rows")
+    print(f"{'extractor':<24}{'median s':>10}{'best s':>10}{'peak MiB':>10}{'chars':>12}")
+
+    for name, extract in (
+        ("python-docx", python_docx_path),
+        ("elementtree-fallback", elementtree_fallback),
+        ("streaming", streaming_path),
+    ):
+        result = measure(extract, content, args.repeat)
+        print(
+            f"{name:<24}{result['median_s']:>10.3f}{result['best_s']:>10.3f}"
+            f"{result['peak_mib']:>10.1f}{result['chars']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
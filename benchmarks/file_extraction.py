@@ -0,0 +1,186 @@
+"""
+File Extraction Benchmark
+
+Micro-benchmarks ``FileProcessor.extract_document`` on generated PDF, DOCX
+and TXT uploads of several sizes, through the same extraction pool and
+cache the API uses. ``cold`` runs start from an empty cache; ``warm`` runs
+repeat an upload that is already cached (TXT is never cached, so its warm
+runs repeat the full extraction).
+
+Usage:
+    python benchmarks/file_extraction.py --sizes small,medium,large --repeat 5 --pool process
+"""
+
+import argparse
+import asyncio
+import importlib
+import io
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from fastapi import UploadFile
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+
+sys.path.insert(0, BENCHMARKS_DIR)
+# FileProcessor uses package-relative imports, so import the repo as a package
+sys.path.insert(0, os.path.dirname(REPO_ROOT))
+
+from docx_extraction import build_document  # noqa: E402
+
+_package = os.path.basename(REPO_ROOT)
+FileProcessor = importlib.import_module(f"{_package}.file_processor").FileProcessor
+ExtractionCache = importlib.import_module(f"{_package}.extraction_cache").ExtractionCache
+ExtractionPool = importlib.import_module(f"{_package}.extraction_pool").ExtractionPool
+
+SENTENCE = "The quick brown fox jumps over the lazy dog while the editor reviews tone and cadence."
+
+# Units per size: PDF pages, DOCX paragraphs, TXT paragraphs
+SIZES = {
+    "small": {".pdf": 5, ".docx": 50, ".txt": 50},
+    "medium": {".pdf": 50, ".docx": 1000, ".txt": 1000},
+    "large": {".pdf": 300, ".docx": 10000, ".txt": 10000},
+}
+
+
+def build_pdf(pages: int, lines_per_page: int = 30) -> bytes:
+    """
+    Generate a text-only PDF.
+
+    Args:
+        pages (int): Page count
+        lines_per_page (int): Lines of text per page
+
+    Returns:
+        bytes: The PDF file content
+    """
+    font = 3 + 2 * pages
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * index} 0 R' for index in range(pages))}] /Count {pages} >>",
+    ]
+    for index in range(pages):
+        lines = " ".join(f"({index}.{line} {SENTENCE}) Tj T*" for line in range(lines_per_page))
+        stream = f"BT /F1 10 Tf 12 TL 20 780 Td {lines} ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * index} 0 R "
+            f"/Resources << /Font << /F1 {font} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(content)
+    content += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    content += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    content += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return content
+
+
+def build_txt(paragraphs: int) -> bytes:
+    """
+    Generate a UTF-8 text file.
+
+    Args:
+        paragraphs (int): Paragraph count
+
+    Returns:
+        bytes: The file content
+    """
+    return "\n\n".join(f"{index}: {SENTENCE} Café déjà vu." for index in range(paragraphs)).encode("utf-8")
+
+
+BUILDERS: Dict[str, Callable[[int], bytes]] = {
+    ".pdf": build_pdf,
+    ".docx": lambda paragraphs: build_document(paragraphs, 20),
+    ".txt": build_txt,
+}
+
+
+async def extract(processor, content: bytes, extension: str, max_pages: int = None) -> Dict[str, Any]:
+    """Run one extraction through an in-memory upload."""
+    upload = UploadFile(file=io.BytesIO(content), filename=f"benchmark{extension}")
+    return await processor.extract_document(upload, max_pages=max_pages)
+
+
+async def measure(pool, content: bytes, extension: str, repeat: int, max_pages: int = None) -> Dict[str, float]:
+    """
+    Time cold (uncached) and warm (cached) extractions of one upload.
+
+    Args:
+        pool: Shared extraction pool, already started
+        content (bytes): File content
+        extension (str): File extension
+        repeat (int): Timed runs per mode
+        max_pages (int): PDF page limit passed to the extractor
+
+    Returns:
+        Dict[str, float]: Median and best cold seconds, median warm seconds
+        and extracted characters
+    """
+    cold: List[float] = []
+    for _ in range(repeat):
+        processor = FileProcessor(pool=pool, cache=ExtractionCache())
+        started = time.perf_counter()
+        document = await extract(processor, content, extension, max_pages)
+        cold.append(time.perf_counter() - started)
+
+    warm: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await extract(processor, content, extension, max_pages)
+        warm.append(time.perf_counter() - started)
+
+    return {
+        "cold_median_s": statistics.median(cold),
+        "cold_best_s": min(cold),
+        "warm_median_s": statistics.median(warm),
+        "chars": len(document["text"]),
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Benchmark every requested format and size and print one row each."""
+    pool = ExtractionPool(mode=args.pool, max_workers=args.workers)
+    try:
+        # Start the workers outside the timed runs
+        await extract(FileProcessor(pool=pool, cache=ExtractionCache()), build_pdf(1), ".pdf")
+
+        print(f"pool: {pool.mode}, {pool.max_workers} workers")
+        print(f"{'format':<8}{'size':<8}{'KiB':>10}{'cold med s':>12}{'cold best s':>12}{'MiB/s':>9}{'warm med ms':>13}{'chars':>11}")
+        for size in args.sizes.split(","):
+            for extension in args.formats.split(","):
+                content = BUILDERS[extension](SIZES[size][extension])
+                result = await measure(pool, content, extension, args.repeat, args.max_pages)
+                rate = len(content) / (1024 * 1024) / result["cold_median_s"]
+                print(
+                    f"{extension:<8}{size:<8}{len(content) / 1024:>10.0f}{result['cold_median_s']:>12.4f}"
+                    f"{result['cold_best_s']:>12.4f}{rate:>9.1f}{result['warm_median_s'] * 1000:>13.3f}{result['chars']:>11}"
+                )
+    finally:
+        pool.shutdown()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="small,medium,large", help=f"comma-separated, from {', '.join(SIZES)}")
+    parser.add_argument("--formats", default=".pdf,.docx,.txt", help="comma-separated file extensions")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per format, size and mode")
+    parser.add_argument("--pool", choices=("process", "thread"), default="process", help="extraction pool mode")
+    parser.add_argument("--workers", type=int, help="extraction workers (default: EXTRACTION_WORKERS)")
+    parser.add_argument("--max-pages", type=int, help="PDF page limit, to measure early stopping")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""
+Load Benchmark
+
+Drives the app in ``main.py``, or an app built around
+``api_routes.create_api_routes``, with concurrent requests against the
+mock Ollama server (``mock_ollama.py``, started as a subprocess), and
+reports latency percentiles, throughput, response statuses and event-loop
+lag. Requests go through an in-process ASGI transport, so the numbers
+cover the application rather than socket handling; the load generator
+shares the event loop, which makes lag figures slightly pessimistic.
+
+Scenarios:
+    edit     POST /api/generate-edit
+    stream   POST /api/generate-edit/stream (error events count as failures)
+    extract  POST /api/extract-text with generated .docx files
+
+Usage:
+    python benchmarks/load.py --target main --scenario edit --requests 200 --concurrency 20
+    python benchmarks/load.py --target router --scenario stream --failure-rate 0.05 --json results.json
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+
+PERCENTILES: List[Tuple[str, float]] = [("p50", 0.50), ("p95", 0.95), ("p99", 0.99)]
+
+SENTENCE = "Our team ships small, well-tested changes and explains each decision in plain words. "
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a task that sleeps on a fixed interval."""
+
+    def __init__(self, interval: float = 0.01):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval (float): Seconds between samples
+        """
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    def start(self) -> None:
+        """Start sampling in the running loop."""
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        """Sample until cancelled."""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval))
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        sorted_values (List[float]): Values in ascending order
+        fraction (float): Percentile as a fraction, e.g. 0.99
+
+    Returns:
+        float: The percentile, or 0 for no values
+    """
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock(args: argparse.Namespace, port: int) -> subprocess.Popen:
+    """
+    Start the mock Ollama server and wait until it answers.
+
+    Args:
+        args (argparse.Namespace): Parsed command line
+        port (int): Port to serve on
+
+    Returns:
+        subprocess.Popen: The server process
+    """
+    process = subprocess.Popen([
+        sys.executable, os.path.join(BENCHMARKS_DIR, "mock_ollama.py"),
+        "--port", str(port),
+        "--token-rate", str(args.token_rate),
+        "--prompt-rate", str(args.prompt_rate),
+        "--latency", str(args.latency),
+        "--tokens", str(args.tokens),
+        "--parallel", str(args.parallel),
+        "--failure-rate", str(args.failure_rate),
+        "--failure-mode", args.failure_mode,
+        "--seed", str(args.seed),
+    ])
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/version", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Mock Ollama did not start")
+
+
+def load_main_app():
+    """Import the standalone app from ``main.py``."""
+    sys.path.insert(0, REPO_ROOT)
+    return importlib.import_module("main").app
+
+
+def load_router_app():
+    """Build an app around the API router, with its metrics and tracing middleware."""
+    # The router modules use package-relative imports, so import the repo as a package
+    sys.path.insert(0, os.path.dirname(REPO_ROOT))
+    package = os.path.basename(REPO_ROOT)
+    from fastapi import FastAPI
+
+    api_routes = importlib.import_module(f"{package}.api_routes")
+    ai_engine = importlib.import_module(f"{package}.ai_engine")
+    file_processor = importlib.import_module(f"{package}.file_processor")
+    metrics = importlib.import_module(f"{package}.metrics")
+    tracing = importlib.import_module(f"{package}.tracing")
+
+    engine = ai_engine.AIEngine(base_url=os.environ["OLLAMA_HOSTS"])
+    processor = file_processor.FileProcessor(metrics=engine.metrics, tracer=engine.tracer)
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware, registry=engine.metrics)
+    app.add_middleware(tracing.TracingMiddleware, tracer=engine.tracer)
+    app.include_router(api_routes.create_api_routes(processor, engine))
+    return app
+
+
+def build_requests(args: argparse.Namespace) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Build the request sequence for the scenario, the same on every run.
+
+    Args:
+        args (argparse.Namespace): Parsed command line
+
+    Returns:
+        List[Tuple[str, Dict[str, Any]]]: Path and httpx keyword arguments per request
+    """
+    reference_sets = [
+        [f"Reference {set_index}.{article}: " + SENTENCE * args.reference_sentences for article in range(3)]
+        for set_index in range(args.distinct_references)
+    ]
+
+    if args.scenario == "extract":
+        sys.path.insert(0, BENCHMARKS_DIR)
+        from docx_extraction import build_document
+
+        files = [build_document(args.docx_paragraphs + index, 10) for index in range(args.distinct_files)]
+        return [
+            ("/api/extract-text", {"files": {"file": (f"doc{index}.docx", files[index % len(files)])}})
+            for index in range(args.requests)
+        ]
+
+    path = "/api/generate-edit/stream" if args.scenario == "stream" else "/api/generate-edit"
+    requests = []
+    for index in range(args.requests):
+        draft = f"Draft {index}. " + SENTENCE * args.draft_sentences
+        references = reference_sets[index % len(reference_sets)]
+        requests.append((path, {"json": {"reference_articles": references, "draft_content": draft}}))
+    return requests
+
+
+def outcome_of(response: httpx.Response, scenario: str) -> str:
+    """Classify a response: its status code, or ``stream_error`` for a failed stream."""
+    if scenario == "stream" and response.status_code == 200:
+        for line in response.text.splitlines():
+            if line and json.loads(line).get("type") == "error":
+                return "stream_error"
+    return str(response.status_code)
+
+
+async def run_load(app, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Send the scenario's requests with bounded concurrency and collect results.
+
+    Args:
+        app: ASGI application under test
+        args (argparse.Namespace): Parsed command line
+
+    Returns:
+        Dict[str, Any]: Latency percentiles, throughput, outcome counts and loop lag
+    """
+    await app.router.startup()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+        deadline = time.monotonic() + 15
+        while (await client.get("/api/health/ready")).status_code != 200:
+            if time.monotonic() > deadline:
+                raise RuntimeError("App did not become ready")
+            await asyncio.sleep(0.2)
+
+        requests = build_requests(args)
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies: List[float] = []
+        outcomes: Dict[str, int] = {}
+
+        async def send(path: str, kwargs: Dict[str, Any]) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    outcome = outcome_of(await client.post(path, **kwargs), args.scenario)
+                except httpx.HTTPError as e:
+                    outcome = type(e).__name__
+                latencies.append(time.perf_counter() - started)
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+        monitor = LoopLagMonitor()
+        monitor.start()
+        started = time.perf_counter()
+        await asyncio.gather(*[send(path, kwargs) for path, kwargs in requests])
+        elapsed = time.perf_counter() - started
+        await monitor.stop()
+
+    await app.router.shutdown()
+
+    latencies.sort()
+    lags = sorted(monitor.samples)
+    return {
+        "target": args.target,
+        "scenario": args.scenario,
+        "requests": len(requests),
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(requests) / elapsed, 2),
+        "outcomes": outcomes,
+        "latency_ms": {name: round(percentile(latencies, fraction) * 1000, 1) for name, fraction in PERCENTILES},
+        "loop_lag_ms": {
+            **{name: round(percentile(lags, fraction) * 1000, 2) for name, fraction in PERCENTILES},
+            "max": round(lags[-1] * 1000, 2) if lags else 0.0,
+        },
+    }
+
+
+TARGETS: Dict[str, Callable[[], Any]] = {"main": load_main_app, "router": load_router_app}
+
+
+def configure_environment(args: argparse.Namespace, port: int) -> None:
+    """
+    Point the apps at the mock and apply the benchmark's settings.
+
+    The apps read their configuration from the environment at import time,
+    so call this before loading a target.
+
+    Args:
+        args (argparse.Namespace): Parsed command line
+        port (int): Port the mock Ollama server listens on
+    """
+    os.environ["OLLAMA_HOSTS"] = f"http://127.0.0.1:{port}"
+    os.environ["STYLE_PROFILE_DB"] = ""
+    os.environ.setdefault("TRACING_EXPORT_PATH", "")
+    os.environ.setdefault("HEALTH_PROBE_INTERVAL", "1")
+    if args.generation_concurrency:
+        os.environ["GENERATION_CONCURRENCY"] = str(args.generation_concurrency)
+    if args.queue_size is not None:
+        os.environ["GENERATION_QUEUE_SIZE"] = str(args.queue_size)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser (also used by the smoke tests)."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=sorted(TARGETS), default="main")
+    parser.add_argument("--scenario", choices=("edit", "stream", "extract"), default="edit")
+    parser.add_argument("--requests", type=int, default=100, help="requests to send")
+    parser.add_argument("--concurrency", type=int, default=10, help="requests in flight at once")
+    parser.add_argument("--timeout", type=float, default=300, help="client timeout per request, in seconds")
+    parser.add_argument("--distinct-references", type=int, default=4, help="reference sets cycled through")
+    parser.add_argument("--reference-sentences", type=int, default=40, help="sentences per reference article")
+    parser.add_argument("--draft-sentences", type=int, default=20, help="sentences per draft")
+    parser.add_argument("--distinct-files", type=int, default=4, help="documents cycled through (extract)")
+    parser.add_argument("--docx-paragraphs", type=int, default=500, help="paragraphs per document (extract)")
+    parser.add_argument("--generation-concurrency", type=int, help="sets GENERATION_CONCURRENCY for the app")
+    parser.add_argument("--queue-size", type=int, help="sets GENERATION_QUEUE_SIZE for the app")
+    parser.add_argument("--token-rate", type=float, default=200.0, help="mock: generated tokens per second")
+    parser.add_argument("--prompt-rate", type=float, default=5000.0, help="mock: prompt tokens per second")
+    parser.add_argument("--latency", type=float, default=0.02, help="mock: seconds before prompt evaluation")
+    parser.add_argument("--tokens", type=int, default=100, help="mock: tokens per response")
+    parser.add_argument("--parallel", type=int, default=4, help="mock: generations processed at once")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="mock: fraction of failed generations")
+    parser.add_argument("--failure-mode", choices=("error", "drop"), default="error")
+    parser.add_argument("--seed", type=int, default=0, help="mock: seed for failure injection")
+    parser.add_argument("--json", help="also write the results to this file")
+    return parser
+
+
+def main() -> None:
+    """Run the benchmark and print a summary."""
+    args = build_parser().parse_args()
+
+    port = free_port()
+    mock = start_mock(args, port)
+    try:
+        configure_environment(args, port)
+        app = TARGETS[args.target]()
+        # Per-request INFO logs would dominate the run
+        logging.disable(logging.INFO)
+        results = asyncio.run(run_load(app, args))
+        results["mock"] = httpx.get(f"http://127.0.0.1:{port}/stats").json()
+    finally:
+        mock.kill()
+
+    print(f"{results['target']} / {results['scenario']}: {results['requests']} requests, concurrency {results['concurrency']}")
+    print(f"  throughput   {results['throughput_rps']:.2f} req/s over {results['elapsed_s']:.2f} s")
+    print("  latency ms   " + "  ".join(f"{name} {value:.1f}" for name, value in results["latency_ms"].items()))
+    print("  loop lag ms  " + "  ".join(f"{name} {value:.2f}" for name, value in results["loop_lag_ms"].items()))
+    print("  outcomes     " + ", ".join(f"{name}: {count}" for name, count in sorted(results["outcomes"].items())))
+    print(f"  mock         {results['mock']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
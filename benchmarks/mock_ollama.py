@@ -0,0 +1,234 @@
+"""
+Mock Ollama Server
+
+A deterministic stand-in for Ollama's HTTP API, for load benchmarks. It
+answers ``/api/version``, ``/api/tags`` and ``/api/generate`` (blocking and
+streamed) with a simple timing model:
+
+- ``latency`` seconds before anything happens (network and model load)
+- prompt evaluation at ``prompt_rate`` tokens/s (4 characters per token)
+- ``tokens`` generated tokens at ``token_rate`` tokens/s, capped by the
+  request's ``num_predict``
+- at most ``parallel`` generations at once (like ``OLLAMA_NUM_PARALLEL``);
+  further requests wait
+
+Generated text echoes the words of the draft after ``DRAFT TO EDIT:`` or
+``DRAFT TO TRANSFORM:``, so chunked edits stitch back into readable
+output. Failures are injected from a seeded random generator: ``error``
+answers HTTP 500, ``drop`` cuts a stream off halfway.
+
+Usage:
+    python benchmarks/mock_ollama.py --port 11434 --token-rate 40 --failure-rate 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+CHARS_PER_TOKEN = 4
+DRAFT_PATTERN = re.compile(r"DRAFT TO (?:EDIT|TRANSFORM):\n(.*?)(?:\n\nProvide only|\Z)", re.S)
+
+
+class MockOllama:
+    """Timing model, failure injection and counters behind the mock API."""
+
+    def __init__(
+        self,
+        token_rate: float = 40.0,
+        prompt_rate: float = 2000.0,
+        latency: float = 0.05,
+        tokens: int = 200,
+        parallel: int = 4,
+        failure_rate: float = 0.0,
+        failure_mode: str = "error",
+        seed: int = 0,
+        models: Optional[List[str]] = None
+    ):
+        """
+        Initialize the mock.
+
+        Args:
+            token_rate (float): Generated tokens per second per request
+            prompt_rate (float): Prompt tokens evaluated per second
+            latency (float): Fixed delay before prompt evaluation, in seconds
+            tokens (int): Tokens generated per response
+            parallel (int): Generations processed at once
+            failure_rate (float): Fraction of generations that fail
+            failure_mode (str): ``error`` (HTTP 500) or ``drop`` (streams
+                stop halfway; blocking requests get HTTP 500)
+            seed (int): Seed for failure injection
+            models (List[str]): Model names listed by ``/api/tags``
+        """
+        self.token_rate = token_rate
+        self.prompt_rate = prompt_rate
+        self.latency = latency
+        self.tokens = tokens
+        self.failure_rate = failure_rate
+        self.failure_mode = failure_mode
+        self.models = models or ["llama3.1:8b", "llama3:8b"]
+        self._random = random.Random(seed)
+        self._slots = asyncio.Semaphore(parallel)
+        self.requests = 0
+        self.failures = 0
+        self.active = 0
+        self.peak_active = 0
+
+    def response_words(self, prompt: str, num_predict: Optional[int]) -> List[str]:
+        """
+        Choose the words of a response deterministically from the prompt.
+
+        Args:
+            prompt (str): Request prompt
+            num_predict (int): Token limit from the request options
+
+        Returns:
+            List[str]: One word per generated token
+        """
+        match = DRAFT_PATTERN.search(prompt)
+        source = match.group(1).split() if match else ["Formal", "tone,", "short", "sentences,", "active", "voice."]
+        count = min(self.tokens, num_predict) if num_predict else self.tokens
+        if match and len(source) <= count:
+            return source
+        return [source[index % len(source)] for index in range(count)]
+
+    def should_fail(self) -> bool:
+        """Draw the next failure decision from the seeded generator."""
+        return self._random.random() < self.failure_rate
+
+    def create_app(self) -> FastAPI:
+        """
+        Build the mock API.
+
+        Returns:
+            FastAPI: Application serving the Ollama endpoints plus ``/stats``
+        """
+        app = FastAPI(title="Mock Ollama")
+
+        @app.get("/api/version")
+        async def version():
+            return {"version": "0.0.0-mock"}
+
+        @app.get("/api/tags")
+        async def tags():
+            return {"models": [{"name": model} for model in self.models]}
+
+        @app.get("/stats")
+        async def stats():
+            return {"requests": self.requests, "failures": self.failures, "peak_active": self.peak_active}
+
+        @app.post("/api/generate")
+        async def generate(request: Request):
+            body = await request.json()
+            prompt = body.get("prompt", "")
+            words = self.response_words(prompt, body.get("options", {}).get("num_predict"))
+            prompt_tokens = len(prompt) // CHARS_PER_TOKEN + 1
+            fail = self.should_fail()
+            self.requests += 1
+
+            if fail and (self.failure_mode == "error" or not body.get("stream", True)):
+                self.failures += 1
+                await asyncio.sleep(self.latency)
+                return JSONResponse(status_code=500, content={"error": "injected failure"})
+
+            async def evaluate_prompt() -> Dict[str, Any]:
+                await asyncio.sleep(self.latency + prompt_tokens / self.prompt_rate)
+                return {
+                    "model": body.get("model"),
+                    "load_duration": int(self.latency * 1e9),
+                    "prompt_eval_count": prompt_tokens,
+                    "prompt_eval_duration": int(prompt_tokens / self.prompt_rate * 1e9),
+                }
+
+            def final(stats: Dict[str, Any], started: float, generated: int) -> Dict[str, Any]:
+                return {
+                    **stats,
+                    "done": True,
+                    "eval_count": generated,
+                    "eval_duration": int(generated / self.token_rate * 1e9),
+                    "total_duration": int((time.perf_counter() - started) * 1e9),
+                }
+
+            if not body.get("stream", True):
+                async with self._slots:
+                    self._enter()
+                    try:
+                        started = time.perf_counter()
+                        stats = await evaluate_prompt()
+                        await asyncio.sleep(len(words) / self.token_rate)
+                    finally:
+                        self.active -= 1
+                return {"response": " ".join(words), **final(stats, started, len(words))}
+
+            async def stream():
+                async with self._slots:
+                    self._enter()
+                    try:
+                        started = time.perf_counter()
+                        stats = await evaluate_prompt()
+                        for index, word in enumerate(words):
+                            if fail and index == len(words) // 2:
+                                self.failures += 1
+                                raise ConnectionError("injected stream drop")
+                            await asyncio.sleep(1 / self.token_rate)
+                            token = word if index == 0 else " " + word
+                            yield json.dumps({"model": body.get("model"), "response": token, "done": False}) + "\n"
+                        yield json.dumps({"response": "", **final(stats, started, len(words))}) + "\n"
+                    finally:
+                        self.active -= 1
+
+            return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+        return app
+
+    def _enter(self) -> None:
+        """Count a generation that got a processing slot."""
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+
+
+def main() -> None:
+    """Serve the mock until interrupted."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--token-rate", type=float, default=40.0, help="generated tokens per second per request")
+    parser.add_argument("--prompt-rate", type=float, default=2000.0, help="prompt tokens evaluated per second")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds before prompt evaluation starts")
+    parser.add_argument("--tokens", type=int, default=200, help="tokens generated per response")
+    parser.add_argument("--parallel", type=int, default=4, help="generations processed at once")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of generations that fail")
+    parser.add_argument("--failure-mode", choices=("error", "drop"), default="error")
+    parser.add_argument("--seed", type=int, default=0, help="seed for failure injection")
+    parser.add_argument("--model", action="append", dest="models", help="model listed by /api/tags (repeatable)")
+    args = parser.parse_args()
+
+    async def serve() -> None:
+        # Created inside the loop so the concurrency semaphore binds to it
+        mock = MockOllama(
+            token_rate=args.token_rate,
+            prompt_rate=args.prompt_rate,
+            latency=args.latency,
+            tokens=args.tokens,
+            parallel=args.parallel,
+            failure_rate=args.failure_rate,
+            failure_mode=args.failure_mode,
+            seed=args.seed,
+            models=args.models,
+        )
+        config = uvicorn.Config(mock.create_app(), host=args.host, port=args.port, log_level="warning")
+        await uvicorn.Server(config).serve()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+DOCX Stream Module
+
+Streaming text extraction for .docx files: walks the WordprocessingML
+parts with ``iterparse`` and yields one paragraph at a time, keeping
+memory flat regardless of document size.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from typing import BinaryIO, Iterator, List, Union
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_PARAGRAPH = f"{W_NS}p"
+_TABLE = f"{W_NS}tbl"
+_ROW = f"{W_NS}tr"
+_CELL = f"{W_NS}tc"
+_TEXT = f"{W_NS}t"
+_TAB = f"{W_NS}tab"
+_BREAKS = {f"{W_NS}br", f"{W_NS}cr"}
+_NO_BREAK_HYPHEN = f"{W_NS}noBreakHyphen"
+
+# Body first, so text-length limits keep the main content
+_SECONDARY_PARTS = (
+    re.compile(r"word/footnotes\.xml"),
+    re.compile(r"word/endnotes\.xml"),
+    re.compile(r"word/header\d*\.xml"),
+    re.compile(r"word/footer\d*\.xml"),
+)
+
+
+def iter_docx_paragraphs(source: Union[str, BinaryIO]) -> Iterator[str]:
+    """
+    Yield the non-empty paragraphs of a .docx file in reading order.
+
+    The document body comes first, then footnotes, endnotes, headers and
+    footers. Table rows are yielded as one line with cells separated by
+    tabs; paragraphs inside a cell are joined with spaces.
+
+    Args:
+        source (Union[str, BinaryIO]): Path to the file or a binary stream
+
+    Yields:
+        str: Paragraph text
+
+    Raises:
+        zipfile.BadZipFile: If the file is not a .docx archive
+        KeyError: If the archive has no ``word/document.xml``
+        xml.etree.ElementTree.ParseError: If a part is not well-formed XML
+    """
+    with zipfile.ZipFile(source) as archive:
+        names = archive.namelist()
+        parts = ["word/document.xml"]
+        for pattern in _SECONDARY_PARTS:
+            parts.extend(sorted(name for name in names if pattern.fullmatch(name)))
+
+        for part in parts:
+            with archive.open(part) as stream:
+                yield from _iter_part_paragraphs(stream)
+
+
+def extract_docx_text(source: Union[str, BinaryIO]) -> str:
+    """
+    Extract the text of a .docx file, one paragraph per line.
+
+    Args:
+        source (Union[str, BinaryIO]): Path to the file or a binary stream
+
+    Returns:
+        str: Extracted text
+    """
+    return "\n".join(iter_docx_paragraphs(source))
+
+
+def _iter_part_paragraphs(stream: BinaryIO) -> Iterator[str]:
+    """Yield the paragraphs of one WordprocessingML part, discarding parsed elements."""
+    open_elements: List[ET.Element] = []
+    paragraphs: List[List[str]] = []
+    cells: List[List[str]] = []
+    rows: List[List[str]] = []
+    blocks = 0
+
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            open_elements.append(elem)
+            if tag == _PARAGRAPH:
+                paragraphs.append([])
+                blocks += 1
+            elif tag == _TABLE:
+                blocks += 1
+            elif tag == _ROW:
+                rows.append([])
+            elif tag == _CELL:
+                cells.append([])
+            continue
+
+        open_elements.pop()
+        line = None
+        if tag == _TEXT:
+            if elem.text and paragraphs:
+                paragraphs[-1].append(elem.text)
+        elif tag == _TAB:
+            if paragraphs:
+                paragraphs[-1].append("\t")
+        elif tag in _BREAKS:
+            if paragraphs:
+                paragraphs[-1].append("\n")
+        elif tag == _NO_BREAK_HYPHEN:
+            if paragraphs:
+                paragraphs[-1].append("-")
+        elif tag == _PARAGRAPH:
+            # Text boxes nest paragraphs inside paragraphs; each is yielded on its own
+            line = "".join(paragraphs.pop()).strip()
+        elif tag == _CELL:
+            cell = " ".join(cells.pop())
+            if rows:
+                rows[-1].append(cell)
+        elif tag == _ROW:
+            line = "\t".join(rows.pop()).strip()
+
+        if line:
+            if cells:
+                cells[-1].append(line)
+            else:
+                yield line
+
+        if tag == _PARAGRAPH or tag == _TABLE:
+            blocks -= 1
+            elem.clear()
+            if blocks == 0 and open_elements:
+                # Detach finished top-level blocks so the tree never grows
+                open_elements[-1].remove(elem)
@@ -0,0 +1,232 @@
+"""
+Draft Chunker Module
+
+Splits long drafts into chunks on heading and paragraph boundaries so
+they can be edited in parallel, describes each chunk's place in the draft
+for its prompt, and stitches the edited chunks back together in order.
+"""
+
+import re
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+try:
+    from .batch_runner import map_as_completed
+    from .prompt_budget import PromptBudget
+except ImportError:  # imported as a top-level module by main.py
+    from batch_runner import map_as_completed
+    from prompt_budget import PromptBudget
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# Markdown headings, or short single lines without closing punctuation
+_HEADING = re.compile(r"^(#{1,6}\s+\S.*|[A-Z0-9][^\n]{0,80}[^.!?,;\n])$")
+_PREAMBLE = re.compile(
+    r"^\s*(here is|here's|below is|sure[,!]|certainly[,!])[^\n]*[:.]\s*\n+",
+    re.IGNORECASE,
+)
+_CODE_FENCE = re.compile(r"^\s*```[a-z]*\n(.*)\n```\s*$", re.DOTALL)
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """
+    Split text into non-empty paragraphs on blank lines.
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        List[str]: Stripped paragraphs
+    """
+    paragraphs = _PARAGRAPH_BREAK.split(text.replace("\r\n", "\n"))
+    return [paragraph.strip() for paragraph in paragraphs if paragraph.strip()]
+
+
+def split_draft(draft_content: str, max_tokens: int) -> List[str]:
+    """
+    Split a draft into chunks of at most ``max_tokens`` estimated tokens.
+
+    Paragraphs are packed greedily; a heading starts a new chunk once the
+    current one is at least half full, so chunks tend to follow the
+    document's own sections. A single paragraph over the limit is split
+    on sentence boundaries.
+
+    Args:
+        draft_content (str): Draft text
+        max_tokens (int): Token limit per chunk
+
+    Returns:
+        List[str]: Chunks in order; just the draft if it fits
+    """
+    if PromptBudget.estimate_tokens(draft_content) <= max_tokens:
+        return [draft_content]
+
+    max_chars = max_tokens * PromptBudget.CHARS_PER_TOKEN
+    chunks: List[str] = []
+    current: List[str] = []
+    current_chars = 0
+
+    for paragraph in split_paragraphs(draft_content):
+        pieces = [paragraph] if len(paragraph) <= max_chars else _split_sentences(paragraph, max_chars)
+        for piece in pieces:
+            is_heading = _HEADING.match(piece) is not None
+            if current and (
+                current_chars + len(piece) > max_chars
+                or (is_heading and current_chars >= max_chars // 2)
+            ):
+                chunks.append("\n\n".join(current))
+                current, current_chars = [], 0
+            current.append(piece)
+            current_chars += len(piece) + 2
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def clean_chunk(text: str) -> str:
+    """
+    Remove chatter a model tends to wrap around an edited chunk.
+
+    Drops an enclosing code fence and a leading "Here is the edited
+    text:" style preamble.
+
+    Args:
+        text (str): Generated chunk
+
+    Returns:
+        str: Chunk text
+    """
+    text = text.strip()
+    fenced = _CODE_FENCE.match(text)
+    if fenced:
+        text = fenced.group(1).strip()
+    return _PREAMBLE.sub("", text, count=1).strip()
+
+
+def continue_chunk(previous: Optional[str], chunk: str) -> str:
+    """
+    Return the text that joins an edited chunk onto the previous one.
+
+    This is the continuity pass run at every seam: the chunk is cleaned,
+    a paragraph it repeats from the end of the previous chunk is dropped,
+    and paragraphs are separated by exactly one blank line.
+
+    Args:
+        previous (Optional[str]): The previous edited chunk, or None for
+            the first chunk
+        chunk (str): Edited chunk
+
+    Returns:
+        str: Text to append to the output so far
+    """
+    paragraphs = split_paragraphs(clean_chunk(chunk))
+    if previous is not None:
+        previous_paragraphs = split_paragraphs(clean_chunk(previous))
+        if paragraphs and previous_paragraphs and paragraphs[0] == previous_paragraphs[-1]:
+            paragraphs = paragraphs[1:]
+
+    text = "\n\n".join(paragraphs)
+    return f"\n\n{text}" if previous is not None and text else text
+
+
+def chunk_context(chunks: List[str], index: int) -> str:
+    """
+    Describe a chunk's place in a long draft, for its editing prompt.
+
+    Goes between the prompt's static prefix and the chunk itself: the
+    chunk's position, how to keep it consistent with the rest of the
+    draft, and the end of the previous chunk and the start of the next one
+    as read-only context so the edited chunk joins up with its neighbours.
+
+    Args:
+        chunks (List[str]): All chunks of the draft
+        index (int): Chunk being edited
+
+    Returns:
+        str: Prompt text
+    """
+    context = ""
+    if index > 0:
+        preceding = split_paragraphs(chunks[index - 1])[-1][-600:]
+        context += f"\nTHE PRECEDING PART ENDS WITH (context only, do not repeat it):\n{preceding}\n"
+    if index < len(chunks) - 1:
+        following = split_paragraphs(chunks[index + 1])[0][:300]
+        context += f"\nTHE NEXT PART BEGINS WITH (context only, do not include it):\n{following}\n"
+
+    return f"""
+This draft is part {index + 1} of {len(chunks)} of a longer article; the other parts are edited separately with the same instructions.
+Keep this part's headings and the order of its sections so it fits back into the article, make its opening and ending read naturally next to the surrounding text shown for context, and do not add an introduction or conclusion for the whole article unless this part already has one. Do not include the context in your answer.
+{context}"""
+
+
+async def edit_chunks_in_order(
+    chunks: List[str],
+    edit_chunk: Callable[[int], Awaitable[str]],
+    concurrency: int,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    stage: str = "editing",
+) -> AsyncIterator[str]:
+    """
+    Edit draft chunks concurrently, yielding the stitched result in order.
+
+    Each edited chunk is yielded once every chunk before it is done,
+    already joined to its predecessor by ``continue_chunk``. A failed
+    chunk fails the edit and cancels the rest, as does closing the
+    iterator early.
+
+    Args:
+        chunks (List[str]): Draft chunks from ``split_draft``
+        edit_chunk (Callable[[int], Awaitable[str]]): Edits the chunk at an index
+        concurrency (int): Chunks edited at once
+        on_progress (Callable): Optional callback receiving chunk progress
+        stage (str): Stage name reported in progress events
+
+    Yields:
+        str: Consecutive pieces of the edited document
+    """
+    report = on_progress or (lambda event: None)
+    finished: Dict[int, str] = {}
+    previous: Optional[str] = None
+    next_index = 0
+    done = 0
+    report({"stage": stage, "chunks_done": 0, "chunks_total": len(chunks)})
+
+    outcomes = map_as_completed(range(len(chunks)), edit_chunk, concurrency)
+    try:
+        async for index, edited_chunk, error in outcomes:
+            if error is not None:
+                raise error
+            finished[index] = edited_chunk
+            done += 1
+            report({"stage": stage, "chunks_done": done, "chunks_total": len(chunks)})
+
+            while next_index in finished:
+                chunk = finished.pop(next_index)
+                yield continue_chunk(previous, chunk)
+                previous = chunk
+                next_index += 1
+    finally:
+        await outcomes.aclose()
+
+
+def _split_sentences(paragraph: str, max_chars: int) -> List[str]:
+    """Split an oversized paragraph into pieces of whole sentences, hard-cutting any longer sentence."""
+    pieces: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(paragraph):
+        while len(sentence) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if not sentence:
+            continue
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
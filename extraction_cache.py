@@ -0,0 +1,96 @@
+"""
+Extraction Cache Module
+
+Content-addressed cache for text extracted from uploaded documents, with
+an in-memory LRU tier and an optional SQLite tier on disk.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+try:
+    from .tiered_cache import TieredCache
+except ImportError:  # imported as a top-level module by main.py
+    from tiered_cache import TieredCache
+
+Document = Dict[str, Any]
+
+
+class ExtractionCache(TieredCache):
+    """
+    Two-tier cache mapping file content to its extracted text.
+
+    Keys are SHA-256 digests of the file's own digest, the extractor
+    version and the extraction options, so re-uploading the same file is
+    free while a changed extractor or different limits miss the cache.
+    Entries expire after ``ttl`` seconds; each tier evicts its least
+    recently used entries beyond its limit. Concurrent misses for the same
+    key share a single extraction.
+    """
+
+    table = "extractions"
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        disk_path: Optional[str] = None,
+        max_disk_entries: Optional[int] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Unset arguments fall back to the ``EXTRACTION_CACHE_*`` environment
+        variables. The disk tier is only enabled when a path is configured.
+
+        Args:
+            max_entries (int): Maximum documents held in memory
+            ttl (float): Seconds an entry stays valid
+            disk_path (str): SQLite database file for the disk tier
+            max_disk_entries (int): Maximum documents kept on disk
+        """
+        super().__init__(
+            max_entries or int(os.getenv("EXTRACTION_CACHE_SIZE", 128)),
+            ttl or float(os.getenv("EXTRACTION_CACHE_TTL", 7 * 24 * 3600)),
+            disk_path or os.getenv("EXTRACTION_CACHE_DB") or None,
+            max_disk_entries or int(os.getenv("EXTRACTION_CACHE_DISK_ENTRIES", 1000)),
+        )
+
+    @staticmethod
+    def make_key(content_sha256: str, extractor_version: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key for a file and the way it is extracted.
+
+        Args:
+            content_sha256 (str): Hex SHA-256 of the file bytes
+            extractor_version (str): Version of the extraction code
+            options (Dict[str, Any]): Anything else that changes the output,
+                e.g. format and page/character limits
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        payload = json.dumps(
+            {"sha256": content_sha256, "extractor": extractor_version, "options": options or {}},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Document]]) -> Tuple[Document, bool]:
+        """
+        Return the cached document or extract and store it.
+
+        If another request is already extracting the same key, wait for its
+        result instead of parsing the file twice. Failures are not cached.
+
+        Args:
+            key (str): Cache key from ``make_key``
+            compute (Callable[[], Awaitable[Document]]): Extracts on a miss
+
+        Returns:
+            Tuple[Document, bool]: The document and whether it came from the
+            cache (or a concurrent extraction) rather than a fresh parse
+        """
+        return await self._get_or_compute(key, compute)
@@ -0,0 +1,206 @@
+"""
+Extraction Pool Module
+
+Runs CPU-bound document parsing outside the event loop, in a process
+pool by default or a thread pool as fallback, with per-task timeouts.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+
+class _WorkerHTTPError(Exception):
+    """Picklable carrier for an HTTPException raised inside a worker process."""
+
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _call(func: Callable[..., Any], *args: Any) -> Any:
+    """Run ``func`` in a worker, making HTTP errors survive pickling."""
+    try:
+        return func(*args)
+    except HTTPException as e:
+        raise _WorkerHTTPError(e.status_code, e.detail) from None
+
+
+class ExtractionPool:
+    """
+    Executor for blocking parse work.
+
+    ``mode="process"`` spreads parsing across cores and keeps the GIL free
+    for request handling; where processes are unavailable the pool falls
+    back to threads, which still keep the event loop responsive. Work
+    submitted to the pool must be a picklable module-level function.
+
+    Tasks wait in the event loop until a worker is free, so queued tasks
+    are cancelled with their request and ``timeout`` only counts the time a
+    task runs. A task that exceeds it fails with HTTP 504. In process mode
+    its workers are then killed and replaced, so a runaway parse cannot
+    keep a worker busy; other tasks that were running on them start again
+    on the new workers. Threads cannot be interrupted, so in thread mode a
+    timed-out parse keeps its worker until it finishes.
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the pool; workers start on first use.
+
+        Args:
+            mode (str): ``process`` or ``thread`` (``EXTRACTION_POOL``)
+            max_workers (int): Worker count (``EXTRACTION_WORKERS``, defaults
+                to the CPU count, at most 4)
+            timeout (float): Seconds a task may run (``EXTRACTION_TIMEOUT``)
+        """
+        self.mode = (mode or os.getenv("EXTRACTION_POOL", "process")).lower()
+        self.max_workers = max_workers or int(os.getenv("EXTRACTION_WORKERS", min(4, os.cpu_count() or 1)))
+        self.timeout = timeout or float(os.getenv("EXTRACTION_TIMEOUT", 30))
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+
+    async def run(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run ``func(*args)`` in a worker.
+
+        Args:
+            func (Callable): Module-level function to run
+            *args: Picklable arguments
+            timeout (float): Override of the pool's task timeout
+
+        Returns:
+            Any: The function's result
+
+        Raises:
+            HTTPException: Raised by the function, or 504 on timeout and 500
+                if the worker process died
+        """
+        for attempt in range(2):
+            executor, future = await self._start(func, args)
+            try:
+                result = await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+            except asyncio.TimeoutError:
+                self._timed_out += 1
+                self._recycle(executor)
+                raise HTTPException(status_code=504, detail="Text extraction timed out")
+            except _WorkerHTTPError as e:
+                self._failed += 1
+                raise HTTPException(status_code=e.status_code, detail=e.detail)
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory) or was recycled; retry once on fresh workers
+                if self._executor is executor:
+                    self._reset()
+                if attempt == 0:
+                    continue
+                self._failed += 1
+                raise HTTPException(status_code=500, detail="Text extraction worker crashed")
+            except HTTPException:
+                self._failed += 1
+                raise
+
+            self._completed += 1
+            return result
+
+    def shutdown(self) -> None:
+        """Stop the workers, cancelling queued tasks."""
+        self._reset()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool configuration and task counters.
+
+        Returns:
+            Dict[str, Any]: Mode, worker count, timeout and outcome counts
+        """
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "timeout_seconds": self.timeout,
+            "completed": self._completed,
+            "failed": self._failed,
+            "timed_out": self._timed_out,
+        }
+
+    async def _start(self, func: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[Executor, "Future[Any]"]:
+        """Wait for a free worker and hand it the task; the worker is freed when the task ends."""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots, self._slots_loop = asyncio.Semaphore(self.max_workers), loop
+        slots = self._slots
+
+        await slots.acquire()
+        try:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(_call, func, *args)
+            except BrokenProcessPool:
+                self._reset()
+                executor = self._get_executor()
+                future = executor.submit(_call, func, *args)
+            except (OSError, NotImplementedError) as e:
+                # Worker processes could not be started here
+                self._fall_back(e)
+                executor = self._get_executor()
+                future = executor.submit(_call, func, *args)
+        except BaseException:
+            slots.release()
+            raise
+
+        def free_worker(_: "Future[Any]") -> None:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(slots.release)
+
+        future.add_done_callback(free_worker)
+        return executor, future
+
+    def _recycle(self, executor: Executor) -> None:
+        """Kill a process pool's workers, stopping a parse that ran too long."""
+        if not isinstance(executor, ProcessPoolExecutor):
+            return
+        processes = list((executor._processes or {}).values())
+        if self._executor is executor:
+            self._reset()
+        for process in processes:
+            process.terminate()
+
+    def _get_executor(self) -> Executor:
+        """Create the executor on first use."""
+        if self._executor is None:
+            if self.mode == "process":
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                except (OSError, NotImplementedError, ImportError) as e:
+                    self._fall_back(e)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="extract")
+        return self._executor
+
+    def _fall_back(self, error: Exception) -> None:
+        """Switch to a thread pool when processes cannot be used."""
+        logger.warning(f"Process pool unavailable ({error}); extracting in threads instead")
+        self._reset()
+        self.mode = "thread"
+
+    def _reset(self) -> None:
+        """Drop the current executor without waiting for running tasks."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -5,16 +5,23 @@ Handles extraction of text content from various file formats
 including PDF, DOCX, and TXT files.
 """
 
+import asyncio
+import io
+import math
 import os
-import tempfile
-import zipfile
-import xml.etree.ElementTree as ET
-from typing import Union, BinaryIO
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union, BinaryIO
 
 import PyPDF2
-from docx import Document
 from fastapi import HTTPException, UploadFile
 
+from .docx_stream import extract_docx_text
+from .extraction_cache import ExtractionCache
+from .extraction_pool import ExtractionPool
+from .metrics import MetricsRegistry, size_class
+from .tracing import Tracer
+from .upload_stream import read_upload
+
 
 class FileProcessor:
     """
@@ -29,9 +36,42 @@ class FileProcessor:
     SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.txt'}
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
     
-    def __init__(self):
-        """Initialize the file processor."""
-        pass
+    # Formats whose parsing is CPU-bound: run in the extraction pool and cached
+    POOLED_EXTENSIONS = {'.pdf', '.docx'}
+    
+    # Bump whenever extraction output changes so cached results are not reused
+    EXTRACTOR_VERSION = "3"
+    
+    def __init__(
+        self,
+        pool: Optional[ExtractionPool] = None,
+        pdf_pages_per_task: Optional[int] = None,
+        cache: Optional[ExtractionCache] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        tracer: Optional[Tracer] = None
+    ):
+        """
+        Initialize the file processor.
+        
+        Args:
+            pool (ExtractionPool): Worker pool for PDF/DOCX parsing; one is
+                created if omitted
+            pdf_pages_per_task (int): PDF pages in the first task and the
+                fewest pages given to any later task (``PDF_PAGES_PER_TASK``)
+            cache (ExtractionCache): Cache of extracted PDF/DOCX text; one is
+                created if omitted
+            metrics (MetricsRegistry): Registry for extraction timings; one
+                is created if omitted
+            tracer (Tracer): Records extraction spans; one is created if omitted
+        """
+        self.pool = pool or ExtractionPool()
+        self.cache = cache or ExtractionCache()
+        self.pdf_pages_per_task = pdf_pages_per_task or int(os.getenv("PDF_PAGES_PER_TASK", 8))
+        self.metrics = metrics or MetricsRegistry()
+        self.extraction_seconds = self.metrics.histogram(
+            "extraction_duration_seconds", "Text extraction time per uploaded file", ("format", "size", "cached")
+        )
+        self.tracer = tracer or Tracer()
     
     async def extract_text_from_upload(self, file: UploadFile) -> str:
         """
@@ -43,6 +83,36 @@ class FileProcessor:
         Returns:
             str: Extracted text content
             
+        Raises:
+            HTTPException: If file processing fails
+        """
+        document = await self.extract_document(file)
+        return document["text"]
+    
+    async def extract_document(
+        self,
+        file: UploadFile,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract text from an uploaded file, optionally stopping early.
+        
+        PDFs are extracted page-parallel across the worker pool and stop
+        once ``max_pages`` pages or ``max_chars`` characters are collected,
+        so a long manual used as a style sample isn't parsed in full.
+        
+        Args:
+            file (UploadFile): The uploaded file object
+            max_pages (int): Extract at most this many PDF pages
+            max_chars (int): Stop once this many characters are collected;
+                the text is cut to this length
+            
+        Returns:
+            Dict[str, Any]: ``text``, ``truncated``, ``sha256`` and ``cached``
+            (whether parsing was skipped), plus ``pages_processed`` and
+            ``total_pages`` for PDFs
+            
         Raises:
             HTTPException: If file processing fails
         """
@@ -52,25 +122,133 @@ class FileProcessor:
                 detail=f"Unsupported file format. Supported: {', '.join(self.SUPPORTED_EXTENSIONS)}"
             )
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file.filename) as tmp_file:
-            content = await file.read()
-            
-            if len(content) > self.MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"File too large. Maximum size: {self.MAX_FILE_SIZE // (1024*1024)}MB"
+        # Read in chunks, giving up as soon as the upload crosses the size limit
+        upload = await read_upload(file, self.MAX_FILE_SIZE)
+        extension = os.path.splitext(file.filename.lower())[1]
+        started = time.perf_counter()
+        
+        async def extract() -> Dict[str, Any]:
+            return await self._extract_content(upload.content, extension, max_pages, max_chars)
+        
+        with self.tracer.span("extract", format=extension, size_bytes=len(upload.content)) as span:
+            if extension in self.POOLED_EXTENSIONS:
+                key = ExtractionCache.make_key(
+                    upload.sha256,
+                    self.EXTRACTOR_VERSION,
+                    {"format": extension, "max_pages": max_pages, "max_chars": max_chars}
                 )
+                document, cached = await self.cache.get_or_compute(key, extract)
+            else:
+                document, cached = await extract(), False
+            span.set_attribute("cached", cached)
+        
+        self.extraction_seconds.observe(
+            time.perf_counter() - started,
+            format=extension,
+            size=size_class(len(upload.content)),
+            cached=str(cached).lower()
+        )
+        return {**document, "sha256": upload.sha256, "cached": cached}
+    
+    async def _extract_content(
+        self,
+        content: bytes,
+        extension: str,
+        max_pages: Optional[int],
+        max_chars: Optional[int]
+    ) -> Dict[str, Any]:
+        """
+        Extract text from file content, applying the page and character limits.
+        
+        Args:
+            content (bytes): Raw file content
+            extension (str): Lower-case file extension
+            max_pages (int): Extract at most this many PDF pages
+            max_chars (int): Stop once this many characters are collected
             
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
+        Returns:
+            Dict[str, Any]: Text, truncation flag and, for PDFs, page counts
+        """
+        filename = f"upload{extension}"
+        if extension == '.pdf':
+            return await self._extract_pdf_document(content, max_pages, max_chars)
         
-        try:
-            return self._extract_text_by_extension(tmp_file_path, file.filename)
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_file_path):
-                os.unlink(tmp_file_path)
+        if extension in self.POOLED_EXTENSIONS:
+            # Parse off the event loop so large documents don't stall other requests
+            text = await self.pool.run(extract_text_from_bytes, content, filename)
+        else:
+            text = extract_text_from_bytes(content, filename)
+        
+        truncated = max_chars is not None and len(text) > max_chars
+        return {"text": text[:max_chars] if truncated else text, "truncated": truncated}
+    
+    def close(self) -> None:
+        """Stop the extraction workers."""
+        self.pool.shutdown()
+    
+    async def _extract_pdf_document(
+        self,
+        content: bytes,
+        max_pages: Optional[int],
+        max_chars: Optional[int]
+    ) -> Dict[str, Any]:
+        """
+        Extract PDF pages in parallel batches, stopping at the page or character limit.
+        
+        The first task reads ``pdf_pages_per_task`` pages and reports the page
+        count. Each later wave splits its pages into one contiguous range per
+        worker, so every worker receives and parses the document once per
+        wave rather than once per few pages. Without a character limit a
+        single wave covers the rest of the document; with one, a wave covers
+        the pages the limit is expected to need, estimated from the
+        characters per page so far, and the limit is checked between waves.
+        
+        Args:
+            content (bytes): Raw PDF content
+            max_pages (int): Extract at most this many pages
+            max_chars (int): Stop once this many characters are collected
+            
+        Returns:
+            Dict[str, Any]: Text, truncation flag and page counts
+        """
+        step = self.pdf_pages_per_task
+        total_pages, texts = await self.pool.run(
+            extract_pdf_pages, content, 0, min(step, max_pages or step), max_chars
+        )
+        page_limit = min(total_pages, max_pages or total_pages)
+        collected = sum(len(text) for text in texts)
+        
+        start = len(texts)
+        while start < page_limit and (max_chars is None or collected < max_chars):
+            stop = page_limit
+            if max_chars is not None and collected:
+                needed = math.ceil((max_chars - collected) / (collected / start))
+                stop = min(page_limit, start + max(step, needed))
+            span = max(step, math.ceil((stop - start) / self.pool.max_workers))
+            ranges = [(range_start, min(range_start + span, stop)) for range_start in range(start, stop, span)]
+            start = stop
+            
+            remaining = None if max_chars is None else max_chars - collected
+            batches = await asyncio.gather(*[
+                self.pool.run(extract_pdf_pages, content, range_start, range_stop, remaining)
+                for range_start, range_stop in ranges
+            ])
+            
+            # A range only stops short once it alone hit the limit, so pages stay contiguous
+            for _, batch in batches:
+                texts.extend(batch)
+                collected += sum(len(text) for text in batch)
+                if max_chars is not None and collected >= max_chars:
+                    break
+        
+        text = '\n'.join(texts)
+        truncated = len(texts) < total_pages or (max_chars is not None and len(text) > max_chars)
+        return {
+            "text": text[:max_chars] if truncated and max_chars is not None else text,
+            "truncated": truncated,
+            "pages_processed": len(texts),
+            "total_pages": total_pages
+        }
     
     def _is_valid_file(self, file: UploadFile) -> bool:
         """
@@ -88,12 +266,14 @@ class FileProcessor:
         extension = os.path.splitext(file.filename.lower())[1]
         return extension in self.SUPPORTED_EXTENSIONS
     
-    def _extract_text_by_extension(self, file_path: str, filename: str) -> str:
+    @classmethod
+    def _extract_text_by_extension(cls, file_path: Union[str, BinaryIO], filename: str) -> str:
         """
         Extract text based on file extension.
         
         Args:
-            file_path (str): Path to the temporary file
+            file_path (Union[str, BinaryIO]): Path to the file, or a binary
+                stream positioned at the start of its content
             filename (str): Original filename
             
         Returns:
@@ -102,108 +282,169 @@ class FileProcessor:
         extension = os.path.splitext(filename.lower())[1]
         
         if extension == '.pdf':
-            return self._extract_from_pdf(file_path)
+            return cls._extract_from_pdf(file_path)
         elif extension == '.docx':
-            return self._extract_from_docx(file_path)
+            return cls._extract_from_docx(file_path)
         else:  # .txt
-            return self._extract_from_txt(file_path)
+            return cls._extract_from_txt(file_path)
     
-    def _extract_from_pdf(self, file_path: str) -> str:
+    @classmethod
+    def _extract_from_pdf(cls, file_path: Union[str, BinaryIO]) -> str:
         """
         Extract text from PDF file.
         
         Args:
-            file_path (str): Path to PDF file
+            file_path (Union[str, BinaryIO]): Path to PDF file or binary stream
             
         Returns:
             str: Extracted text content
         """
+        _, text_parts = cls._extract_pdf_pages(file_path)
+        return '\n'.join(text_parts)
+    
+    @staticmethod
+    def _extract_pdf_pages(
+        file_path: Union[str, BinaryIO],
+        start: int = 0,
+        stop: Optional[int] = None,
+        max_chars: Optional[int] = None
+    ) -> Tuple[int, List[str]]:
+        """
+        Extract text from a range of PDF pages.
+        
+        Args:
+            file_path (Union[str, BinaryIO]): Path to PDF file or binary stream
+            start (int): First page index
+            stop (int): Page index to stop before; defaults to the last page
+            max_chars (int): Stop after the page that reaches this many characters
+            
+        Returns:
+            Tuple[int, List[str]]: Total page count and the text of each extracted page
+        """
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text_parts = []
-                
-                for page in pdf_reader.pages:
-                    text_parts.append(page.extract_text())
-                
-                return '\n'.join(text_parts)
+            pdf_reader = PyPDF2.PdfReader(file_path)
+            total_pages = len(pdf_reader.pages)
+            text_parts = []
+            collected = 0
+            
+            for index in range(start, min(stop if stop is not None else total_pages, total_pages)):
+                text = pdf_reader.pages[index].extract_text()
+                text_parts.append(text)
+                collected += len(text)
+                if max_chars is not None and collected >= max_chars:
+                    break
+            
+            return total_pages, text_parts
         except Exception as e:
             raise HTTPException(
                 status_code=400,
                 detail=f"Failed to extract text from PDF: {str(e)}"
             )
     
-    def _extract_from_docx(self, file_path: str) -> str:
+    @staticmethod
+    def _extract_from_docx(file_path: Union[str, BinaryIO]) -> str:
         """
         Extract text from DOCX file.
         
+        Streams the body, tables, footnotes, endnotes, headers and footers
+        paragraph by paragraph, without building a document object model.
+        
         Args:
-            file_path (str): Path to DOCX file
+            file_path (Union[str, BinaryIO]): Path to DOCX file or binary stream
             
         Returns:
-            str: Extracted text content
+            str: Extracted text content, one paragraph per line
         """
         try:
-            # Primary method using python-docx
-            doc = Document(file_path)
-            text_parts = [paragraph.text for paragraph in doc.paragraphs]
-            return '\n'.join(text_parts)
-        except Exception:
-            # Fallback method using XML extraction
-            try:
-                return self._extract_docx_fallback(file_path)
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to extract text from DOCX: {str(e)}"
-                )
+            return extract_docx_text(file_path)
+        except Exception as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Failed to extract text from DOCX: {str(e)}"
+            )
     
-    def _extract_docx_fallback(self, file_path: str) -> str:
+    @classmethod
+    def _extract_from_txt(cls, file_path: Union[str, BinaryIO]) -> str:
         """
-        Fallback method to extract text from DOCX using XML parsing.
+        Extract text from TXT file.
         
         Args:
-            file_path (str): Path to DOCX file
+            file_path (Union[str, BinaryIO]): Path to TXT file or binary stream
             
         Returns:
-            str: Extracted text content
+            str: File content as string
         """
-        with zipfile.ZipFile(file_path, 'r') as zip_file:
-            xml_content = zip_file.read('word/document.xml')
-            root = ET.fromstring(xml_content)
-            
-            text_parts = []
-            for elem in root.iter():
-                if elem.text:
-                    text_parts.append(elem.text)
+        try:
+            if isinstance(file_path, str):
+                with open(file_path, 'rb') as file:
+                    return cls._decode_text(file.read())
             
-            return ' '.join(text_parts)
+            return cls._decode_text(file_path.read())
+        except Exception as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Failed to read text file: {str(e)}"
+            )
     
-    def _extract_from_txt(self, file_path: str) -> str:
+    @staticmethod
+    def _decode_text(content: bytes) -> str:
         """
-        Extract text from TXT file.
+        Decode text content as UTF-8, falling back to Latin-1.
         
         Args:
-            file_path (str): Path to TXT file
+            content (bytes): Raw file content
             
         Returns:
-            str: File content as string
+            str: Decoded text
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
+            return content.decode('utf-8')
         except UnicodeDecodeError:
             # Try with different encoding
-            try:
-                with open(file_path, 'r', encoding='latin-1') as file:
-                    return file.read()
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to read text file: {str(e)}"
-                )
-        except Exception as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Failed to read text file: {str(e)}"
-            )
\ No newline at end of file
+            return content.decode('latin-1')
+
+
+def extract_text_from_bytes(content: bytes, filename: str) -> str:
+    """
+    Extract text from in-memory file content.
+    
+    Module-level so it can be sent to extraction worker processes.
+    
+    Args:
+        content (bytes): Raw file content
+        filename (str): Original filename, used to pick the format
+        
+    Returns:
+        str: Extracted text content
+    """
+    if os.path.splitext(filename.lower())[1] == '.txt':
+        # Plain text needs no parser, so decode the bytes without wrapping them
+        return FileProcessor._decode_text(content)
+    
+    # Parse straight from memory; BytesIO shares bytes until written to but copies a bytearray
+    with io.BytesIO(content) as buffer:
+        return FileProcessor._extract_text_by_extension(buffer, filename)
+
+
+def extract_pdf_pages(
+    content: bytes,
+    start: int,
+    stop: Optional[int],
+    max_chars: Optional[int] = None
+) -> Tuple[int, List[str]]:
+    """
+    Extract text from a range of pages of in-memory PDF content.
+    
+    Module-level so it can be sent to extraction worker processes.
+    
+    Args:
+        content (bytes): Raw PDF content
+        start (int): First page index
+        stop (int): Page index to stop before; None for the last page
+        max_chars (int): Stop after the page that reaches this many characters
+        
+    Returns:
+        Tuple[int, List[str]]: Total page count and per-page text
+    """
+    with io.BytesIO(content) as buffer:
+        return FileProcessor._extract_pdf_pages(buffer, start, stop, max_chars)
@@ -0,0 +1,313 @@
+"""
+Generation Scheduler Module
+
+Admission control in front of the LLM: a concurrency limit, a bounded
+FIFO wait queue, fast rejection with ``Retry-After`` and queue metrics.
+"""
+
+import asyncio
+import contextlib
+import math
+import os
+import statistics
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from fastapi import HTTPException
+
+
+class SchedulerRejected(HTTPException):
+    """Base class for requests the scheduler refuses to run."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(status_code=status_code, detail=detail, headers={"Retry-After": str(retry_after)})
+        self.retry_after = retry_after
+
+
+class QueueFullError(SchedulerRejected):
+    """Raised when the wait queue is full (HTTP 429)."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(429, "AI service is busy. Please retry shortly.", retry_after)
+
+
+class QueueTimeoutError(SchedulerRejected):
+    """Raised when a request waited too long for a slot (HTTP 503)."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(503, "Timed out waiting for the AI service. Please retry shortly.", retry_after)
+
+
+class Ticket:
+    """A request's place in the scheduler, from admission to release."""
+
+    def __init__(self):
+        self.enqueued_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.granted: "asyncio.Future[bool]" = asyncio.get_running_loop().create_future()
+        self.released = False
+
+    @property
+    def wait_time(self) -> float:
+        """Seconds spent queued (so far, if still waiting)."""
+        end = self.started_at if self.started_at is not None else time.perf_counter()
+        return end - self.enqueued_at
+
+
+class GenerationScheduler:
+    """
+    Bounded FIFO scheduler for LLM generations.
+
+    At most ``max_concurrency`` generations run at once; up to ``max_queue``
+    more wait in arrival order. Anything beyond that is rejected at once
+    with HTTP 429, and queued requests give up with HTTP 503 after
+    ``queue_timeout`` seconds. Both carry a ``Retry-After`` estimate.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency (int): Concurrent generations (``GENERATION_CONCURRENCY``)
+            max_queue (int): Requests allowed to wait (``GENERATION_QUEUE_SIZE``)
+            queue_timeout (float): Seconds a request may wait (``GENERATION_QUEUE_TIMEOUT``)
+        """
+        self.max_concurrency = max_concurrency or int(os.getenv("GENERATION_CONCURRENCY", 2))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("GENERATION_QUEUE_SIZE", 16))
+        self.queue_timeout = queue_timeout or float(os.getenv("GENERATION_QUEUE_TIMEOUT", 60))
+
+        self._active = 0
+        self._waiters: Deque[Ticket] = deque()
+        self._wait_times: Deque[float] = deque(maxlen=1000)
+        self._service_times: Deque[float] = deque(maxlen=200)
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._completed = 0
+
+    def ensure_capacity(self) -> None:
+        """
+        Reject right away if a new request could not even be queued.
+
+        Raises:
+            QueueFullError: If the wait queue is full
+        """
+        if self._active >= self.max_concurrency and len(self._waiters) >= self.max_queue:
+            self._rejected += 1
+            raise QueueFullError(self.retry_after())
+
+    def submit(self) -> Ticket:
+        """
+        Admit a request, granting a slot now or queueing it.
+
+        Returns:
+            Ticket: The request's ticket; pass it to ``wait`` and ``release``
+
+        Raises:
+            QueueFullError: If the wait queue is full
+        """
+        self.ensure_capacity()
+        ticket = Ticket()
+        self._admitted += 1
+        if self._active < self.max_concurrency and not self._waiters:
+            self._grant(ticket)
+        else:
+            self._waiters.append(ticket)
+        return ticket
+
+    async def wait(self, ticket: Ticket, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a ticket's slot.
+
+        Args:
+            ticket (Ticket): Ticket from ``submit``
+            timeout (float): Return False after this many seconds if still queued
+
+        Returns:
+            bool: True once the slot is granted
+
+        Raises:
+            QueueTimeoutError: If the ticket exceeded ``queue_timeout``
+        """
+        if ticket.granted.done():
+            return True
+
+        remaining = self.queue_timeout - ticket.wait_time
+        if remaining <= 0:
+            self._expire(ticket)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(ticket.granted), min(timeout or remaining, remaining))
+            return True
+        except asyncio.TimeoutError:
+            if ticket.granted.done():
+                return True
+            if ticket.wait_time >= self.queue_timeout:
+                self._expire(ticket)
+            return False
+
+    def release(self, ticket: Ticket) -> None:
+        """
+        Give back a slot or leave the queue. Safe to call more than once.
+
+        Args:
+            ticket (Ticket): Ticket from ``submit``
+        """
+        if ticket.released:
+            return
+        ticket.released = True
+
+        if not ticket.granted.done():
+            self._waiters.remove(ticket)
+            ticket.granted.cancel()
+            return
+
+        self._completed += 1
+        self._service_times.append(time.perf_counter() - ticket.started_at)
+        self._active -= 1
+        if self._waiters:
+            self._grant(self._waiters.popleft())
+
+    async def queue_positions(self, ticket: Ticket, interval: float = 1.0) -> AsyncIterator[int]:
+        """
+        Wait for a ticket's slot, yielding its queue position whenever it changes.
+
+        Args:
+            ticket (Ticket): Ticket from ``submit``
+            interval (float): Seconds between position checks
+
+        Yields:
+            int: Current 1-based queue position
+
+        Raises:
+            QueueTimeoutError: If the ticket exceeded ``queue_timeout``
+        """
+        last_position = 0
+        while not ticket.granted.done():
+            position = self.position(ticket)
+            if position != last_position:
+                last_position = position
+                yield position
+            await self.wait(ticket, timeout=interval)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, retry: bool = False) -> AsyncIterator[Ticket]:
+        """
+        Hold a generation slot for the duration of the block.
+
+        Args:
+            retry (bool): Instead of raising on rejection, sleep for the
+                ``Retry-After`` estimate and try again (for background work)
+
+        Yields:
+            Ticket: The granted ticket
+
+        Raises:
+            QueueFullError: If the wait queue is full
+            QueueTimeoutError: If no slot was granted within ``queue_timeout``
+        """
+        while True:
+            try:
+                ticket = self.submit()
+            except QueueFullError as e:
+                if not retry:
+                    raise
+                await asyncio.sleep(e.retry_after)
+                continue
+
+            try:
+                while not await self.wait(ticket):
+                    pass
+            except QueueTimeoutError as e:
+                if not retry:
+                    raise
+                await asyncio.sleep(e.retry_after)
+                continue
+            except BaseException:
+                self.release(ticket)
+                raise
+            break
+
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def position(self, ticket: Ticket) -> int:
+        """
+        Get a ticket's 1-based queue position, or 0 once it is running.
+
+        Args:
+            ticket (Ticket): Ticket from ``submit``
+
+        Returns:
+            int: Queue position
+        """
+        if ticket.granted.done():
+            return 0
+        try:
+            return self._waiters.index(ticket) + 1
+        except ValueError:
+            return 0
+
+    def retry_after(self) -> int:
+        """
+        Estimate how many seconds until a new request could start.
+
+        Returns:
+            int: Suggested ``Retry-After`` in whole seconds (at least 1)
+        """
+        service_time = statistics.median(self._service_times) if self._service_times else 10.0
+        backlog = len(self._waiters) + 1
+        return max(1, math.ceil(service_time * backlog / self.max_concurrency))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth, throughput counters and wait-time percentiles.
+
+        Returns:
+            Dict[str, Any]: Scheduler metrics
+        """
+        waits = sorted(self._wait_times)
+        return {
+            "active": self._active,
+            "queued": len(self._waiters),
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "completed": self._completed,
+            "wait_ms_p50": self._percentile_ms(waits, 0.50),
+            "wait_ms_p95": self._percentile_ms(waits, 0.95),
+            "wait_ms_max": round(waits[-1] * 1000, 1) if waits else 0.0,
+            "retry_after": self.retry_after(),
+        }
+
+    def _grant(self, ticket: Ticket) -> None:
+        """Start a ticket's generation."""
+        self._active += 1
+        ticket.started_at = time.perf_counter()
+        self._wait_times.append(ticket.wait_time)
+        ticket.granted.set_result(True)
+
+    def _expire(self, ticket: Ticket) -> None:
+        """Drop a ticket that waited too long."""
+        self._timed_out += 1
+        self.release(ticket)
+        raise QueueTimeoutError(self.retry_after())
+
+    @staticmethod
+    def _percentile_ms(sorted_values, fraction: float) -> float:
+        """Nearest-rank percentile of sorted seconds, in milliseconds."""
+        if not sorted_values:
+            return 0.0
+        index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+        return round(sorted_values[index] * 1000, 1)
@@ -0,0 +1,208 @@
+"""
+Health Monitor Module
+
+Probes Ollama in the background and serves readiness from memory, so
+health checks and request admission never wait on a network round-trip.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """
+    Background readiness monitor for an Ollama server.
+
+    A cheap probe (``/api/version`` and ``/api/tags``) runs every
+    ``interval`` seconds and the last result is kept with its timestamp.
+    An optional deep probe runs a tiny real generation; it is off by
+    default and otherwise runs at a much longer interval.
+    """
+
+    def __init__(
+        self,
+        client,
+        model: str,
+        interval: Optional[float] = None,
+        timeout: float = 5.0,
+        deep_probe: Optional[bool] = None,
+        deep_interval: Optional[float] = None,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            client (LLMBackend): Shared Ollama client or pool of servers
+            model (str): Model that must be installed for the service to be ready
+            interval (float): Seconds between cheap probes (``HEALTH_PROBE_INTERVAL``)
+            timeout (float): Timeout for each cheap probe request
+            deep_probe (bool): Run periodic generation probes (``HEALTH_DEEP_PROBE``)
+            deep_interval (float): Seconds between deep probes (``HEALTH_DEEP_INTERVAL``)
+        """
+        self.client = client
+        self.model = model
+        self.interval = interval or float(os.getenv("HEALTH_PROBE_INTERVAL", 10))
+        self.timeout = timeout
+        if deep_probe is None:
+            deep_probe = os.getenv("HEALTH_DEEP_PROBE", "").lower() in ("1", "true", "yes")
+        self.deep_probe = deep_probe
+        self.deep_interval = deep_interval or float(os.getenv("HEALTH_DEEP_INTERVAL", 300))
+
+        self._state: Dict[str, Any] = {
+            "ollama_up": False,
+            "model_available": False,
+            "version": None,
+            "error": "Not checked yet",
+            "checked_at": None,
+            "latency_ms": None,
+        }
+        self._deep_state: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._deep_lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """Whether Ollama was up with the model installed at the last probe."""
+        return self._state["ollama_up"] and self._state["model_available"]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the last known state without touching the network.
+
+        Returns:
+            Dict[str, Any]: Probe results, readiness and age in seconds
+        """
+        checked_at = self._state["checked_at"]
+        return {
+            **self._state,
+            "ready": self.ready,
+            "age_seconds": round(time.time() - checked_at, 3) if checked_at else None,
+            "deep": self._deep_state,
+        }
+
+    async def start(self) -> None:
+        """Start the background probe loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background probe loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self, max_age: float) -> Dict[str, Any]:
+        """
+        Probe now if the last result is older than ``max_age`` seconds.
+
+        Concurrent callers share a single probe.
+
+        Args:
+            max_age (float): Maximum acceptable age of the cached state
+
+        Returns:
+            Dict[str, Any]: Current snapshot
+        """
+        if self._is_stale(self._state["checked_at"], max_age):
+            async with self._lock:
+                if self._is_stale(self._state["checked_at"], max_age):
+                    await self._probe()
+        return self.snapshot()
+
+    async def deep_check(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run a tiny real generation, reusing a recent result if available.
+
+        Args:
+            max_age (float): Reuse a result younger than this; defaults to ``deep_interval``
+
+        Returns:
+            Dict[str, Any]: Deep probe result
+        """
+        max_age = self.deep_interval if max_age is None else max_age
+        async with self._deep_lock:
+            checked_at = self._deep_state["checked_at"] if self._deep_state else None
+            if self._is_stale(checked_at, max_age):
+                await self._deep_probe()
+        return self._deep_state
+
+    async def _run(self) -> None:
+        """Probe on an interval until cancelled."""
+        while True:
+            async with self._lock:
+                await self._probe()
+            if self.deep_probe and self.ready:
+                await self.deep_check()
+            await asyncio.sleep(self.interval)
+
+    async def _probe(self) -> None:
+        """Check that Ollama answers and the model is installed."""
+        started = time.perf_counter()
+        state: Dict[str, Any] = {"ollama_up": False, "model_available": False, "version": None, "error": None}
+        try:
+            response = await self.client.get("/api/version", timeout=self.timeout)
+            if response.status_code != 200:
+                state["error"] = f"HTTP {response.status_code} from /api/version"
+            else:
+                state["ollama_up"] = True
+                state["version"] = response.json().get("version")
+
+                models_response = await self.client.get("/api/tags", timeout=self.timeout)
+                if models_response.status_code != 200:
+                    state["error"] = f"HTTP {models_response.status_code} from /api/tags"
+                else:
+                    models = models_response.json().get("models", [])
+                    state["model_available"] = any(self.model in model.get("name", "") for model in models)
+                    if not state["model_available"]:
+                        state["error"] = f"Model {self.model} not installed yet"
+        except Exception as e:
+            state["error"] = str(e) or type(e).__name__
+
+        was_ready = self.ready
+        state["checked_at"] = time.time()
+        state["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self._state = state
+        if self.ready != was_ready:
+            logger.info(f"Ollama readiness changed: ready={self.ready} ({state['error'] or 'ok'})")
+
+    async def _deep_probe(self) -> None:
+        """Generate a few tokens to prove the model actually answers."""
+        started = time.perf_counter()
+        result: Dict[str, Any] = {"status": "error", "output": None, "error": None}
+        try:
+            response = await self.client.post(
+                "/api/generate",
+                json={
+                    "model": self.model,
+                    "prompt": "Say hello in one sentence.",
+                    "stream": False,
+                    "options": {"num_predict": 16}
+                },
+                timeout=60
+            )
+            if response.status_code == 200:
+                result["status"] = "success"
+                result["output"] = response.json().get("response", "").strip()[:100]
+            else:
+                result["error"] = f"HTTP {response.status_code}"
+        except Exception as e:
+            result["error"] = str(e) or type(e).__name__
+
+        result["checked_at"] = time.time()
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self._deep_state = result
+
+    @staticmethod
+    def _is_stale(checked_at: Optional[float], max_age: float) -> bool:
+        """Whether a timestamp is missing or older than ``max_age``."""
+        return checked_at is None or time.time() - checked_at > max_age
@@ -0,0 +1,229 @@
+"""
+Job Manager Module
+
+Runs long generations as background jobs that clients poll or subscribe
+to, so results survive slow clients, proxies and dropped connections.
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+TERMINAL_STATUSES = {"succeeded", "failed", "cancelled"}
+
+
+class Job:
+    """A background job with its status, progress events and result."""
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "pending"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.events: List[Dict[str, Any]] = []
+        self.task: Optional[asyncio.Task] = None
+        self._subscribers: List[asyncio.Queue] = []
+
+    @property
+    def done(self) -> bool:
+        """Whether the job reached a terminal status."""
+        return self.status in TERMINAL_STATUSES
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Record a progress event and deliver it to live subscribers."""
+        event = {**event, "at": time.time()}
+        self.events.append(event)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the public view of the job.
+
+        Returns:
+            Dict[str, Any]: Status, timestamps, latest progress and result
+        """
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.events[-1] if self.events else None,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    In-memory registry of background jobs.
+
+    Each submitted job runs as its own task and reports progress through
+    a callback. Finished jobs are kept for ``retention`` seconds so the
+    result can be fetched later; at most ``max_jobs`` are stored, the
+    oldest finished ones being dropped first.
+    """
+
+    def __init__(self, retention: Optional[float] = None, max_jobs: Optional[int] = None):
+        """
+        Initialize the job manager.
+
+        Args:
+            retention (float): Seconds finished jobs are kept (``JOB_RETENTION``)
+            max_jobs (int): Maximum stored jobs (``JOB_MAX_STORED``)
+        """
+        self.retention = retention or float(os.getenv("JOB_RETENTION", 3600))
+        self.max_jobs = max_jobs or int(os.getenv("JOB_MAX_STORED", 1000))
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def submit(self, work: Callable[[ProgressCallback], Awaitable[Any]], kind: str = "generate-edit") -> Job:
+        """
+        Start a job in the background.
+
+        Args:
+            work (Callable): Coroutine function taking a progress callback and
+                returning the job result
+            kind (str): Job type label
+
+        Returns:
+            Job: The started job
+        """
+        self._prune()
+        job = Job(kind)
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, work))
+        job.task.add_done_callback(lambda _: self._cancel_unstarted(job))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job.
+
+        Args:
+            job_id (str): Job ID
+
+        Returns:
+            Optional[Job]: The job, or None if unknown or expired
+        """
+        self._prune()
+        return self._jobs.get(job_id)
+
+    async def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a pending or running job.
+
+        Args:
+            job_id (str): Job ID
+
+        Returns:
+            bool: True if the job was still running and is now cancelled
+        """
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+        job.task.cancel()
+        try:
+            await job.task
+        except asyncio.CancelledError:
+            pass
+        return True
+
+    async def events(self, job: Job) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Replay a job's progress events, then follow live ones until it ends.
+
+        Args:
+            job (Job): Job to follow
+
+        Yields:
+            Dict[str, Any]: Progress events, ending with the terminal status
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        history = list(job.events)
+        job._subscribers.append(queue)
+        try:
+            for event in history:
+                yield event
+            if history and history[-1].get("status") in TERMINAL_STATUSES:
+                return
+            while True:
+                event = await queue.get()
+                yield event
+                if event.get("status") in TERMINAL_STATUSES:
+                    return
+        finally:
+            job._subscribers.remove(queue)
+
+    async def shutdown(self) -> None:
+        """Cancel every unfinished job."""
+        running = [job.task for job in self._jobs.values() if not job.done]
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get job counts by status.
+
+        Returns:
+            Dict[str, Any]: Stored job count and per-status counts
+        """
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"stored": len(self._jobs), "by_status": counts, "retention_seconds": self.retention}
+
+    async def _run(self, job: Job, work: Callable[[ProgressCallback], Awaitable[Any]]) -> None:
+        """Run a job's work and record its outcome."""
+        job.status = "running"
+        job.started_at = time.time()
+        job.publish({"status": "running"})
+        try:
+            job.result = await work(lambda event: job.publish({"status": "running", **event}))
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except HTTPException as e:
+            job.status = "failed"
+            job.error = e.detail
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            job.publish({"status": job.status, "error": job.error})
+
+    def _cancel_unstarted(self, job: Job) -> None:
+        """Record a job whose task was cancelled before ``_run`` began."""
+        if job.done:
+            return
+        job.status = "cancelled"
+        job.finished_at = time.time()
+        job.publish({"status": job.status, "error": job.error})
+
+    def _prune(self) -> None:
+        """Drop expired finished jobs, then the oldest finished beyond ``max_jobs``."""
+        now = time.time()
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job.done and now - job.finished_at > self.retention
+        ]:
+            del self._jobs[job_id]
+
+        excess = len(self._jobs) - self.max_jobs + 1
+        if excess > 0:
+            for job_id in [job_id for job_id, job in self._jobs.items() if job.done][:excess]:
+                del self._jobs[job_id]
@@ -0,0 +1,412 @@
+"""
+LLM Backend Module
+
+Defines the interface the application uses to reach a text generation
+service, and a backend that spreads requests over several Ollama servers.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Protocol, Sequence, Set
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Errors raised before the request reached the server, so another endpoint can take it
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+
+def _is_server_failure(error: Any) -> bool:
+    """
+    Tell whether an error says the server is unhealthy, not the request bad.
+
+    Connection and timeout errors and 5xx answers count; a 4xx (unknown
+    model, malformed request) or an error reported inside a stream does
+    not, so one misbehaving client cannot eject healthy servers.
+
+    Args:
+        error (Any): Exception raised by a request, or an HTTP status code
+
+    Returns:
+        bool: True if the failure counts toward ejecting the server
+    """
+    if isinstance(error, int):
+        return error >= 500
+    if isinstance(error, httpx.TransportError):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code is not None and status_code >= 500
+
+
+class LLMBackend(Protocol):
+    """
+    What the AI engine, health monitor and app need from a generation service.
+
+    ``OllamaClient`` (one server) and ``OllamaPool`` (several) both provide
+    it. ``route_key`` lets callers ask for related requests to land on the
+    same server; backends with a single server ignore it.
+    """
+
+    async def get(self, path: str, timeout: Optional[float] = None) -> httpx.Response:
+        """Send a GET request to the service API."""
+        ...
+
+    async def post(
+        self, path: str, json: Dict[str, Any], timeout: Optional[float] = None, route_key: Optional[str] = None
+    ) -> httpx.Response:
+        """Send a POST request with a JSON body to the service API."""
+        ...
+
+    def stream_generate(self, payload: Dict[str, Any], route_key: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a generation chunk by chunk."""
+        ...
+
+    async def aclose(self) -> None:
+        """Release connections and background tasks."""
+        ...
+
+
+def parse_endpoints(value: Optional[str], default: str = "http://localhost:11434") -> List[str]:
+    """
+    Parse a comma-separated list of server URLs.
+
+    Args:
+        value (str): Setting such as ``OLLAMA_HOSTS``; may be None or empty
+        default (str): URL used when nothing is configured
+
+    Returns:
+        List[str]: Distinct URLs in the order given
+    """
+    urls = [url.strip().rstrip("/") for url in (value or "").split(",") if url.strip()]
+    return list(dict.fromkeys(urls)) or [default]
+
+
+class Endpoint:
+    """One server behind an ``OllamaPool`` and its load and health state."""
+
+    def __init__(self, url: str, client: LLMBackend):
+        self.url = url
+        self.client = client
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.last_error: Optional[str] = None
+
+    @property
+    def available(self) -> bool:
+        """Whether the endpoint is in rotation (not currently ejected)."""
+        return time.monotonic() >= self.ejected_until
+
+
+class OllamaPool:
+    """
+    Backend that load-balances over several Ollama servers.
+
+    Each request goes to the available server with the fewest outstanding
+    requests. Requests with a ``route_key`` (e.g. a hash of the style guide
+    prefix) prefer the server rendezvous hashing assigns to that key, so a
+    style profile keeps hitting the server whose prompt cache already holds
+    its prefix, unless that server is ``sticky_slack`` requests busier than
+    the least loaded one.
+
+    A server is ejected for ``ejection_time`` seconds (doubling on repeated
+    ejections, up to 8x) after ``max_failures`` consecutive failed requests
+    (connection errors, timeouts and 5xx answers; see ``_is_server_failure``),
+    or at once when an active probe fails; a successful probe brings it
+    back early. Requests that fail to connect are retried on the next
+    server. If every server is ejected, requests are sent anyway.
+    """
+
+    def __init__(
+        self,
+        base_urls: Sequence[str],
+        client_factory: Callable[[str], LLMBackend],
+        max_failures: Optional[int] = None,
+        ejection_time: Optional[float] = None,
+        probe_interval: Optional[float] = None,
+        probe_timeout: float = 5.0,
+        sticky_slack: Optional[int] = None,
+        observer: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Unset arguments fall back to the ``OLLAMA_*`` environment variables
+        and then to the defaults below.
+
+        Args:
+            base_urls (Sequence[str]): Server URLs
+            client_factory (Callable[[str], LLMBackend]): Creates the client for
+                one server URL, e.g. ``OllamaClient``
+            max_failures (int): Consecutive failures before passive ejection
+                (``OLLAMA_MAX_FAILURES``)
+            ejection_time (float): Base seconds a server stays ejected
+                (``OLLAMA_EJECTION_TIME``)
+            probe_interval (float): Seconds between active probes of every
+                server (``OLLAMA_PROBE_INTERVAL``)
+            probe_timeout (float): Timeout for each probe request
+            sticky_slack (int): Extra outstanding requests tolerated on a
+                route key's preferred server (``OLLAMA_STICKY_SLACK``)
+            observer (Callable[[Dict[str, Any]], None]): Called after every
+                generation with the server, mode (``stream`` or ``blocking``),
+                wall-clock seconds, time to first token (streamed), whether it
+                failed and Ollama's final response object
+        """
+        if not base_urls:
+            raise ValueError("At least one server URL is required")
+
+        self.endpoints = [Endpoint(url, client_factory(url)) for url in base_urls]
+        self.max_failures = max_failures or int(os.getenv("OLLAMA_MAX_FAILURES", 3))
+        self.ejection_time = ejection_time or float(os.getenv("OLLAMA_EJECTION_TIME", 30))
+        self.probe_interval = probe_interval or float(os.getenv("OLLAMA_PROBE_INTERVAL", 10))
+        self.probe_timeout = probe_timeout
+        self.sticky_slack = sticky_slack if sticky_slack is not None else int(os.getenv("OLLAMA_STICKY_SLACK", 2))
+        self.observer = observer
+        self._probe_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start probing every server in the background."""
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.create_task(self._run_probes())
+
+    async def get(self, path: str, timeout: Optional[float] = None) -> httpx.Response:
+        """
+        Send a GET request to the least loaded available server.
+
+        Args:
+            path (str): API path, e.g. ``/api/version``
+            timeout (float): Optional overall timeout overriding the defaults
+
+        Returns:
+            httpx.Response: Raw response
+        """
+        return await self._request(lambda client: client.get(path, timeout=timeout))
+
+    async def post(
+        self, path: str, json: Dict[str, Any], timeout: Optional[float] = None, route_key: Optional[str] = None
+    ) -> httpx.Response:
+        """
+        Send a POST request with a JSON body to the chosen server.
+
+        Args:
+            path (str): API path, e.g. ``/api/generate``
+            json (Dict[str, Any]): Request payload
+            timeout (float): Optional overall timeout overriding the defaults
+            route_key (str): Keeps requests with the same key on one server
+
+        Returns:
+            httpx.Response: Raw response
+        """
+        return await self._request(
+            lambda client: client.post(path, json=json, timeout=timeout), route_key, observe=path == "/api/generate"
+        )
+
+    async def stream_generate(self, payload: Dict[str, Any], route_key: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a generation from the chosen server.
+
+        Args:
+            payload (Dict[str, Any]): Generation payload
+            route_key (str): Keeps requests with the same key on one server
+
+        Yields:
+            Dict[str, Any]: Decoded chunks, the last one having ``done`` set
+        """
+        tried: Set[str] = set()
+        while True:
+            endpoint = self._pick(route_key, tried)
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            received = False
+            started = time.perf_counter()
+            first_token_seconds = None
+            try:
+                async for chunk in endpoint.client.stream_generate(payload):
+                    received = True
+                    if first_token_seconds is None and chunk.get("response"):
+                        first_token_seconds = time.perf_counter() - started
+                    if chunk.get("done"):
+                        self._observe(endpoint, "stream", started, chunk, first_token_seconds)
+                    yield chunk
+                self._succeeded(endpoint)
+                return
+            except _CONNECT_ERRORS as e:
+                self._failed(endpoint, e)
+                tried.add(endpoint.url)
+                if received or len(tried) == len(self.endpoints):
+                    self._observe(endpoint, "stream", started, error=True)
+                    raise
+            except Exception as e:
+                self._settle(endpoint, e)
+                self._observe(endpoint, "stream", started, error=True)
+                raise
+            finally:
+                endpoint.outstanding -= 1
+
+    async def aclose(self) -> None:
+        """Stop probing and close every server's connections."""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+        for endpoint in self.endpoints:
+            await endpoint.client.aclose()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Get per-server load and health.
+
+        Returns:
+            List[Dict[str, Any]]: URL, availability, outstanding and total
+            requests, errors and the last error for every server
+        """
+        now = time.monotonic()
+        return [
+            {
+                "url": endpoint.url,
+                "available": endpoint.available,
+                "ejected_for_seconds": round(max(0.0, endpoint.ejected_until - now), 1),
+                "outstanding": endpoint.outstanding,
+                "requests": endpoint.requests,
+                "errors": endpoint.errors,
+                "last_error": endpoint.last_error,
+            }
+            for endpoint in self.endpoints
+        ]
+
+    def _pick(self, route_key: Optional[str], exclude: Set[str]) -> Endpoint:
+        """Choose a server: the route key's preferred one if not overloaded, else the least loaded."""
+        remaining = [endpoint for endpoint in self.endpoints if endpoint.url not in exclude]
+        candidates = [endpoint for endpoint in remaining if endpoint.available] or remaining
+        least_loaded = min(candidates, key=lambda endpoint: (endpoint.outstanding, endpoint.requests))
+        if route_key:
+            # Rendezvous hashing: a key keeps its server while other servers come and go
+            preferred = max(
+                candidates,
+                key=lambda endpoint: hashlib.sha256(f"{route_key}|{endpoint.url}".encode("utf-8")).digest(),
+            )
+            if preferred.outstanding <= least_loaded.outstanding + self.sticky_slack:
+                return preferred
+        return least_loaded
+
+    async def _request(
+        self,
+        send: Callable[[LLMBackend], Awaitable[httpx.Response]],
+        route_key: Optional[str] = None,
+        observe: bool = False,
+    ) -> httpx.Response:
+        """Send a request, failing over to the next server when it cannot connect."""
+        tried: Set[str] = set()
+        while True:
+            endpoint = self._pick(route_key, tried)
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            started = time.perf_counter()
+            try:
+                response = await send(endpoint.client)
+            except _CONNECT_ERRORS as e:
+                self._failed(endpoint, e)
+                tried.add(endpoint.url)
+                if len(tried) == len(self.endpoints):
+                    if observe:
+                        self._observe(endpoint, "blocking", started, error=True)
+                    raise
+                continue
+            except Exception as e:
+                self._settle(endpoint, e)
+                if observe:
+                    self._observe(endpoint, "blocking", started, error=True)
+                raise
+            finally:
+                endpoint.outstanding -= 1
+
+            self._settle(endpoint, response.status_code)
+            if observe and self.observer is not None:
+                if response.status_code == 200:
+                    self._observe(endpoint, "blocking", started, response.json())
+                else:
+                    self._observe(endpoint, "blocking", started, error=True)
+            return response
+
+    def _observe(
+        self,
+        endpoint: Endpoint,
+        mode: str,
+        started: float,
+        response: Optional[Dict[str, Any]] = None,
+        first_token_seconds: Optional[float] = None,
+        error: bool = False,
+    ) -> None:
+        """Report a finished generation to the observer, if any."""
+        if self.observer is None:
+            return
+        self.observer({
+            "endpoint": endpoint.url,
+            "mode": mode,
+            "seconds": time.perf_counter() - started,
+            "first_token_seconds": first_token_seconds,
+            "error": error,
+            "response": response,
+        })
+
+    def _settle(self, endpoint: Endpoint, outcome: Any) -> None:
+        """Count an error or status as a server failure, or as proof the server answered."""
+        if _is_server_failure(outcome):
+            self._failed(endpoint, f"HTTP {outcome}" if isinstance(outcome, int) else outcome)
+        else:
+            self._succeeded(endpoint)
+
+    def _succeeded(self, endpoint: Endpoint) -> None:
+        """Reset a server's failure streak."""
+        endpoint.consecutive_failures = 0
+        endpoint.ejections = 0
+
+    def _failed(self, endpoint: Endpoint, error: Any) -> None:
+        """Count a failed request and eject the server after too many in a row."""
+        endpoint.errors += 1
+        endpoint.consecutive_failures += 1
+        endpoint.last_error = str(error) or type(error).__name__
+        if endpoint.consecutive_failures >= self.max_failures and endpoint.available:
+            self._eject(endpoint)
+
+    def _eject(self, endpoint: Endpoint) -> None:
+        """Take a server out of rotation, backing off on repeated ejections."""
+        endpoint.ejections += 1
+        duration = self.ejection_time * min(2 ** (endpoint.ejections - 1), 8)
+        endpoint.ejected_until = time.monotonic() + duration
+        logger.warning(f"Ejected {endpoint.url} for {duration:.0f}s ({endpoint.last_error})")
+
+    async def _run_probes(self) -> None:
+        """Probe every server on an interval until cancelled."""
+        while True:
+            await asyncio.gather(*(self._probe(endpoint) for endpoint in self.endpoints))
+            await asyncio.sleep(self.probe_interval)
+
+    async def _probe(self, endpoint: Endpoint) -> None:
+        """Eject a server that does not answer, or restore one that answers again."""
+        try:
+            response = await endpoint.client.get("/api/version", timeout=self.probe_timeout)
+            healthy = response.status_code == 200
+            error = None if healthy else f"HTTP {response.status_code} from /api/version"
+        except Exception as e:
+            healthy = False
+            error = str(e) or type(e).__name__
+
+        if healthy:
+            if not endpoint.available:
+                logger.info(f"Restored {endpoint.url} after a successful probe")
+            endpoint.ejected_until = 0.0
+            endpoint.consecutive_failures = 0
+        elif endpoint.available:
+            endpoint.last_error = error
+            self._eject(endpoint)
@@ -0,0 +1,193 @@
+"""
+Loop Watchdog Module
+
+Opt-in detector for event-loop lag and blocking calls: a heartbeat task
+measures how late the loop runs it, and a watcher thread logs the loop
+thread's stack when a single step blocks longer than a threshold.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LoopWatchdog:
+    """
+    Event-loop lag sampler and blocking-step reporter.
+
+    The heartbeat sleeps for ``interval`` and records how much later than
+    that it woke up; any lag is time some other callback held the loop.
+    While a step is still running, the watcher thread notices the missing
+    heartbeat and logs the loop thread's current stack, which points at the
+    blocking call (synchronous I/O, CPU-bound parsing, ...). Each stall is
+    reported once, however long it lasts.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        threshold: Optional[float] = None,
+        interval: Optional[float] = None,
+        max_samples: int = 1000
+    ):
+        """
+        Initialize the watchdog.
+
+        Args:
+            enabled (bool): Run at all (``LOOP_WATCHDOG``, off by default)
+            threshold (float): Seconds a step may block before its stack is
+                logged (``LOOP_BLOCK_THRESHOLD``)
+            interval (float): Seconds between heartbeats
+                (``LOOP_WATCHDOG_INTERVAL``)
+            max_samples (int): Recent lag samples kept for percentiles
+        """
+        if enabled is None:
+            enabled = os.getenv("LOOP_WATCHDOG", "").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+        self.threshold = threshold or float(os.getenv("LOOP_BLOCK_THRESHOLD", 0.1))
+        self.interval = interval or float(os.getenv("LOOP_WATCHDOG_INTERVAL", 0.05))
+        self._lags: Deque[float] = deque(maxlen=max_samples)
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._beat = 0
+        self._beat_at = time.monotonic()
+        self._reported_beat = -1
+        self._blocks = 0
+        self._blocked_seconds = 0.0
+        self._max_lag = 0.0
+        self._last_block: Optional[Dict[str, Any]] = None
+        self._last_block_beat = -1
+
+    async def start(self) -> None:
+        """Start the heartbeat and the watcher thread, if enabled."""
+        if not self.enabled or self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat_at = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.ensure_future(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"Loop watchdog started (threshold {self.threshold * 1000:.0f}ms)")
+
+    async def stop(self) -> None:
+        """Stop the heartbeat and the watcher thread."""
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._thread.join(timeout=1)
+        self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get lag percentiles and blocking counters.
+
+        Returns:
+            Dict[str, Any]: Lag p50/p99/max in milliseconds, stalls over the
+            threshold, total seconds blocked and the last stall's location
+        """
+        lags = sorted(self._lags)
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "lag_ms_p50": self._percentile_ms(lags, 0.50),
+            "lag_ms_p99": self._percentile_ms(lags, 0.99),
+            "lag_ms_max": round(self._max_lag * 1000, 1),
+            "blocks": self._blocks,
+            "blocked_seconds": round(self._blocked_seconds, 3),
+            "last_block": self._last_block,
+        }
+
+    def register_metrics(self, registry) -> None:
+        """
+        Export lag and blocking figures through a metrics registry.
+
+        Args:
+            registry (MetricsRegistry): Registry to register scrape-time
+                callbacks into
+        """
+        def lag_quantiles() -> Dict[Tuple[str], float]:
+            stats = self.stats()
+            return {
+                ("0.5",): stats["lag_ms_p50"] / 1000,
+                ("0.99",): stats["lag_ms_p99"] / 1000,
+                ("1",): stats["lag_ms_max"] / 1000,
+            }
+
+        registry.callback(
+            "event_loop_lag_seconds", "Event-loop lag of recent heartbeats (quantile 1 is the maximum)",
+            lag_quantiles, labelnames=("quantile",)
+        )
+        registry.callback(
+            "event_loop_blocks_total", "Event-loop stalls longer than the blocking threshold",
+            lambda: self._blocks, "counter"
+        )
+        registry.callback(
+            "event_loop_blocked_seconds_total", "Time the event loop spent in stalls over the threshold",
+            lambda: self._blocked_seconds, "counter"
+        )
+
+    async def _heartbeat(self) -> None:
+        """Sleep on a fixed interval and record how late each wake-up is."""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self._lags.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+            if lag >= self.threshold:
+                self._blocks += 1
+                self._blocked_seconds += lag
+                if self._last_block_beat == self._beat:
+                    self._last_block["seconds"] = round(lag, 3)
+            self._beat += 1
+            self._beat_at = time.monotonic()
+
+    def _watch(self) -> None:
+        """Watcher thread: log the loop thread's stack while a heartbeat is overdue."""
+        while not self._stopped.wait(self.threshold / 2):
+            beat = self._beat
+            overdue = time.monotonic() - self._beat_at - self.interval
+            if overdue < self.threshold or beat == self._reported_beat:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            self._reported_beat = beat
+            self._last_block_beat = beat
+            self._last_block = {
+                "at": time.time(),
+                "seconds": round(overdue, 3),
+                "location": f"{stack[-1].filename}:{stack[-1].lineno} in {stack[-1].name}" if stack else None,
+            }
+            logger.warning(
+                f"Event loop blocked for over {overdue * 1000:.0f}ms; loop thread stack:\n"
+                + "".join(traceback.format_list(stack))
+            )
+
+    @staticmethod
+    def _percentile_ms(sorted_values, fraction: float) -> float:
+        """Nearest-rank percentile of sorted seconds, in milliseconds."""
+        if not sorted_values:
+            return 0.0
+        index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+        return round(sorted_values[index] * 1000, 1)
@@ -1,11 +1,33 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List
-import requests
+from typing import List, NamedTuple, Optional, Tuple
+import contextlib
+import httpx
+import json
 import os
 import logging
+import time
+from batch_runner import map_as_completed
+import docx_stream
+from draft_chunker import chunk_context, edit_chunks_in_order, split_draft
+from extraction_cache import ExtractionCache
+from extraction_pool import ExtractionPool
+from generation_scheduler import GenerationScheduler, SchedulerRejected
+from health_monitor import HealthMonitor
+from job_manager import JobManager
+from loop_watchdog import LoopWatchdog
+from llm_backend import OllamaPool, parse_endpoints
+from metrics import CONTENT_TYPE, GenerationMetrics, MetricsMiddleware, MetricsRegistry, size_class, stats_callbacks
+from ollama_client import OllamaClient, OllamaError
+from page_cache import CachedPage
+from prompt_budget import PromptBudget
+from prompt_cache_stats import PromptCacheStats
+from static_assets import StaticAssets
+from upload_stream import read_upload
+from style_profiles import StyleProfileStore
+from tracing import Tracer, TracingMiddleware
 from ui_components import UIRenderer
 
 # Configure logging
@@ -14,6 +36,14 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Consistly", description="Style-Consistent Content Generation")
 
+# Prometheus-format metrics served at /metrics
+metrics = MetricsRegistry()
+app.add_middleware(MetricsMiddleware, registry=metrics)
+
+# Per-request stage spans, returned as a Server-Timing header
+tracer = Tracer()
+app.add_middleware(TracingMiddleware, tracer=tracer)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -24,81 +54,204 @@ app.add_middleware(
 )
 
 # Configuration
-OLLAMA_HOST = "http://localhost:11434"
-OLLAMA_MODEL = "llama3.1:8b"
+OLLAMA_HOSTS = parse_endpoints(os.getenv("OLLAMA_HOSTS") or os.getenv("OLLAMA_URL"))  # comma-separated
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")  # keeps the model and its cached prompt prefix loaded
 PORT = int(os.getenv("PORT", 8000))
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_BATCH_FILES = int(os.getenv("EXTRACTION_BATCH_MAX_FILES", 50))
+DOCX_EXTRACTOR_VERSION = "2"  # bump when extract_docx_text output changes
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 4))
+BATCH_MAX_DRAFTS = int(os.getenv("BATCH_MAX_DRAFTS", 100))
+EDIT_CHUNK_TOKENS = int(os.getenv("EDIT_CHUNK_TOKENS", 1200))
+EDIT_CHUNK_CONCURRENCY = int(os.getenv("EDIT_CHUNK_CONCURRENCY", 3))
+
+# Shared, pooled Ollama client reused by every request
+ollama_client = OllamaPool(OLLAMA_HOSTS, OllamaClient, observer=GenerationMetrics(metrics).observe)
+
+# Admission control: bounded concurrency and wait queue for generations
+scheduler = GenerationScheduler()
+
+# Background generation jobs that clients poll or subscribe to
+jobs = JobManager()
+
+# Background Ollama readiness probe; health checks read its cached state
+health_monitor = HealthMonitor(ollama_client, OLLAMA_MODEL)
+
+# Fingerprinted, precompressed frontend assets from static/
+static_assets = StaticAssets(os.path.join(os.path.dirname(os.path.abspath(__file__)), "static"))
+
+# Main page rendered once, then served with ETag and precompressed variants
+main_page = CachedPage(lambda: UIRenderer(static_assets.urls()).render_main_page())
+
+# Worker pool for CPU-bound document parsing, off the event loop
+extraction_pool = ExtractionPool()
+
+# Extracted .docx text keyed by file content, so re-uploads skip parsing
+extraction_cache = ExtractionCache()
+
+# Token budget that keeps long reference sets within the model's context
+prompt_budget = PromptBudget()
+
+# Prompt-eval tokens Ollama reuses for the shared references prefix, and time saved
+prompt_cache_stats = PromptCacheStats()
+
+# Stored reference sets that requests can refer to by ID
+style_profiles = StyleProfileStore()
+
+# Opt-in event-loop lag sampling and blocking-call stack traces (LOOP_WATCHDOG)
+loop_watchdog = LoopWatchdog()
+if loop_watchdog.enabled:
+    loop_watchdog.register_metrics(metrics)
+
+# Extraction latency by format, size and cache outcome
+extraction_seconds = metrics.histogram(
+    "extraction_duration_seconds", "Text extraction time per uploaded file", ("format", "size", "cached")
+)
+
+# Counters the components already keep, read at scrape time
+stats_callbacks(metrics, "scheduler", {"generation": scheduler.stats}, [
+    ("active", "active", "gauge", "Generations running"),
+    ("queued", "queued", "gauge", "Generations waiting for a slot"),
+    ("admitted", "admitted_total", "counter", "Generations admitted"),
+    ("rejected", "rejected_total", "counter", "Generations rejected because the queue was full"),
+    ("timed_out", "timed_out_total", "counter", "Generations that timed out waiting for a slot"),
+    ("completed", "completed_total", "counter", "Generations completed"),
+])
+stats_callbacks(metrics, "cache", {"extractions": extraction_cache.stats}, [
+    ("hits", "hits_total", "counter", "Cache hits"),
+    ("misses", "misses_total", "counter", "Cache misses"),
+    ("hit_ratio", "hit_ratio", "gauge", "Cache hits over lookups"),
+])
+stats_callbacks(metrics, "prompt_cache", {"ollama": prompt_cache_stats.stats}, [
+    ("estimated_reused_tokens", "reused_tokens_total", "counter", "Prompt tokens Ollama reused from its cache (estimated)"),
+    ("estimated_saved_seconds", "saved_seconds_total", "counter", "Prompt-eval seconds saved by cache reuse (estimated)"),
+    ("reuse_ratio", "reuse_ratio", "gauge", "Reused prompt tokens over tokens that would have been evaluated"),
+])
+metrics.callback(
+    "jobs", "Stored background jobs by status",
+    lambda: {(status,): count for status, count in jobs.stats()["by_status"].items()}, labelnames=("status",)
+)
+metrics.callback(
+    "ollama_backend_up", "Whether each Ollama server is taking requests",
+    lambda: {(backend["url"],): float(backend["available"]) for backend in ollama_client.stats()}, labelnames=("endpoint",)
+)
+metrics.callback(
+    "ollama_backend_outstanding", "Requests in flight on each Ollama server",
+    lambda: {(backend["url"],): backend["outstanding"] for backend in ollama_client.stats()}, labelnames=("endpoint",)
+)
 
 class EditRequest(BaseModel):
-    reference_articles: List[str]
+    reference_articles: List[str] = []
     draft_content: str
+    style_profile_id: Optional[str] = None
+
+class BatchEditRequest(BaseModel):
+    reference_articles: List[str] = []
+    drafts: List[str]
+    style_profile_id: Optional[str] = None
+    concurrency: Optional[int] = None
+
+class StyleProfileRequest(BaseModel):
+    reference_articles: List[str]
+    name: Optional[str] = None
 
 class EditResponse(BaseModel):
     data: dict
 
 @app.get("/", response_class=HTMLResponse)
-async def root():
+async def root(request: Request):
     """Serve the main application page"""
     try:
-        renderer = UIRenderer()
-        return renderer.render_main_page()
+        return main_page.response(request)
     except Exception as e:
         logger.error(f"Error rendering main page: {e}")
         return HTMLResponse("<h1>Consistly - Loading...</h1>")
 
+@app.get("/static/{filename}")
+async def static_file(filename: str, request: Request):
+    """Serve a frontend asset; fingerprinted names are cached as immutable"""
+    response = static_assets.response(filename, request)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return response
+
 @app.get("/api/health")
-async def health_check():
-    """Health check endpoint"""
-    try:
-        response = requests.get(f"{OLLAMA_HOST}/api/version", timeout=5)
-        if response.status_code == 200:
-            # Check if model is available
-            models_response = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=5)
-            models = models_response.json().get("models", [])
-            model_available = any(OLLAMA_MODEL in model.get("name", "") for model in models)
-            
-            return {
-                "status": "healthy" if model_available else "loading",
-                "ai_service": {
-                    "status": "success" if model_available else "downloading",
-                    "message": f"Ollama ready with {OLLAMA_MODEL}" if model_available else "AI model downloading..."
-                }
-            }
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
+async def health_check(deep: bool = False):
+    """Health check endpoint served from the background monitor's last probe"""
+    state = health_monitor.snapshot()
+    response = {"checked_at": state["checked_at"], "age_seconds": state["age_seconds"]}
+    
+    if deep and state["ollama_up"]:
+        response["deep"] = await health_monitor.deep_check()
+    
+    if state["ready"]:
+        return {
+            "status": "healthy",
+            "ai_service": {"status": "success", "message": f"Ollama ready with {OLLAMA_MODEL}"},
+            **response
+        }
+    
+    if state["ollama_up"]:
+        return {
+            "status": "loading",
+            "ai_service": {"status": "downloading", "message": "AI model downloading..."},
+            **response
+        }
     
     return {
         "status": "starting",
         "ai_service": {
             "status": "loading",
             "message": "AI service is starting up (first time takes ~5 minutes)..."
-        }
+        },
+        **response
     }
 
+@app.get("/api/queue")
+async def queue_status():
+    """Generation queue depth, wait times and admission counters"""
+    return {"data": scheduler.stats()}
+
+@app.get("/api/backends")
+async def backend_status():
+    """Load and health of each Ollama server"""
+    return {"data": ollama_client.stats()}
+
+@app.get("/api/cache-stats")
+async def cache_stats():
+    """Extracted text cache counters and prompt-eval time saved by Ollama's prefix cache"""
+    return {"data": {"extractions": extraction_cache.stats(), "prompt_cache": prompt_cache_stats.stats()}}
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Request, generation, extraction, cache and queue metrics in the Prometheus text format"""
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
+
+@app.get("/api/health/live")
+async def liveness_check():
+    """Liveness endpoint that never touches Ollama"""
+    return {"status": "alive"}
+
+@app.get("/api/health/ready")
+async def readiness_check():
+    """Readiness endpoint: 200 when Ollama and the model are available, 503 otherwise"""
+    state = health_monitor.snapshot()
+    return JSONResponse(status_code=200 if state["ready"] else 503, content=state)
+
 @app.post("/api/generate-edit", response_model=EditResponse)
 async def generate_edit(request: EditRequest):
     """Generate style-consistent content"""
     try:
         logger.info(f"Processing request with {len(request.reference_articles)} references")
         
-        # Validate input
-        if not request.reference_articles:
-            raise HTTPException(status_code=400, detail="Please provide at least one reference article")
-        
-        if not request.draft_content.strip():
-            raise HTTPException(status_code=400, detail="Draft content cannot be empty")
-        
-        # Check if Ollama is ready
-        if not await check_ollama_ready():
-            raise HTTPException(
-                status_code=503, 
-                detail="AI service is still starting up. Please wait a moment and try again."
-            )
+        references, budget_report = await prepare_edit_request(request)
         
-        # Generate content
-        result = await generate_with_ollama(request)
+        # Generate content once a generation slot is free (one per chunk for long drafts)
+        result = await generate_draft(build_prompt_prefix(references), request.draft_content, retry=False)
         
         logger.info("Content generation completed successfully")
-        return EditResponse(data={"edited_article": result})
+        return EditResponse(data={"edited_article": result, "reference_budget": budget_report})
     
     except HTTPException:
         raise
@@ -106,98 +259,372 @@ async def generate_edit(request: EditRequest):
         logger.error(f"Generation failed: {e}")
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
 
+@app.post("/api/generate-edit/stream")
+async def generate_edit_stream(request: EditRequest):
+    """Stream style-consistent content as NDJSON events while tokens are generated"""
+    logger.info(f"Streaming request with {len(request.reference_articles)} references")
+    
+    references, budget_report = await prepare_edit_request(request)
+    scheduler.ensure_capacity()
+    
+    return StreamingResponse(
+        stream_with_ollama(references, request.draft_content, budget_report),
+        media_type="application/x-ndjson"
+    )
+
+@app.post("/api/generate-edit/batch")
+async def generate_edit_batch(request: BatchEditRequest):
+    """Edit many drafts against one reference set, streaming one NDJSON result per draft"""
+    logger.info(f"Batch request with {len(request.drafts)} drafts")
+    
+    references, _ = await resolve_references(request)
+    
+    if not request.drafts:
+        raise HTTPException(status_code=400, detail="Please provide at least one draft")
+    
+    if len(request.drafts) > BATCH_MAX_DRAFTS:
+        raise HTTPException(status_code=400, detail=f"Too many drafts (max {BATCH_MAX_DRAFTS})")
+    
+    await ensure_ollama_ready()
+    
+    limit = min(request.concurrency or BATCH_CONCURRENCY, BATCH_CONCURRENCY)
+    return StreamingResponse(
+        batch_with_ollama(references, request.drafts, limit),
+        media_type="application/x-ndjson"
+    )
+
+async def prepare_edit_request(request: EditRequest) -> Tuple[List[str], dict]:
+    """Validate input, resolve reference articles and make sure the AI service can take the request"""
+    references, budget_report = await resolve_references(request)
+    
+    if not request.draft_content.strip():
+        raise HTTPException(status_code=400, detail="Draft content cannot be empty")
+    
+    await ensure_ollama_ready()
+    
+    return references, budget_report
+
+async def resolve_references(request) -> Tuple[List[str], dict]:
+    """Get the request's reference articles (from its style profile if it names one), fitted to the prompt budget"""
+    references = request.reference_articles
+    if request.style_profile_id:
+        profile = await style_profiles.get(request.style_profile_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Style profile not found")
+        references = profile["reference_articles"]
+    
+    if not references:
+        raise HTTPException(status_code=400, detail="Please provide at least one reference article")
+    
+    references, budget_report = prompt_budget.fit(references)
+    if budget_report["truncated"]:
+        logger.info(
+            f"References excerpted to fit the prompt budget: "
+            f"{budget_report['original_tokens']} -> {budget_report['final_tokens']} estimated tokens"
+        )
+    
+    return references, budget_report
+
+async def ensure_ollama_ready():
+    """Reject with 503 while Ollama or the model is not available yet"""
+    if not await check_ollama_ready():
+        raise HTTPException(
+            status_code=503, 
+            detail="AI service is still starting up. Please wait a moment and try again."
+        )
+
 async def check_ollama_ready():
     """Check if Ollama is ready and model is available"""
-    try:
-        response = requests.get(f"{OLLAMA_HOST}/api/version", timeout=5)
-        if response.status_code != 200:
-            return False
-        
-        models_response = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=5)
-        if models_response.status_code != 200:
-            return False
-            
-        models = models_response.json().get("models", [])
-        return any(OLLAMA_MODEL in model.get("name", "") for model in models)
+    if health_monitor.ready:
+        return True
     
-    except Exception:
-        return False
+    # Re-probe promptly (at most once a second) so recovery isn't delayed by the interval
+    state = await health_monitor.refresh(max_age=1.0)
+    return state["ready"]
 
-async def generate_with_ollama(request: EditRequest):
-    """Generate content using Ollama"""
+class PromptPrefix(NamedTuple):
+    """Static start of the edit prompt and its key, built once per request and shared by its generations"""
+    text: str
+    key: str
+
+def build_prompt_prefix(reference_articles: List[str]) -> PromptPrefix:
+    """Build the static start of the edit prompt, identical for every draft against the same references"""
     
     # Combine reference articles
-    references = "\n\n---\n\n".join(request.reference_articles)
+    references = "\n\n---\n\n".join(reference_articles)
     
-    prompt = f"""You are a professional content editor. Transform the draft to match the writing style of the reference content.
+    text = f"""You are a professional content editor. Transform the draft at the end of this prompt to match the writing style of the reference content.
+
+Transform the draft to match the style, tone, vocabulary, and structure of the reference content while preserving the original meaning.
 
 REFERENCE CONTENT:
 {references}
+"""
+    # The key also routes edits sharing these references (e.g. one style profile) to the server that has them cached
+    return PromptPrefix(text, prompt_cache_stats.prefix_key(text))
 
+def build_payload(prefix: PromptPrefix, draft_content: str, stream: bool = False, chunk_context: str = ""):
+    """Build the Ollama generation payload for an edit request (or one chunk of a long draft)"""
+    
+    # Draft last, so Ollama can reuse its evaluation of the references prefix
+    prompt = f"""{prefix.text}{chunk_context}
 DRAFT TO TRANSFORM:
-{request.draft_content}
+{draft_content}
 
-Transform the draft to match the style, tone, vocabulary, and structure of the reference content while preserving the original meaning. Provide only the transformed content:"""
+Provide only the transformed content:"""
 
-    payload = {
+    return {
         "model": OLLAMA_MODEL,
         "prompt": prompt,
-        "stream": False,
+        "stream": stream,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
         "options": {
             "temperature": 0.3,
             "top_p": 0.9,
             "num_predict": 2000
         }
     }
+
+async def generate_with_ollama(prefix: PromptPrefix, draft_content: str, chunk_context: str = ""):
+    """Generate content using Ollama"""
+    with tracer.span("prompt_build"):
+        payload = build_payload(prefix, draft_content, chunk_context=chunk_context)
     
     try:
-        response = requests.post(
-            f"{OLLAMA_HOST}/api/generate",
-            json=payload,
-            timeout=120
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"AI service error: {response.status_code}")
-        
-        result = response.json()
-        generated_text = result.get("response", "").strip()
+        with tracer.span("generate", model=OLLAMA_MODEL, prompt_chars=len(payload["prompt"])):
+            response = await ollama_client.post("/api/generate", json=payload, route_key=prefix.key)
+            
+            if response.status_code != 200:
+                raise Exception(f"AI service error: {response.status_code}")
+            
+            with tracer.span("parse"):
+                result = response.json()
+                prompt_cache_stats.record(prefix.text, payload["prompt"], result, prefix.key)
+                generated_text = result.get("response", "").strip()
+            tracer.record_ollama_phases(result)
         
         if not generated_text:
             raise Exception("AI service returned empty response")
         
         return generated_text
     
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         raise Exception("Request timed out. Try with shorter content.")
     except Exception as e:
         raise Exception(f"Generation failed: {str(e)}")
 
-@app.post("/api/extract-text")
-async def extract_text(file: UploadFile = File(...)):
-    """Extract text from uploaded files"""
+async def stream_with_ollama(reference_articles: List[str], draft_content: str, budget_report: Optional[dict] = None):
+    """Forward Ollama's streamed tokens as NDJSON events"""
+    with tracer.span("prompt_build"):
+        prefix = build_prompt_prefix(reference_articles)
+        payload = build_payload(prefix, draft_content, stream=True)
+    ticket = None
+    
     try:
-        logger.info(f"Extracting text from: {file.filename}")
+        if budget_report and budget_report["truncated"]:
+            yield ndjson_event({"type": "status", "stage": "references_trimmed", "reference_budget": budget_report})
         
-        if file.size > 10 * 1024 * 1024:  # 10MB limit
-            raise HTTPException(status_code=413, detail="File too large (max 10MB)")
+        ticket = scheduler.submit()
+        async for position in scheduler.queue_positions(ticket):
+            yield ndjson_event({"type": "queued", "position": position})
+        tracer.record("queue_wait", ticket.wait_time)
+        started = time.perf_counter()
         
-        content = await file.read()
-        
-        if file.filename.endswith('.txt'):
-            text = content.decode('utf-8')
-        elif file.filename.endswith('.docx'):
-            from docx import Document
-            import io
-            doc = Document(io.BytesIO(content))
-            text = '\n'.join([p.text for p in doc.paragraphs if p.text.strip()])
+        chunks = split_draft(draft_content, EDIT_CHUNK_TOKENS)
+        if len(chunks) > 1:
+            # Chunks take their own slots; holding this one could starve them
+            scheduler.release(ticket)
+            ticket = None
+            yield ndjson_event({"type": "status", "stage": "generating", "chunks_total": len(chunks)})
+            async for piece in generate_chunks(prefix, chunks):
+                yield ndjson_event({"type": "token", "content": piece})
         else:
-            raise HTTPException(status_code=400, detail="Only .txt and .docx files supported")
+            async for chunk in ollama_client.stream_generate(payload, prefix.key):
+                token = chunk.get("response", "")
+                if token:
+                    yield ndjson_event({"type": "token", "content": token})
+                if chunk.get("done"):
+                    prompt_cache_stats.record(prefix.text, payload["prompt"], chunk, prefix.key)
+                    tracer.record("generate", time.perf_counter() - started, model=OLLAMA_MODEL, stream=True)
+                    tracer.record_ollama_phases(chunk)
         
-        if not text.strip():
-            raise HTTPException(status_code=400, detail="File appears to be empty")
+        logger.info("Streamed content generation completed successfully")
+        yield ndjson_event({"type": "done"})
+    
+    except SchedulerRejected as e:
+        yield ndjson_event({"type": "error", "detail": e.detail, "retry_after": e.retry_after})
+    except httpx.TimeoutException:
+        yield ndjson_event({"type": "error", "detail": "Request timed out. Try with shorter content."})
+    except (OllamaError, httpx.HTTPError) as e:
+        logger.error(f"Streamed generation failed: {e}")
+        yield ndjson_event({"type": "error", "detail": f"Generation failed: {str(e)}"})
+    except Exception as e:
+        # Chunk failures arrive already wrapped by generate_with_ollama
+        logger.error(f"Streamed generation failed: {e}")
+        yield ndjson_event({"type": "error", "detail": str(e)})
+    finally:
+        if ticket is not None:
+            scheduler.release(ticket)
+
+async def batch_with_ollama(reference_articles: List[str], drafts: List[str], limit: int):
+    """Generate every draft concurrently and yield each result or error as an NDJSON event"""
+    prefix = build_prompt_prefix(reference_articles)
+    
+    async def edit_draft(draft_content: str):
+        if not draft_content.strip():
+            raise HTTPException(status_code=400, detail="Draft content cannot be empty")
+        return await generate_draft(prefix, draft_content)
+    
+    succeeded = 0
+    async for index, result, error in map_as_completed(drafts, edit_draft, limit):
+        if error is None:
+            succeeded += 1
+            yield ndjson_event({"type": "result", "index": index, "edited_article": result})
+        else:
+            detail = error.detail if isinstance(error, HTTPException) else str(error)
+            logger.error(f"Batch item {index} failed: {detail}")
+            yield ndjson_event({"type": "error", "index": index, "detail": detail})
+    
+    logger.info(f"Batch completed: {succeeded}/{len(drafts)} drafts succeeded")
+    yield ndjson_event({"type": "done", "total": len(drafts), "succeeded": succeeded, "failed": len(drafts) - succeeded})
+
+async def collect_with_ollama(prefix: PromptPrefix, draft_content: str, report):
+    """Stream a generation to completion, reporting progress, and return the full text"""
+    with tracer.span("prompt_build"):
+        payload = build_payload(prefix, draft_content, stream=True)
+    parts = []
+    
+    report({"stage": "generating", "tokens": 0})
+    with tracer.span("generate", model=OLLAMA_MODEL, prompt_chars=len(payload["prompt"]), stream=True):
+        async for chunk in ollama_client.stream_generate(payload, prefix.key):
+            token = chunk.get("response", "")
+            if token:
+                parts.append(token)
+                if len(parts) % 50 == 0:
+                    report({"stage": "generating", "tokens": len(parts)})
+            if chunk.get("done"):
+                prompt_cache_stats.record(prefix.text, payload["prompt"], chunk, prefix.key)
+                tracer.record_ollama_phases(chunk)
+    
+    generated_text = "".join(parts).strip()
+    if not generated_text:
+        raise Exception("AI service returned empty response")
+    
+    return generated_text
+
+@contextlib.asynccontextmanager
+async def generation_slot(retry: bool = False):
+    """Hold a generation slot, recording the time spent queued as a span"""
+    async with scheduler.slot(retry=retry) as ticket:
+        tracer.record("queue_wait", ticket.wait_time)
+        yield
+
+async def generate_draft(prefix: PromptPrefix, draft_content: str, report=None, retry: bool = True):
+    """Generate a draft of any length, taking a slot per generation; long drafts are edited in chunks"""
+    chunks = split_draft(draft_content, EDIT_CHUNK_TOKENS)
+    with tracer.span("edit_content", draft_chars=len(draft_content), chunks=len(chunks)):
+        if len(chunks) > 1:
+            return "".join([piece async for piece in generate_chunks(prefix, chunks, report, retry)])
         
-        return {"data": {"text": text}}
+        async with generation_slot(retry):
+            if report is None:
+                return await generate_with_ollama(prefix, draft_content)
+            return await collect_with_ollama(prefix, draft_content, report)
+
+def generate_chunks(prefix: PromptPrefix, chunks: List[str], report=None, retry: bool = True):
+    """Generate draft chunks concurrently and yield the stitched result in draft order"""
+    
+    async def edit_chunk(index: int):
+        with tracer.span("edit_chunk", index=index, chunks=len(chunks)):
+            async with generation_slot(retry):
+                return await generate_with_ollama(prefix, chunks[index], chunk_context(chunks, index))
+    
+    return edit_chunks_in_order(chunks, edit_chunk, EDIT_CHUNK_CONCURRENCY, report, stage="generating")
+
+def ndjson_event(event: dict) -> str:
+    """Serialize one streaming event as a newline-delimited JSON line"""
+    return json.dumps(event) + "\n"
+
+@app.post("/api/jobs", status_code=202)
+async def create_job(request: EditRequest):
+    """Start a generation as a background job and return its ID right away"""
+    references, budget_report = await prepare_edit_request(request)
+    
+    async def work(report):
+        # Traced on its own: the job outlives this request's trace
+        with tracer.span("job", root=True):
+            report({"stage": "queued"})
+            edited_article = await generate_draft(build_prompt_prefix(references), request.draft_content, report)
+        return {"edited_article": edited_article, "reference_budget": budget_report}
+    
+    job = jobs.submit(work)
+    logger.info(f"Started job {job.id} with {len(references)} references")
+    return {"data": job.to_dict()}
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get a job's status, latest progress and, once finished, its result"""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return {"data": job.to_dict()}
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """Subscribe to a job's progress as NDJSON events until it finishes"""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    
+    async def event_stream():
+        async for event in jobs.events(job):
+            yield ndjson_event(event)
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a pending or running job"""
+    if not await jobs.cancel(job_id):
+        raise HTTPException(status_code=404, detail="Job not found or already finished")
+    return {"data": {"cancelled": job_id}}
+
+@app.post("/api/style-profiles")
+async def create_style_profile(request: StyleProfileRequest):
+    """Store a reference set once so later requests can send its ID instead"""
+    if not request.reference_articles:
+        raise HTTPException(status_code=400, detail="Please provide at least one reference article")
+    
+    profile = await style_profiles.create(request.reference_articles, name=request.name, model=OLLAMA_MODEL)
+    logger.info(f"Created style profile {profile['id']} with {len(request.reference_articles)} references")
+    return {"data": StyleProfileStore.summarize(profile)}
+
+@app.get("/api/style-profiles")
+async def list_style_profiles():
+    """List stored style profiles"""
+    return {"data": {"profiles": await style_profiles.list()}}
+
+@app.get("/api/style-profiles/{profile_id}")
+async def get_style_profile(profile_id: str):
+    """Get a stored style profile"""
+    profile = await style_profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Style profile not found")
+    return {"data": StyleProfileStore.summarize(profile)}
+
+@app.delete("/api/style-profiles/{profile_id}")
+async def delete_style_profile(profile_id: str):
+    """Delete a stored style profile"""
+    if not await style_profiles.delete(profile_id):
+        raise HTTPException(status_code=404, detail="Style profile not found")
+    return {"data": {"deleted": profile_id}}
+
+@app.post("/api/extract-text")
+async def extract_text(file: UploadFile = File(...)):
+    """Extract text from uploaded files"""
+    try:
+        logger.info(f"Extracting text from: {file.filename}")
+        return {"data": await extract_upload(file)}
     
     except HTTPException:
         raise
@@ -205,6 +632,82 @@ async def extract_text(file: UploadFile = File(...)):
         logger.error(f"Text extraction failed: {e}")
         raise HTTPException(status_code=500, detail=f"Text extraction failed: {str(e)}")
 
+@app.post("/api/extract-text/batch")
+async def extract_text_batch(files: List[UploadFile] = File(...)):
+    """Extract text from many files concurrently, streaming one NDJSON result per file as it finishes"""
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=400, detail=f"Too many files (max {MAX_BATCH_FILES})")
+    
+    logger.info(f"Extracting text from {len(files)} files")
+    
+    async def event_stream():
+        succeeded = 0
+        async for index, document, error in map_as_completed(files, extract_upload, extraction_pool.max_workers):
+            filename = files[index].filename
+            if error is None:
+                succeeded += 1
+                yield ndjson_event({"type": "result", "index": index, "filename": filename, **document})
+            else:
+                detail = error.detail if isinstance(error, HTTPException) else f"Text extraction failed: {str(error)}"
+                logger.error(f"Text extraction failed for {filename}: {detail}")
+                yield ndjson_event({"type": "error", "index": index, "filename": filename, "detail": detail})
+        yield ndjson_event({"type": "done", "total": len(files), "succeeded": succeeded, "failed": len(files) - succeeded})
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+async def extract_upload(file: UploadFile) -> dict:
+    """Read an upload and extract its text, reusing cached .docx extractions"""
+    # Read in chunks, rejecting with 413 as soon as the limit is crossed
+    upload = await read_upload(file, MAX_UPLOAD_SIZE)
+    content = upload.content
+    filename = file.filename or ""
+    started = time.perf_counter()
+    
+    cached = False
+    with tracer.span("extract", format=os.path.splitext(filename)[1], size_bytes=len(content)) as span:
+        if filename.endswith('.txt'):
+            text = content.decode('utf-8')
+        elif filename.endswith('.docx'):
+            async def parse():
+                return {"text": await extraction_pool.run(extract_docx_text, content)}
+            
+            key = ExtractionCache.make_key(upload.sha256, DOCX_EXTRACTOR_VERSION, {"format": ".docx"})
+            document, cached = await extraction_cache.get_or_compute(key, parse)
+            text = document["text"]
+        else:
+            raise HTTPException(status_code=400, detail="Only .txt and .docx files supported")
+        span.set_attribute("cached", cached)
+    
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="File appears to be empty")
+    
+    extraction_seconds.observe(
+        time.perf_counter() - started, format=os.path.splitext(filename)[1], size=size_class(len(content)), cached=str(cached).lower()
+    )
+    return {"text": text, "cached": cached, "sha256": upload.sha256}
+
+def extract_docx_text(content: bytes) -> str:
+    """Extract paragraph, table, note and header text from a .docx file (runs in an extraction worker)"""
+    import io
+    return docx_stream.extract_docx_text(io.BytesIO(content))
+
+@app.on_event("startup")
+async def startup():
+    """Start probing Ollama in the background, start the loop watchdog if enabled and pre-render the main page"""
+    await health_monitor.start()
+    await loop_watchdog.start()
+    await ollama_client.start()
+    main_page.render()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Cancel unfinished jobs, stop background probing, the loop watchdog and workers, and release pooled Ollama connections"""
+    await jobs.shutdown()
+    await loop_watchdog.stop()
+    await health_monitor.stop()
+    await ollama_client.aclose()
+    extraction_pool.shutdown()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=PORT)
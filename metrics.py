@@ -0,0 +1,461 @@
+"""
+Metrics Module
+
+Dependency-free counters, gauges and histograms rendered in the
+Prometheus text exposition format, plus an ASGI middleware for HTTP
+request metrics and a recorder for Ollama generation figures.
+"""
+
+import bisect
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from starlette.routing import Match
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # Starlette appends the charset
+
+# Seconds; spans fast API calls up to multi-minute generations
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192)
+RATE_BUCKETS = (1, 5, 10, 20, 40, 80, 160)
+
+LabelValues = Tuple[str, ...]
+CallbackValue = Union[float, Dict[LabelValues, float]]
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels_text(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render ``{name="value",...}``, or nothing when there are no labels."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric(ABC):
+    """A metric family: name, help text, label names and one value per label set."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        """Turn keyword labels into a tuple ordered like ``labelnames``."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        """HELP and TYPE lines."""
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """Exposition lines for this family."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """
+        Add to the count.
+
+        Args:
+            amount (float): Non-negative increment
+            **labels: One value per label name
+        """
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{_labels_text(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        """
+        Subtract from the value.
+
+        Args:
+            amount (float): Decrement
+            **labels: One value per label name
+        """
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        """
+        Set the value.
+
+        Args:
+            value (float): New value
+            **labels: One value per label name
+        """
+        self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets, with sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: per-bucket counts (last one is +Inf), sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value (float): Observed value
+            **labels: One value per label name
+        """
+        key = self._key(labels)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = entry
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _labels_text(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels_text(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class _Callback(_Metric):
+    """Gauge or counter whose values are read from a callback at scrape time."""
+
+    def __init__(self, name: str, documentation: str, kind: str, labelnames: Sequence[str], read: Callable[[], CallbackValue]):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.read = read
+
+    def render(self) -> List[str]:
+        value = self.read()
+        samples = value.items() if isinstance(value, dict) else [((), value)]
+        lines = self._header()
+        for key, sample in samples:
+            lines.append(f"{self.name}{_labels_text(self.labelnames, key)} {_format_value(sample)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Collection of metric families rendered together for ``/metrics``.
+
+    Families are created once by name; asking again for an existing name
+    returns it, so independent components can share a registry.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """
+        Get or create a counter.
+
+        Args:
+            name (str): Metric name, e.g. ``http_requests_total``
+            documentation (str): Help text
+            labelnames (Sequence[str]): Label names
+
+        Returns:
+            Counter: The counter
+        """
+        return self._get_or_create(name, lambda: Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """
+        Get or create a gauge.
+
+        Args:
+            name (str): Metric name
+            documentation (str): Help text
+            labelnames (Sequence[str]): Label names
+
+        Returns:
+            Gauge: The gauge
+        """
+        return self._get_or_create(name, lambda: Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """
+        Get or create a histogram.
+
+        Args:
+            name (str): Metric name, e.g. ``http_request_duration_seconds``
+            documentation (str): Help text
+            labelnames (Sequence[str]): Label names
+            buckets (Sequence[float]): Upper bounds of the buckets
+
+        Returns:
+            Histogram: The histogram
+        """
+        return self._get_or_create(name, lambda: Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        read: Callable[[], CallbackValue],
+        kind: str = "gauge",
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        """
+        Register (or replace) a metric read from a callback at scrape time.
+
+        Used to export counters that components already keep, such as
+        cache and scheduler stats, without double bookkeeping.
+
+        Args:
+            name (str): Metric name
+            documentation (str): Help text
+            read (Callable[[], CallbackValue]): Returns the value, or a dict
+                mapping label value tuples to values
+            kind (str): ``gauge`` or ``counter``
+            labelnames (Sequence[str]): Label names
+        """
+        self._metrics[name] = _Callback(name, documentation, kind, labelnames, read)
+
+    def render(self) -> str:
+        """
+        Render every family in the Prometheus text format.
+
+        Returns:
+            str: Exposition text
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, name: str, create: Callable[[], _Metric]) -> Any:
+        """Return the family registered under ``name``, creating it if needed."""
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = create()
+        return metric
+
+
+def size_class(size_bytes: int) -> str:
+    """
+    Bucket a file size into a low-cardinality label value.
+
+    Args:
+        size_bytes (int): File size
+
+    Returns:
+        str: ``<100KB``, ``<1MB``, ``<10MB`` or ``>=10MB``
+    """
+    for limit, label in ((100 * 1024, "<100KB"), (1024 * 1024, "<1MB"), (10 * 1024 * 1024, "<10MB")):
+        if size_bytes < limit:
+            return label
+    return ">=10MB"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request count, latency and in-flight requests.
+
+    Requests are labelled with their route template (``/api/jobs/{job_id}``
+    rather than the concrete path) so label cardinality stays bounded;
+    unmatched paths share the ``other`` label. Latency runs until the last
+    byte of the response, so streamed responses are measured in full.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            registry (MetricsRegistry): Registry to record into
+        """
+        self.app = app
+        self.requests = registry.counter("http_requests_total", "HTTP requests handled", ("method", "route", "status"))
+        self.duration = registry.histogram(
+            "http_request_duration_seconds", "HTTP request latency until the response is complete", ("method", "route")
+        )
+        self.in_flight = registry.gauge("http_requests_in_flight", "HTTP requests being handled", ("route",))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = self._route_of(scope)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.in_flight.inc(route=route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.in_flight.dec(route=route)
+            self.duration.observe(time.perf_counter() - started, method=scope["method"], route=route)
+            self.requests.inc(method=scope["method"], route=route, status=status)
+
+    @staticmethod
+    def _route_of(scope) -> str:
+        """Find the template of the route that will handle the request."""
+        for route in getattr(scope.get("app"), "routes", ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", "other")
+        return "other"
+
+
+class GenerationMetrics:
+    """
+    Records Ollama generation figures into a registry.
+
+    ``observe`` is meant as the ``observer`` of an ``OllamaPool``; it takes
+    the wall-clock timings measured by the pool together with the timings
+    and token counts Ollama reports in its final response.
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        """
+        Create the generation metric families.
+
+        Args:
+            registry (MetricsRegistry): Registry to record into
+        """
+        self.requests = registry.counter(
+            "ollama_generations_total", "Generations sent to Ollama", ("endpoint", "mode", "outcome")
+        )
+        self.duration = registry.histogram(
+            "ollama_generation_duration_seconds", "Wall-clock time of a generation request", ("mode",)
+        )
+        self.first_token = registry.histogram(
+            "ollama_time_to_first_token_seconds",
+            "Time to the first generated token (streamed: measured; blocking: Ollama's load plus prompt-eval time)",
+            ("mode",),
+        )
+        self.prompt_tokens = registry.histogram(
+            "ollama_prompt_eval_tokens", "Prompt tokens evaluated per generation (prompt_eval_count)", buckets=TOKEN_BUCKETS
+        )
+        self.eval_tokens = registry.histogram(
+            "ollama_eval_tokens", "Tokens generated per generation (eval_count)", buckets=TOKEN_BUCKETS
+        )
+        self.eval_rate = registry.histogram(
+            "ollama_eval_tokens_per_second", "Generation speed (eval_count / eval_duration)", buckets=RATE_BUCKETS
+        )
+        self.phase_seconds = registry.counter(
+            "ollama_phase_duration_seconds_total",
+            "Time Ollama reports spending per phase (load, prompt_eval, eval)",
+            ("phase",),
+        )
+
+    def observe(self, event: Dict[str, Any]) -> None:
+        """
+        Record one finished generation.
+
+        Args:
+            event (Dict[str, Any]): ``endpoint``, ``mode`` (``stream`` or
+                ``blocking``), ``seconds``, optional ``first_token_seconds``,
+                ``error`` (bool) and Ollama's final ``response`` object
+        """
+        mode = event["mode"]
+        outcome = "error" if event.get("error") else "success"
+        self.requests.inc(endpoint=event["endpoint"], mode=mode, outcome=outcome)
+        if event.get("error"):
+            return
+
+        self.duration.observe(event["seconds"], mode=mode)
+        response = event.get("response") or {}
+        first_token = event.get("first_token_seconds")
+        if first_token is None and "prompt_eval_duration" in response:
+            first_token = (response.get("load_duration", 0) + response["prompt_eval_duration"]) / 1e9
+        if first_token is not None:
+            self.first_token.observe(first_token, mode=mode)
+
+        if "prompt_eval_count" in response:
+            self.prompt_tokens.observe(response["prompt_eval_count"])
+        if "eval_count" in response:
+            self.eval_tokens.observe(response["eval_count"])
+            if response.get("eval_duration"):
+                self.eval_rate.observe(response["eval_count"] / (response["eval_duration"] / 1e9))
+        for phase in ("load", "prompt_eval", "eval"):
+            if f"{phase}_duration" in response:
+                self.phase_seconds.inc(response[f"{phase}_duration"] / 1e9, phase=phase)
+
+
+def stats_callbacks(
+    registry: MetricsRegistry,
+    prefix: str,
+    sources: Dict[str, Callable[[], Dict[str, Any]]],
+    fields: Iterable[Tuple[str, str, str, str]],
+) -> None:
+    """
+    Export fields of components' ``stats()`` dicts as labelled metrics.
+
+    For example, with prefix ``cache`` the hit counts of every cache become
+    ``cache_hits_total{cache="style_guides"}`` and so on.
+
+    Args:
+        registry (MetricsRegistry): Registry to register into
+        prefix (str): Metric name prefix, also used as the label name
+        sources (Dict[str, Callable[[], Dict[str, Any]]]): Label value to
+            ``stats`` method
+        fields (Iterable[Tuple[str, str, str, str]]): ``(stats key, metric
+            suffix, kind, help text)``; the metric is named ``{prefix}_{suffix}``
+    """
+    for field, suffix, kind, documentation in fields:
+        def read(field: str = field) -> Dict[LabelValues, float]:
+            return {(label,): float(stats()[field]) for label, stats in sources.items()}
+
+        registry.callback(f"{prefix}_{suffix}", documentation, read, kind, (prefix,))
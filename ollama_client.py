@@ -0,0 +1,185 @@
+"""
+Ollama Client Module
+
+Provides a shared, pooled asynchronous HTTP client for the Ollama API
+so that generations never block the event loop.
+"""
+
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+
+class OllamaError(Exception):
+    """Raised when Ollama answers a streamed request with an error."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        """
+        Initialize the error.
+
+        Args:
+            message (str): Error description
+            status_code (int): HTTP status of the response, if it was not 200;
+                None for an ``error`` chunk in a streamed response
+        """
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment."""
+    return int(os.getenv(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment."""
+    return float(os.getenv(name, default))
+
+
+class OllamaClient:
+    """
+    Pooled asynchronous client for the Ollama HTTP API.
+
+    One instance is meant to be shared across requests: connections are
+    kept alive and reused, the pool size is bounded, and every phase of a
+    request (connect, write, read, pool wait) has its own timeout.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        write_timeout: Optional[float] = None,
+        pool_timeout: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize the client configuration.
+
+        Unset arguments fall back to the ``OLLAMA_*`` environment variables
+        and then to the defaults below.
+
+        Args:
+            base_url (str): Ollama server base URL
+            max_connections (int): Maximum concurrent connections in the pool
+            max_keepalive_connections (int): Idle connections kept open for reuse
+            keepalive_expiry (float): Seconds an idle connection is kept alive
+            connect_timeout (float): Seconds allowed to establish a connection
+            read_timeout (float): Seconds allowed between received bytes
+            write_timeout (float): Seconds allowed to send the request body
+            pool_timeout (float): Seconds to wait for a free pooled connection
+            transport (httpx.AsyncBaseTransport): Custom transport, e.g. an
+                ``httpx.MockTransport`` standing in for the server in tests
+        """
+        self.base_url = base_url.rstrip("/")
+        self.limits = httpx.Limits(
+            max_connections=max_connections or _env_int("OLLAMA_MAX_CONNECTIONS", 10),
+            max_keepalive_connections=max_keepalive_connections or _env_int("OLLAMA_MAX_KEEPALIVE", 10),
+            keepalive_expiry=keepalive_expiry or _env_float("OLLAMA_KEEPALIVE_EXPIRY", 30.0),
+        )
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout or _env_float("OLLAMA_CONNECT_TIMEOUT", 5.0),
+            read=read_timeout or _env_float("OLLAMA_READ_TIMEOUT", 120.0),
+            write=write_timeout or _env_float("OLLAMA_WRITE_TIMEOUT", 30.0),
+            pool=pool_timeout or _env_float("OLLAMA_POOL_TIMEOUT", 30.0),
+        )
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Get the shared ``httpx.AsyncClient``, creating it on first use.
+
+        Returns:
+            httpx.AsyncClient: Pooled client bound to ``base_url``
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self.limits,
+                timeout=self.timeout,
+                transport=self.transport,
+            )
+        return self._client
+
+    async def get(self, path: str, timeout: Optional[float] = None) -> httpx.Response:
+        """
+        Send a GET request to the Ollama API.
+
+        Args:
+            path (str): API path, e.g. ``/api/version``
+            timeout (float): Optional overall timeout overriding the defaults
+
+        Returns:
+            httpx.Response: Raw response
+        """
+        return await self.client.get(path, timeout=self._timeout(timeout))
+
+    async def post(
+        self, path: str, json: Dict[str, Any], timeout: Optional[float] = None, route_key: Optional[str] = None
+    ) -> httpx.Response:
+        """
+        Send a POST request with a JSON body to the Ollama API.
+
+        Args:
+            path (str): API path, e.g. ``/api/generate``
+            json (Dict[str, Any]): Request payload
+            timeout (float): Optional overall timeout overriding the defaults
+            route_key (str): Ignored; there is only one server to route to
+
+        Returns:
+            httpx.Response: Raw response
+        """
+        return await self.client.post(path, json=json, timeout=self._timeout(timeout))
+
+    async def stream_generate(self, payload: Dict[str, Any], route_key: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a generation from ``/api/generate`` chunk by chunk.
+
+        Ollama answers a streamed request with newline-delimited JSON; each
+        decoded object is yielded as soon as its line arrives.
+
+        Args:
+            payload (Dict[str, Any]): Generation payload; ``stream`` is forced on
+            route_key (str): Ignored; there is only one server to route to
+
+        Yields:
+            Dict[str, Any]: Decoded chunks, the last one having ``done`` set
+
+        Raises:
+            OllamaError: On a non-200 status or an ``error`` chunk
+        """
+        payload = {**payload, "stream": True}
+        async with self.client.stream("POST", "/api/generate", json=payload) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                raise OllamaError(
+                    f"AI API error: {response.status_code} - {body.decode(errors='replace')}", response.status_code
+                )
+
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise OllamaError(chunk["error"])
+                yield chunk
+                if chunk.get("done"):
+                    break
+
+    async def aclose(self) -> None:
+        """Close pooled connections. The client is recreated on next use."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _timeout(self, timeout: Optional[float]):
+        """Map an optional per-call timeout onto httpx's sentinel."""
+        return httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
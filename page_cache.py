@@ -0,0 +1,149 @@
+"""
+Page Cache Module
+
+Renders a page once and serves it with a strong ETag, cache headers and
+precompressed gzip/brotli variants.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Parse an ``Accept-Encoding`` header into encoding -> quality.
+
+    Args:
+        header (str): Raw header value
+
+    Returns:
+        Dict[str, float]: Accepted encodings with their q-values
+    """
+    encodings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an ``If-None-Match`` header against an ETag.
+
+    Args:
+        if_none_match (str): Raw header value, possibly a list or ``*``
+        etag (str): Quoted ETag of the current representation
+
+    Returns:
+        bool: True if the client already holds this representation
+    """
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag == etag or tag == f"W/{etag}" for tag in candidates)
+
+
+class CachedPage:
+    """
+    A rendered page held in memory with its compressed variants.
+
+    The page is rendered on first use (or explicitly through ``render``)
+    and never again, so every hit is a dictionary lookup plus headers.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[], str],
+        media_type: str = "text/html",
+        cache_control: Optional[str] = None,
+    ):
+        """
+        Initialize the cached page.
+
+        Args:
+            render (Callable[[], str]): Produces the page content
+            media_type (str): Content-Type of the page
+            cache_control (str): Cache-Control header; defaults to
+                ``public, max-age=<PAGE_CACHE_MAX_AGE>`` (300 seconds)
+        """
+        self._render = render
+        self.media_type = media_type
+        self.cache_control = cache_control or f"public, max-age={int(os.getenv('PAGE_CACHE_MAX_AGE', 300))}"
+        self.etag: Optional[str] = None
+        self._variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def render(self) -> None:
+        """Render the page and precompute its variants if not done yet."""
+        if self._variants:
+            return
+        with self._lock:
+            if self._variants:
+                return
+            body = self._render().encode("utf-8")
+            variants = {
+                "identity": body,
+                "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+            }
+            if brotli is not None:
+                variants["br"] = brotli.compress(body, quality=11)
+            self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            self._variants = variants
+
+    def response(self, request: Request) -> Response:
+        """
+        Build the response for a request.
+
+        Answers ``304 Not Modified`` when ``If-None-Match`` matches and
+        otherwise picks the best precompressed variant the client accepts.
+
+        Args:
+            request (Request): Incoming request
+
+        Returns:
+            Response: Page or 304 response
+        """
+        self.render()
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, self.etag):
+            return Response(status_code=304, headers=headers)
+
+        encoding = self._choose_encoding(request.headers.get("accept-encoding", ""))
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=self._variants[encoding], media_type=self.media_type, headers=headers)
+
+    def _choose_encoding(self, accept_encoding: str) -> str:
+        """Pick the smallest available variant the client accepts."""
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        for encoding in ("br", "gzip"):
+            if encoding in self._variants and accepted.get(encoding, wildcard) > 0:
+                return encoding
+        return "identity"
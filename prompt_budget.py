@@ -0,0 +1,167 @@
+"""
+Prompt Budget Module
+
+Keeps reference articles within a token budget before they are put into
+a prompt, sampling representative excerpts from articles that are too
+long and reporting what was cut.
+"""
+
+import math
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+EXCERPT_MARKER = "\n[...]\n"
+
+_SENTENCE_END = re.compile(r"[.!?]['\")\]]?\s|\n")
+
+
+class PromptBudget:
+    """
+    Token budget for the reference section of a prompt.
+
+    Token counts are estimated at ``CHARS_PER_TOKEN`` characters per token,
+    which is close to Llama-family tokenizers on English prose. When the
+    references exceed the budget it is shared out fairly: short articles
+    are kept whole and the rest is split evenly among the long ones, which
+    are reduced to their opening, a sample from the middle of the body and
+    their conclusion. If even a minimal excerpt of every article would not
+    fit, only the first articles are kept.
+    """
+
+    CHARS_PER_TOKEN = 4
+
+    # Shares of an excerpt given to the opening, body sample and conclusion
+    EXCERPT_SHARES = (0.4, 0.3, 0.3)
+
+    def __init__(self, max_reference_tokens: Optional[int] = None, min_excerpt_tokens: int = 64):
+        """
+        Initialize the budget.
+
+        Args:
+            max_reference_tokens (int): Tokens allowed for all references
+                together (``PROMPT_REFERENCE_TOKENS``)
+            min_excerpt_tokens (int): Smallest excerpt worth keeping per article
+        """
+        self.max_reference_tokens = max_reference_tokens or int(os.getenv("PROMPT_REFERENCE_TOKENS", 3000))
+        self.min_excerpt_tokens = min_excerpt_tokens
+
+    @classmethod
+    def estimate_tokens(cls, text: str) -> int:
+        """
+        Estimate the token count of a text.
+
+        Args:
+            text (str): Text to measure
+
+        Returns:
+            int: Estimated tokens
+        """
+        return math.ceil(len(text) / cls.CHARS_PER_TOKEN)
+
+    def fit(self, reference_articles: List[str]) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Fit reference articles into the budget.
+
+        Args:
+            reference_articles (List[str]): Reference article texts
+
+        Returns:
+            Tuple[List[str], Dict[str, Any]]: The articles to use, and a report
+            with the budget, token totals, whether anything was cut and, per
+            article, its original and kept token counts
+        """
+        sizes = [self.estimate_tokens(article) for article in reference_articles]
+        budget = self.max_reference_tokens
+
+        kept_count = len(reference_articles)
+        if sum(sizes) > budget:
+            kept_count = max(1, min(kept_count, budget // self.min_excerpt_tokens))
+
+        # Water-filling: smallest articles first, each taking at most an even share of what is left
+        allocations = [0] * len(reference_articles)
+        remaining = budget
+        order = sorted(range(kept_count), key=lambda index: sizes[index])
+        for position, index in enumerate(order):
+            share = remaining // (kept_count - position)
+            allocations[index] = min(sizes[index], share)
+            remaining -= allocations[index]
+
+        fitted = []
+        articles_report = []
+        for index, article in enumerate(reference_articles):
+            if index >= kept_count:
+                articles_report.append({"index": index, "original_tokens": sizes[index], "kept_tokens": 0, "status": "dropped"})
+                continue
+
+            if allocations[index] >= sizes[index]:
+                fitted.append(article)
+                status = "full"
+            else:
+                fitted.append(self.excerpt(article, allocations[index]))
+                status = "excerpted"
+            articles_report.append({
+                "index": index,
+                "original_tokens": sizes[index],
+                "kept_tokens": self.estimate_tokens(fitted[-1]),
+                "status": status,
+            })
+
+        original_tokens = sum(sizes)
+        final_tokens = sum(self.estimate_tokens(article) for article in fitted)
+        return fitted, {
+            "budget_tokens": budget,
+            "original_tokens": original_tokens,
+            "final_tokens": final_tokens,
+            "truncated": any(entry["status"] != "full" for entry in articles_report),
+            "articles": articles_report,
+        }
+
+    def excerpt(self, text: str, max_tokens: int) -> str:
+        """
+        Reduce a text to its opening, a body sample and its conclusion.
+
+        Cuts are moved to the nearest sentence boundary (or word boundary)
+        inside each window, and the omitted stretches are marked ``[...]``.
+
+        Args:
+            text (str): Article text
+            max_tokens (int): Token budget for the excerpt
+
+        Returns:
+            str: The excerpt, or the text unchanged if it already fits
+        """
+        text = text.strip()
+        max_chars = max_tokens * self.CHARS_PER_TOKEN - 2 * len(EXCERPT_MARKER)
+        if len(text) <= max_tokens * self.CHARS_PER_TOKEN or max_chars <= 0:
+            return text[: max(0, max_tokens * self.CHARS_PER_TOKEN)]
+
+        head_share, body_share, _ = self.EXCERPT_SHARES
+        head_chars = int(max_chars * head_share)
+        body_chars = int(max_chars * body_share)
+        tail_chars = max_chars - head_chars - body_chars
+
+        head = _cut_end(text[:head_chars])
+        body_start = (len(text) - body_chars) // 2
+        body = _cut_end(_cut_start(text[body_start:body_start + body_chars]))
+        tail = _cut_start(text[len(text) - tail_chars:])
+
+        return EXCERPT_MARKER.join(part.strip() for part in (head, body, tail) if part.strip())
+
+
+def _cut_end(window: str) -> str:
+    """End a window at its last sentence boundary, or last space, in its second half."""
+    boundaries = [match.end() for match in _SENTENCE_END.finditer(window)]
+    if boundaries and boundaries[-1] >= len(window) // 2:
+        return window[:boundaries[-1]]
+    space = window.rfind(" ")
+    return window[:space] if space >= len(window) // 2 else window
+
+
+def _cut_start(window: str) -> str:
+    """Start a window after its first sentence boundary, or first space, in its first half."""
+    match = _SENTENCE_END.search(window)
+    if match and match.end() <= len(window) // 2:
+        return window[match.end():]
+    space = window.find(" ")
+    return window[space + 1:] if 0 <= space <= len(window) // 2 else window
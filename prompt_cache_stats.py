@@ -0,0 +1,122 @@
+"""
+Prompt Cache Stats Module
+
+Estimates how much prompt evaluation Ollama skips by reusing its KV cache
+for prompts that share a stable prefix (instructions plus style guide).
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class PromptCacheStats:
+    """
+    Prompt-eval counters grouped by prompt prefix.
+
+    Ollama keeps the evaluated tokens of a loaded model's last prompts and
+    only evaluates what follows the longest prefix it already holds, so
+    ``prompt_eval_count`` drops for a warm prefix. The first prompt seen
+    with a prefix is the cold baseline: it gives that prefix's tokens per
+    character and evaluation time per token. For later prompts with the
+    same prefix, the tokens the full prompt would have needed are estimated
+    from its length; the shortfall in ``prompt_eval_count`` is counted as
+    reused, and priced at the baseline time per token.
+    """
+
+    def __init__(self, max_prefixes: int = 256):
+        """
+        Initialize the counters.
+
+        Args:
+            max_prefixes (int): Prefix baselines remembered (least recently
+                used ones are forgotten)
+        """
+        self.max_prefixes = max_prefixes
+        self._baselines: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self._requests = 0
+        self._warm_requests = 0
+        self._prompt_eval_tokens = 0
+        self._prompt_eval_seconds = 0.0
+        self._reused_tokens = 0
+        self._saved_seconds = 0.0
+
+    @staticmethod
+    def prefix_key(prefix: str) -> str:
+        """
+        Identify a prompt prefix.
+
+        Args:
+            prefix (str): Static start of a prompt
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        return hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+
+    def record(self, prefix: str, prompt: str, response: Dict[str, Any], prefix_key: Optional[str] = None) -> Optional[int]:
+        """
+        Record the prompt-eval figures of a finished generation.
+
+        Args:
+            prefix (str): Static start of the prompt (may be empty)
+            prompt (str): Full prompt that was sent
+            response (Dict[str, Any]): Final Ollama response object, with
+                ``prompt_eval_count`` and ``prompt_eval_duration`` (ns)
+            prefix_key (str): ``prefix_key(prefix)``, if the caller already has it
+
+        Returns:
+            Optional[int]: Estimated prompt tokens reused from the cache, or
+            None if the response carried no prompt-eval figures
+        """
+        evaluated = response.get("prompt_eval_count")
+        duration_ns = response.get("prompt_eval_duration")
+        if evaluated is None or duration_ns is None:
+            return None
+
+        self._requests += 1
+        self._prompt_eval_tokens += evaluated
+        self._prompt_eval_seconds += duration_ns / 1e9
+        if not prefix or not prompt:
+            return 0
+
+        key = prefix_key or self.prefix_key(prefix)
+        baseline = self._baselines.get(key)
+        if baseline is None:
+            if evaluated:
+                self._baselines[key] = {
+                    "tokens_per_char": evaluated / len(prompt),
+                    "seconds_per_token": duration_ns / 1e9 / evaluated,
+                }
+                while len(self._baselines) > self.max_prefixes:
+                    self._baselines.popitem(last=False)
+            return 0
+
+        self._baselines.move_to_end(key)
+        expected = round(len(prompt) * baseline["tokens_per_char"])
+        reused = max(0, expected - evaluated)
+        if reused:
+            self._warm_requests += 1
+            self._reused_tokens += reused
+            self._saved_seconds += reused * baseline["seconds_per_token"]
+        return reused
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get prompt cache counters.
+
+        Returns:
+            Dict[str, Any]: Request counts, prompt tokens evaluated, estimated
+            tokens reused and estimated prompt-eval seconds saved
+        """
+        would_evaluate = self._prompt_eval_tokens + self._reused_tokens
+        return {
+            "requests": self._requests,
+            "warm_requests": self._warm_requests,
+            "prompt_eval_tokens": self._prompt_eval_tokens,
+            "prompt_eval_seconds": round(self._prompt_eval_seconds, 3),
+            "estimated_reused_tokens": self._reused_tokens,
+            "estimated_saved_seconds": round(self._saved_seconds, 3),
+            "reuse_ratio": round(self._reused_tokens / would_evaluate, 4) if would_evaluate else 0.0,
+            "tracked_prefixes": len(self._baselines),
+        }
@@ -1,71 +1,66 @@
 /**
- * AI Writing Style Copier - Frontend JavaScript
+ * Consistly - Frontend JavaScript
  * 
  * Handles all client-side interactions including file uploads,
- * form management, API communication, and UI updates.
+ * form management, streaming API communication, and UI updates.
  */
 
-class WritingStyleCopier {
+class Consistly {
     constructor() {
         this.referenceCount = 1;
         this.referenceTexts = [];
         this.draftContent = '';
         this.apiBase = '/api';
-        
         this.init();
     }
-    
+
     init() {
         this.bindEventListeners();
         this.updateStatus();
+        this.showWelcomeMessage();
+    }
+
+    showWelcomeMessage() {
+        setTimeout(() => {
+            this.showToast('Welcome to Consistly! Upload your reference content to get started. 🎯', 'info');
+        }, 1500);
     }
-    
+
     bindEventListeners() {
-        // File upload handlers
         document.addEventListener('change', (e) => {
             if (e.target.type === 'file') {
                 this.handleFileUpload(e.target);
             }
         });
-        
-        // Text area handlers
+
         document.addEventListener('input', (e) => {
             if (e.target.classList.contains('textarea-input')) {
                 this.handleTextInput(e.target);
             }
         });
-        
-        // Global error handler
-        window.addEventListener('unhandledrejection', (e) => {
-            console.error('Unhandled promise rejection:', e.reason);
-            this.showError('An unexpected error occurred. Please try again.');
-        });
     }
-    
-    /**
-     * Handle file upload and text extraction
-     */
+
     async handleFileUpload(fileInput) {
         const file = fileInput.files[0];
         if (!file) return;
-        
-        // Show loading state
+
         this.showFileProcessing(fileInput.id, true);
-        
+
         try {
             const text = await this.extractTextFromFile(file);
-            
-            // Update corresponding textarea
+
             if (fileInput.id === 'draftFile') {
                 document.getElementById('draftText').value = text;
                 this.draftContent = text;
                 this.updateDraftStatus();
+                this.showToast(`Draft uploaded successfully! (${text.split(' ').length} words)`, 'success');
             } else if (fileInput.id.startsWith('refFile')) {
                 const refNum = fileInput.id.replace('refFile', '');
                 document.getElementById(`refText${refNum}`).value = text;
                 this.updateReferenceStatus();
+                this.showToast(`Reference ${refNum} uploaded successfully!`, 'success');
             }
-            
+
             this.showFileSuccess(fileInput.id, file.name);
         } catch (error) {
             this.showFileError(fileInput.id, error.message);
@@ -73,10 +68,7 @@ class WritingStyleCopier {
             this.showFileProcessing(fileInput.id, false);
         }
     }
-    
-    /**
-     * Handle text input in textareas
-     */
+
     handleTextInput(textarea) {
         if (textarea.id === 'draftText') {
             this.draftContent = textarea.value;
@@ -85,41 +77,35 @@ class WritingStyleCopier {
             this.updateReferenceStatus();
         }
     }
-    
-    /**
-     * Extract text from uploaded file via API
-     */
+
     async extractTextFromFile(file) {
         const formData = new FormData();
         formData.append('file', file);
-        
+
         const response = await fetch(`${this.apiBase}/extract-text`, {
             method: 'POST',
             body: formData
         });
-        
+
         if (!response.ok) {
             const error = await response.json();
-            throw new Error(error.detail || 'Failed to extract text from file');
+            throw new Error(error.detail || 'Failed to extract text');
         }
-        
+
         const data = await response.json();
         return data.data.text;
     }
-    
-    /**
-     * Add a new reference field
-     */
+
     addReferenceField() {
         this.referenceCount++;
         const container = document.getElementById('referenceContainer');
-        
+
         const newReference = document.createElement('div');
         newReference.className = 'reference-item';
         newReference.innerHTML = `
             <div class="reference-number">${this.referenceCount}</div>
             <div class="input-group">
-                <label class="input-label">Reference Article ${this.referenceCount}</label>
+                <label class="input-label">Reference Content ${this.referenceCount}</label>
                 <div class="file-upload">
                     <input type="file" id="refFile${this.referenceCount}" accept=".txt,.docx,.pdf">
                     <div class="file-upload-label">
@@ -128,17 +114,17 @@ class WritingStyleCopier {
                     </div>
                 </div>
                 <div class="divider"><span>or</span></div>
-                <textarea class="textarea-input" id="refText${this.referenceCount}" 
-                         placeholder="Paste your reference article here..."></textarea>
+                <textarea class="textarea-input" id="refText${this.referenceCount}"
+                         placeholder="Paste your reference content here..."></textarea>
                 <button class="btn btn-secondary" onclick="app.removeReference(this)" style="margin-top: var(--spacing-md);">
                     <i class="fas fa-trash"></i> Remove
                 </button>
             </div>
         `;
-        
+
         container.appendChild(newReference);
-        
-        // Animate the new reference
+
+        // Animate in
         newReference.style.opacity = '0';
         newReference.style.transform = 'translateY(20px)';
         setTimeout(() => {
@@ -146,339 +132,341 @@ class WritingStyleCopier {
             newReference.style.opacity = '1';
             newReference.style.transform = 'translateY(0)';
         }, 10);
+
+        this.showToast(`Reference field ${this.referenceCount} added!`, 'success');
     }
-    
-    /**
-     * Remove a reference field
-     */
+
     removeReference(button) {
         const referenceItem = button.closest('.reference-item');
-        
-        // Animate removal
         referenceItem.style.transition = 'all 0.3s ease';
         referenceItem.style.opacity = '0';
         referenceItem.style.transform = 'translateY(-20px)';
-        
+
         setTimeout(() => {
             referenceItem.remove();
             this.updateReferenceStatus();
+            this.showToast('Reference field removed!', 'info');
         }, 300);
     }
-    
-    /**
-     * Update reference articles status
-     */
+
     updateReferenceStatus() {
         this.referenceTexts = [];
-        
-        // Collect all reference texts
+
         for (let i = 1; i <= this.referenceCount; i++) {
             const textArea = document.getElementById(`refText${i}`);
             if (textArea && textArea.value.trim()) {
                 this.referenceTexts.push(textArea.value.trim());
             }
         }
-        
+
         const statusDiv = document.getElementById('referenceStatus');
         if (this.referenceTexts.length > 0) {
+            const totalWords = this.referenceTexts.reduce((sum, text) => sum + text.split(' ').length, 0);
             statusDiv.innerHTML = `
                 <div class="status success">
-                    <i class="fas fa-check"></i> 
-                    ${this.referenceTexts.length} reference article(s) ready
+                    <i class="fas fa-check-circle"></i>
+                    ${this.referenceTexts.length} reference content ready (${totalWords.toLocaleString()} words total)
                 </div>
             `;
         } else {
             statusDiv.innerHTML = '';
         }
     }
-    
-    /**
-     * Update draft status
-     */
+
     updateDraftStatus() {
         const statusDiv = document.getElementById('draftStatus');
         if (this.draftContent.trim()) {
+            const wordCount = this.draftContent.trim().split(' ').length;
+            const readTime = Math.ceil(wordCount / 200);
             statusDiv.innerHTML = `
                 <div class="status success">
-                    <i class="fas fa-check"></i> 
-                    Draft article ready (${this.draftContent.trim().split(' ').length} words)
+                    <i class="fas fa-check-circle"></i>
+                    Draft ready (${wordCount.toLocaleString()} words • ~${readTime} min read)
                 </div>
             `;
         } else {
             statusDiv.innerHTML = '';
         }
     }
-    
-    /**
-     * Update overall status
-     */
+
     updateStatus() {
         this.updateReferenceStatus();
         this.updateDraftStatus();
     }
-    
-    /**
-     * Generate edited article
-     */
+
     async generateEdit() {
-        // Validate inputs
         this.updateStatus();
-        
+
         if (this.referenceTexts.length === 0) {
-            this.showError('Please add at least one reference article');
-            document.getElementById('referenceStatus').innerHTML = `
-                <div class="status error">
-                    <i class="fas fa-exclamation-triangle"></i> 
-                    Please add at least one reference article
-                </div>
-            `;
+            this.showError('Please add at least one reference content to establish style patterns');
+            document.getElementById('referenceContainer').scrollIntoView({ behavior: 'smooth' });
             return;
         }
-        
+
         if (!this.draftContent.trim()) {
-            this.showError('Please add your draft article');
-            document.getElementById('draftStatus').innerHTML = `
-                <div class="status error">
-                    <i class="fas fa-exclamation-triangle"></i> 
-                    Please add your draft article
-                </div>
-            `;
+            this.showError('Please add your draft content to transform');
+            document.getElementById('draftText').focus();
             return;
         }
-        
-        // UI state management
+
         const generateBtn = document.getElementById('generateBtn');
         const loading = document.getElementById('loading');
         const resultTextarea = document.getElementById('result');
-        
+
         generateBtn.disabled = true;
         loading.classList.add('show');
         resultTextarea.value = '';
-        
+
+        this.showToast('🧠 Analyzing your style patterns...', 'info');
+
         try {
-            const response = await fetch(`${this.apiBase}/generate-edit`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                },
-                body: JSON.stringify({
-                    reference_articles: this.referenceTexts,
-                    draft_content: this.draftContent
-                })
+            const startTime = Date.now();
+            let firstToken = true;
+
+            await this.streamEdit({
+                reference_articles: this.referenceTexts,
+                draft_content: this.draftContent
+            }, (token) => {
+                if (firstToken) {
+                    firstToken = false;
+                    loading.classList.remove('show');
+                    resultTextarea.scrollIntoView({ behavior: 'smooth', block: 'start' });
+                }
+                resultTextarea.value += token;
+                resultTextarea.scrollTop = resultTextarea.scrollHeight;
             });
-            
-            if (!response.ok) {
-                const errorData = await response.json();
-                throw new Error(errorData.detail || `HTTP ${response.status}`);
-            }
-            
-            const data = await response.json();
-            resultTextarea.value = data.data.edited_article;
-            
-            // Scroll to results with smooth animation
-            setTimeout(() => {
-                resultTextarea.scrollIntoView({ 
-                    behavior: 'smooth', 
-                    block: 'start' 
-                });
-            }, 100);
-            
-            // Show success message
-            this.showSuccess('Article edited successfully!');
-            
+
+            const endTime = Date.now();
+            const processingTime = Math.round((endTime - startTime) / 1000);
+
+            resultTextarea.value = resultTextarea.value.trim();
+
+            // Show success
+            this.showToast(
+                `✅ Content transformed in ${processingTime}s! Your consistent content is ready.`,
+                'success'
+            );
+
         } catch (error) {
             console.error('Generation error:', error);
-            resultTextarea.value = `Error: ${error.message}`;
-            this.showError(`Failed to generate edited article: ${error.message}`);
+            resultTextarea.value = `❌ Transformation failed: ${error.message}
+
+This usually happens when:
+- Ollama isn't running (run 'ollama serve' in terminal)
+- The AI model needs to be downloaded
+- Network connectivity issues
+
+Please check that Ollama is running and try again.`;
+            this.showError(`Transformation failed: ${error.message}`);
         } finally {
             generateBtn.disabled = false;
             loading.classList.remove('show');
         }
     }
-    
-    /**
-     * Copy text to clipboard
-     */
+
+    async streamEdit(payload, onToken) {
+        const response = await fetch(`${this.apiBase}/generate-edit/stream`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(payload)
+        });
+
+        if (!response.ok) {
+            const errorData = await response.json();
+            throw new Error(errorData.detail || `HTTP ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        const handleLine = (line) => {
+            if (!line.trim()) return;
+            const event = JSON.parse(line);
+            if (event.type === 'token') {
+                onToken(event.content);
+            } else if (event.type === 'queued') {
+                this.showToast(`⏳ Waiting for a free slot (position ${event.position} in queue)...`, 'info');
+            } else if (event.type === 'status' && event.stage === 'editing') {
+                this.showToast('✍️ Rewriting your draft...', 'info');
+            } else if (event.type === 'status' && event.stage === 'references_trimmed') {
+                this.showToast('✂️ Long references were excerpted to fit the model context', 'info');
+            } else if (event.type === 'error') {
+                throw new Error(event.detail);
+            }
+        };
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.forEach(handleLine);
+        }
+
+        handleLine(buffer + decoder.decode());
+    }
+
     async copyToClipboard() {
         const textarea = document.getElementById('result');
         const copySuccess = document.getElementById('copySuccess');
-        
+
         if (!textarea.value.trim()) {
-            this.showError('Nothing to copy. Generate an article first.');
+            this.showError('Nothing to copy. Generate content first!');
             return;
         }
-        
+
         try {
             await navigator.clipboard.writeText(textarea.value);
-            this.showCopySuccess();
+            copySuccess.classList.add('show');
+            setTimeout(() => copySuccess.classList.remove('show'), 2500);
+
+            this.showToast('📋 Content copied to clipboard! Ready to use.', 'success');
         } catch (err) {
-            // Fallback for older browsers
             textarea.select();
             document.execCommand('copy');
-            this.showCopySuccess();
+            copySuccess.classList.add('show');
+            setTimeout(() => copySuccess.classList.remove('show'), 2500);
+            this.showToast('📋 Content copied! Ready to use.', 'success');
         }
     }
-    
-    /**
-     * Show copy success animation
-     */
-    showCopySuccess() {
-        const copySuccess = document.getElementById('copySuccess');
-        copySuccess.classList.add('show');
-        setTimeout(() => {
-            copySuccess.classList.remove('show');
-        }, 2000);
-    }
-    
-    /**
-     * Show file processing state
-     */
+
     showFileProcessing(fileInputId, isProcessing) {
         const fileInput = document.getElementById(fileInputId);
         const label = fileInput.nextElementSibling;
-        
+
         if (isProcessing) {
             label.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Processing file...';
-            label.style.opacity = '0.7';
+            label.style.opacity = '0.8';
         } else {
             label.innerHTML = '<i class="fas fa-upload"></i> Upload File (.txt, .docx, .pdf)';
             label.style.opacity = '1';
         }
     }
-    
-    /**
-     * Show file upload success
-     */
+
     showFileSuccess(fileInputId, filename) {
         const fileInput = document.getElementById(fileInputId);
         const label = fileInput.nextElementSibling;
-        
+
         label.innerHTML = `<i class="fas fa-check"></i> ${filename}`;
         label.style.background = 'var(--success-color)';
-        
+
         setTimeout(() => {
             label.innerHTML = '<i class="fas fa-upload"></i> Upload File (.txt, .docx, .pdf)';
             label.style.background = '';
         }, 3000);
     }
-    
-    /**
-     * Show file upload error
-     */
+
     showFileError(fileInputId, errorMessage) {
         const fileInput = document.getElementById(fileInputId);
         const label = fileInput.nextElementSibling;
-        
-        label.innerHTML = `<i class="fas fa-exclamation-triangle"></i> Error: ${errorMessage}`;
+
+        label.innerHTML = `<i class="fas fa-exclamation-triangle"></i> Error`;
         label.style.background = 'var(--error-color)';
-        
+
         setTimeout(() => {
             label.innerHTML = '<i class="fas fa-upload"></i> Upload File (.txt, .docx, .pdf)';
             label.style.background = '';
-        }, 5000);
+        }, 3000);
+
+        this.showError(errorMessage);
     }
-    
-    /**
-     * Show success message
-     */
+
     showSuccess(message) {
         this.showToast(message, 'success');
     }
-    
-    /**
-     * Show error message
-     */
+
     showError(message) {
         this.showToast(message, 'error');
     }
-    
-    /**
-     * Show toast notification
-     */
+
     showToast(message, type = 'info') {
-        // Remove existing toasts
         const existingToasts = document.querySelectorAll('.toast');
         existingToasts.forEach(toast => toast.remove());
-        
+
         const toast = document.createElement('div');
         toast.className = `toast toast-${type}`;
+
+        const icons = {
+            success: 'fas fa-check-circle',
+            error: 'fas fa-exclamation-triangle',
+            info: 'fas fa-info-circle'
+        };
+
+        const colors = {
+            success: 'var(--success-color)',
+            error: 'var(--error-color)',
+            info: 'var(--primary-color)'
+        };
+
         toast.innerHTML = `
-            <i class="fas fa-${type === 'success' ? 'check' : 'exclamation-triangle'}"></i>
-            ${message}
+            <i class="${icons[type]}"></i>
+            <span>${message}</span>
         `;
-        
-        // Toast styles
+
         toast.style.cssText = `
             position: fixed;
             top: 20px;
             right: 20px;
-            background: ${type === 'success' ? 'var(--success-color)' : 'var(--error-color)'};
-            color: white;
+            background: ${colors[type]};
+            color: var(--text-primary);
             padding: var(--spacing-md) var(--spacing-lg);
-            border-radius: var(--radius-md);
+            border-radius: var(--radius-lg);
             box-shadow: var(--shadow-lg);
             z-index: 1000;
             display: flex;
             align-items: center;
-            gap: var(--spacing-sm);
+            gap: var(--spacing-md);
             font-weight: 600;
             max-width: 400px;
             transform: translateX(100%);
             transition: transform var(--transition-normal);
+            font-size: 0.9rem;
+            border: 1px solid rgba(255, 255, 255, 0.2);
         `;
-        
+
         document.body.appendChild(toast);
-        
-        // Animate in
+
         setTimeout(() => {
             toast.style.transform = 'translateX(0)';
         }, 10);
-        
-        // Auto remove
+
         setTimeout(() => {
             toast.style.transform = 'translateX(100%)';
             setTimeout(() => {
-                if (toast.parentNode) {
-                    toast.remove();
-                }
+                if (toast.parentNode) toast.remove();
             }, 300);
-        }, 5000);
+        }, type === 'error' ? 6000 : 4000);
     }
-    
-    /**
-     * Check system health
-     */
+
     async checkHealth() {
         try {
             const response = await fetch(`${this.apiBase}/health`);
             const data = await response.json();
-            
-            console.log('System Health:', data);
-            
+
             if (data.ai_service.status !== 'success') {
-                this.showError(`AI service not available: ${data.ai_service.message}`);
+                this.showError(`⚠️ AI service not available: ${data.ai_service.message}. Please ensure Ollama is running.`);
+            } else {
+                console.log('✅ Consistly AI is ready!');
             }
         } catch (error) {
             console.error('Health check failed:', error);
-            this.showError('Unable to connect to the AI service. Please ensure Ollama is running.');
+            this.showError('⚠️ Unable to connect to AI service. Please ensure Ollama is running with "ollama serve".');
         }
     }
 }
 
 // Initialize the application
-const app = new WritingStyleCopier();
+const app = new Consistly();
 
 // Global functions for HTML onclick handlers
 window.addReferenceField = () => app.addReferenceField();
 window.generateEdit = () => app.generateEdit();
 window.copyToClipboard = () => app.copyToClipboard();
 
-// Initialize health check on load
+// Initialize health check
 document.addEventListener('DOMContentLoaded', () => {
     app.checkHealth();
 });
-
-// Export for potential module use
-if (typeof module !== 'undefined' && module.exports) {
-    module.exports = WritingStyleCopier;
-}
@@ -0,0 +1,112 @@
+"""
+Static Assets Module
+
+Serves files from ``static/`` under content-hash fingerprinted names with
+immutable caching and precompressed variants.
+"""
+
+import hashlib
+import mimetypes
+import os
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    from .page_cache import CachedPage
+except ImportError:  # imported as a top-level module by main.py
+    from page_cache import CachedPage
+
+
+class StaticAssets:
+    """
+    In-memory static asset pipeline.
+
+    Every text file in the directory is read once at startup and published
+    as ``<stem>.<hash>.<ext>``. Fingerprinted URLs never change content, so
+    they are served as immutable for a year; the plain names remain
+    available with a short, revalidated cache lifetime.
+    """
+
+    IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+    PLAIN_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+    def __init__(self, directory: str, url_prefix: str = "/static"):
+        """
+        Load and fingerprint every file in ``directory``.
+
+        Args:
+            directory (str): Directory holding the asset files
+            url_prefix (str): URL path the assets are served under
+        """
+        self.directory = directory
+        self.url_prefix = url_prefix.rstrip("/")
+        self.manifest: Dict[str, str] = {}
+        self._assets: Dict[str, CachedPage] = {}
+
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if not os.path.isfile(path):
+                continue
+
+            with open(path, "r", encoding="utf-8") as asset_file:
+                content = asset_file.read()
+
+            digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+            stem, extension = os.path.splitext(name)
+            fingerprinted = f"{stem}.{digest}{extension}"
+            media_type = self._media_type(name)
+
+            self.manifest[name] = fingerprinted
+            self._assets[fingerprinted] = self._build(content, media_type, self.IMMUTABLE_CACHE_CONTROL)
+            self._assets[name] = self._build(content, media_type, self.PLAIN_CACHE_CONTROL)
+
+    def url(self, name: str) -> str:
+        """
+        Get the fingerprinted public URL of an asset.
+
+        Args:
+            name (str): Asset file name, e.g. ``script.js``
+
+        Returns:
+            str: URL path including the content hash
+        """
+        return f"{self.url_prefix}/{self.manifest[name]}"
+
+    def urls(self) -> Dict[str, str]:
+        """
+        Get fingerprinted URLs for every asset.
+
+        Returns:
+            Dict[str, str]: Asset file name -> public URL
+        """
+        return {name: self.url(name) for name in self.manifest}
+
+    def response(self, filename: str, request: Request) -> Optional[Response]:
+        """
+        Build the response for an asset request.
+
+        Args:
+            filename (str): Requested file name, fingerprinted or plain
+            request (Request): Incoming request
+
+        Returns:
+            Optional[Response]: Asset response, or None if unknown
+        """
+        asset = self._assets.get(filename)
+        if asset is None:
+            return None
+        return asset.response(request)
+
+    @staticmethod
+    def _build(content: str, media_type: str, cache_control: str) -> CachedPage:
+        """Precompress an asset's variants."""
+        asset = CachedPage(lambda: content, media_type=media_type, cache_control=cache_control)
+        asset.render()
+        return asset
+
+    @staticmethod
+    def _media_type(name: str) -> str:
+        """Guess the Content-Type of a text asset; the charset is added on response."""
+        return mimetypes.guess_type(name)[0] or "text/plain"
@@ -0,0 +1,121 @@
+"""
+Style Cache Module
+
+Content-addressed cache for style guides produced by the analysis step,
+with an in-memory LRU tier and an optional SQLite tier on disk.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+try:
+    from .tiered_cache import TieredCache
+except ImportError:  # imported as a top-level module by main.py
+    from tiered_cache import TieredCache
+
+
+class StyleGuideCache(TieredCache):
+    """
+    Two-tier cache mapping a normalized reference set to its style guide.
+
+    Keys are SHA-256 digests of the normalized references plus the model
+    and generation parameters, so any change to either misses the cache.
+    Entries expire after ``ttl`` seconds in both tiers; each tier evicts
+    its least recently used entries once it holds more than its limit.
+    Concurrent misses for the same key share a single computation.
+    """
+
+    table = "style_guides"
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        disk_path: Optional[str] = None,
+        max_disk_entries: Optional[int] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Unset arguments fall back to the ``STYLE_CACHE_*`` environment
+        variables. The disk tier is only enabled when a path is configured.
+
+        Args:
+            max_entries (int): Maximum entries held in memory
+            ttl (float): Seconds an entry stays valid
+            disk_path (str): SQLite database file for the disk tier
+            max_disk_entries (int): Maximum entries kept on disk
+        """
+        super().__init__(
+            max_entries or int(os.getenv("STYLE_CACHE_SIZE", 256)),
+            ttl or float(os.getenv("STYLE_CACHE_TTL", 7 * 24 * 3600)),
+            disk_path or os.getenv("STYLE_CACHE_DB") or None,
+            max_disk_entries or int(os.getenv("STYLE_CACHE_DISK_ENTRIES", 10000)),
+        )
+
+    @staticmethod
+    def make_key(reference_articles: List[str], model: str, params: Dict[str, Any]) -> str:
+        """
+        Build the cache key for a reference set and generation settings.
+
+        Articles are normalized (line endings, surrounding and repeated
+        whitespace) and sorted, so cosmetic differences and ordering do not
+        defeat the cache.
+
+        Args:
+            reference_articles (List[str]): Reference article texts
+            model (str): Model name used for analysis
+            params (Dict[str, Any]): Generation parameters
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        normalized = sorted(
+            re.sub(r"[ \t]+", " ", article.replace("\r\n", "\n")).strip()
+            for article in reference_articles
+        )
+        digest = hashlib.sha256()
+        digest.update(json.dumps({"model": model, "params": params}, sort_keys=True).encode("utf-8"))
+        for article in normalized:
+            digest.update(b"\x00")
+            digest.update(article.encode("utf-8"))
+        return digest.hexdigest()
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[str]],
+        group: Optional[str] = None,
+    ) -> str:
+        """
+        Return the cached style guide or compute and store it.
+
+        If another request is already computing the same key, wait for its
+        result instead of starting a second analysis, provided it passed the
+        same ``group``. Empty results are returned but not cached.
+
+        Args:
+            key (str): Cache key from ``make_key``
+            compute (Callable[[], Awaitable[str]]): Produces the value on a miss
+            group (str): Callers that may share a computation of this key
+
+        Returns:
+            str: Style guide text
+        """
+        value, _ = await self._get_or_compute(key, compute, group)
+        return value
+
+    def _should_store(self, value: str) -> bool:
+        """Cache only non-empty style guides."""
+        return bool(value)
+
+    def _encode(self, value: str) -> str:
+        """Style guides are stored as plain text."""
+        return value
+
+    def _decode(self, text: str) -> str:
+        """Style guides are stored as plain text."""
+        return text
@@ -0,0 +1,251 @@
+"""
+Style Profiles Module
+
+Stores reusable style profiles so clients can send a short profile ID
+instead of resending reference articles or style guides on every call.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class StyleProfileStore:
+    """
+    Persistent store of style profiles keyed by a generated ID.
+
+    A profile keeps the reference articles it was created from and, when
+    the analysis step ran, the resulting style guide and the model that
+    produced it. Profiles live in a SQLite file when ``path`` is set, with
+    recently used ones kept in a small in-memory LRU; without a path they
+    are held in memory only.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_cached: int = 64):
+        """
+        Initialize the store.
+
+        Args:
+            path (str): SQLite database file; defaults to ``STYLE_PROFILE_DB``.
+                Without either, profiles are kept in memory only.
+            max_cached (int): Profiles kept in memory when backed by disk
+        """
+        self.path = path or os.getenv("STYLE_PROFILE_DB") or None
+        self.max_cached = max_cached
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        if self.path:
+            self._init_disk()
+
+    async def create(
+        self,
+        reference_articles: List[str],
+        style_guide: Optional[str] = None,
+        name: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create and persist a new profile.
+
+        Args:
+            reference_articles (List[str]): Reference article texts
+            style_guide (str): Style guide produced from the references, if any
+            name (str): Optional human-readable label
+            model (str): Model used to produce the style guide
+
+        Returns:
+            Dict[str, Any]: The stored profile including its ``id``
+        """
+        profile = {
+            "id": uuid.uuid4().hex,
+            "name": name or "",
+            "model": model or "",
+            "created_at": time.time(),
+            "reference_articles": list(reference_articles),
+            "style_guide": style_guide,
+        }
+        if self.path:
+            await asyncio.to_thread(self._disk_put, profile)
+        self._remember(profile)
+        return profile
+
+    async def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a profile by ID.
+
+        Args:
+            profile_id (str): Profile ID returned by ``create``
+
+        Returns:
+            Optional[Dict[str, Any]]: The profile, or None if unknown
+        """
+        profile = self._profiles.get(profile_id)
+        if profile is not None:
+            self._profiles.move_to_end(profile_id)
+            return profile
+
+        if not self.path:
+            return None
+
+        profile = await asyncio.to_thread(self._disk_get, profile_id)
+        if profile is not None:
+            self._remember(profile)
+        return profile
+
+    async def list(self) -> List[Dict[str, Any]]:
+        """
+        List profile summaries, newest first.
+
+        Returns:
+            List[Dict[str, Any]]: Profiles without their reference texts
+        """
+        if self.path:
+            return await asyncio.to_thread(self._disk_list)
+        profiles = sorted(self._profiles.values(), key=lambda p: p["created_at"], reverse=True)
+        return [self.summarize(profile) for profile in profiles]
+
+    async def delete(self, profile_id: str) -> bool:
+        """
+        Delete a profile.
+
+        Args:
+            profile_id (str): Profile ID
+
+        Returns:
+            bool: True if a profile was removed
+        """
+        removed = self._profiles.pop(profile_id, None) is not None
+        if self.path:
+            removed = await asyncio.to_thread(self._disk_delete, profile_id) or removed
+        return removed
+
+    @staticmethod
+    def style_guide_for(profile: Dict[str, Any], model: str) -> Optional[str]:
+        """
+        Get a profile's stored style guide if it is valid for a model.
+
+        A guide produced by a different model (or by an unrecorded one) is
+        not reused; the caller should analyze the profile's references again.
+
+        Args:
+            profile (Dict[str, Any]): Stored profile
+            model (str): Model the guide will be used with
+
+        Returns:
+            Optional[str]: The style guide, or None if absent or stale
+        """
+        if profile["style_guide"] and profile["model"] == model:
+            return profile["style_guide"]
+        return None
+
+    @staticmethod
+    def summarize(profile: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the public summary of a profile.
+
+        Args:
+            profile (Dict[str, Any]): Stored profile
+
+        Returns:
+            Dict[str, Any]: Profile metadata without the reference texts
+        """
+        return {
+            "id": profile["id"],
+            "name": profile["name"],
+            "model": profile["model"],
+            "created_at": profile["created_at"],
+            "reference_count": len(profile["reference_articles"]),
+            "has_style_guide": bool(profile["style_guide"]),
+        }
+
+    def _remember(self, profile: Dict[str, Any]) -> None:
+        """Keep a profile in memory, bounded when backed by disk."""
+        self._profiles[profile["id"]] = profile
+        self._profiles.move_to_end(profile["id"])
+        while self.path and len(self._profiles) > self.max_cached:
+            self._profiles.popitem(last=False)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection and commit on success."""
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_disk(self) -> None:
+        """Create the profile table if needed."""
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS style_profiles ("
+                "id TEXT PRIMARY KEY, name TEXT NOT NULL, model TEXT NOT NULL, "
+                "created_at REAL NOT NULL, reference_articles TEXT NOT NULL, style_guide TEXT)"
+            )
+
+    def _disk_put(self, profile: Dict[str, Any]) -> None:
+        """Write a profile row."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO style_profiles VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    profile["id"],
+                    profile["name"],
+                    profile["model"],
+                    profile["created_at"],
+                    json.dumps(profile["reference_articles"]),
+                    profile["style_guide"],
+                ),
+            )
+
+    def _disk_get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Read a profile row."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, name, model, created_at, reference_articles, style_guide "
+                "FROM style_profiles WHERE id = ?",
+                (profile_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0],
+            "name": row[1],
+            "model": row[2],
+            "created_at": row[3],
+            "reference_articles": json.loads(row[4]),
+            "style_guide": row[5],
+        }
+
+    def _disk_list(self) -> List[Dict[str, Any]]:
+        """Read profile summaries without loading reference texts."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, name, model, created_at, json_array_length(reference_articles), "
+                "style_guide IS NOT NULL AND style_guide != '' "
+                "FROM style_profiles ORDER BY created_at DESC"
+            ).fetchall()
+        return [
+            {
+                "id": row[0],
+                "name": row[1],
+                "model": row[2],
+                "created_at": row[3],
+                "reference_count": row[4],
+                "has_style_guide": bool(row[5]),
+            }
+            for row in rows
+        ]
+
+    def _disk_delete(self, profile_id: str) -> bool:
+        """Delete a profile row."""
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM style_profiles WHERE id = ?", (profile_id,))
+            return cursor.rowcount > 0
@@ -0,0 +1,29 @@
+"""
+Test configuration.
+
+Puts the repository root on ``sys.path`` so the standalone modules import
+the way ``main.py`` imports them, and the benchmarks directory so tests
+can reuse the mock Ollama server. Modules with package-relative imports
+(``ai_engine``, ``api_routes``, ``file_processor``) are loaded through
+``package_module``.
+"""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+
+
+@pytest.fixture
+def package_module():
+    """Import a module of the repository as part of its package."""
+    if os.path.dirname(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, os.path.dirname(REPO_ROOT))
+    package = os.path.basename(REPO_ROOT)
+    return lambda name: importlib.import_module(f"{package}.{name}")
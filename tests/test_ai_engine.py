@@ -0,0 +1,76 @@
+"""
+Tests for AIEngine style analysis: caching and generation slot handling.
+
+Generations go to a stub Ollama server through ``httpx.MockTransport``.
+"""
+
+import asyncio
+
+import httpx
+
+
+def make_engine(package_module, **kwargs):
+    """Build an engine over one stub server that answers every generation."""
+    ai_engine = package_module("ai_engine")
+    llm_backend = package_module("llm_backend")
+    ollama_client = package_module("ollama_client")
+    style_cache = package_module("style_cache")
+
+    generations = []
+
+    def generate(request):
+        generations.append(request)
+        return httpx.Response(200, json={"response": "Short sentences.", "done": True})
+
+    client = llm_backend.OllamaPool(
+        ["http://a"], lambda url: ollama_client.OllamaClient(url, transport=httpx.MockTransport(generate))
+    )
+    engine = ai_engine.AIEngine(client=client, style_cache=style_cache.StyleGuideCache(max_entries=8, ttl=60), **kwargs)
+    return engine, generations
+
+
+def test_repeated_references_are_analyzed_once(package_module):
+    async def scenario():
+        engine, generations = make_engine(package_module)
+        first = await engine.analyze_writing_style(["A reference article."])
+        second = await engine.analyze_writing_style(["A reference article."])
+        await engine.client.aclose()
+        return first, second, len(generations)
+
+    assert asyncio.run(scenario()) == ("Short sentences.", "Short sentences.", 1)
+
+
+def test_slot_holder_does_not_join_an_analysis_waiting_for_a_slot(package_module):
+    scheduler_module = package_module("generation_scheduler")
+
+    async def scenario():
+        scheduler = scheduler_module.GenerationScheduler(max_concurrency=1, max_queue=0)
+        engine, _ = make_engine(package_module, scheduler=scheduler)
+        async with scheduler.slot():
+            # Without a slot of its own, the first caller is rejected; the
+            # holder must not inherit that rejection or wait for a second slot
+            without_slot = asyncio.ensure_future(engine.analyze_writing_style(["Shared references."]))
+            holding = asyncio.ensure_future(engine.analyze_writing_style(["Shared references."], holding_slot=True))
+            results = await asyncio.gather(without_slot, holding, return_exceptions=True)
+        await engine.client.aclose()
+        return results
+
+    without_slot, holding = asyncio.run(scenario())
+    assert isinstance(without_slot, scheduler_module.QueueFullError)
+    assert holding == "Short sentences."
+
+
+def test_fitted_references_are_not_fitted_again(package_module):
+    async def scenario():
+        engine, _ = make_engine(package_module)
+        fits = []
+        fit = engine.prompt_budget.fit
+        engine.prompt_budget.fit = lambda references: fits.append(references) or fit(references)
+
+        references, _ = fit(["A reference article."])
+        await engine.analyze_writing_style(references, fitted=True)
+        await engine.analyze_writing_style(["Another reference article."])
+        await engine.client.aclose()
+        return len(fits)
+
+    assert asyncio.run(scenario()) == 1
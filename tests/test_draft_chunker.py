@@ -0,0 +1,82 @@
+"""
+Tests for draft chunking: splitting, stitching and in-order concurrent edits.
+"""
+
+import asyncio
+
+import pytest
+
+from draft_chunker import clean_chunk, continue_chunk, edit_chunks_in_order, split_draft
+
+
+def make_draft(sections: int, paragraphs: int = 4) -> str:
+    parts = []
+    for section in range(sections):
+        parts.append(f"## Section {section}")
+        parts.extend(f"Paragraph {section}.{index} has a few sentences. It goes on a bit." * 3 for index in range(paragraphs))
+    return "\n\n".join(parts)
+
+
+def test_short_draft_is_one_chunk():
+    draft = make_draft(1, 1)
+    assert split_draft(draft, 10_000) == [draft]
+
+
+def test_chunks_respect_the_limit_and_keep_every_paragraph():
+    draft = make_draft(6)
+    chunks = split_draft(draft, 200)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 200 * 4 for chunk in chunks)
+    assert "\n\n".join(chunks) == draft
+    assert all(chunk.startswith("## Section") for chunk in chunks[1:])
+
+
+def test_oversized_paragraph_is_split_on_sentences():
+    paragraph = " ".join(f"Sentence number {index} ends here." for index in range(100))
+    chunks = split_draft(paragraph, 50)
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert " ".join(chunks) == paragraph
+
+
+def test_stitching_drops_preambles_fences_and_repeated_paragraphs():
+    assert clean_chunk("```markdown\nBody.\n```") == "Body."
+    assert clean_chunk("Here is the edited text:\n\nBody.") == "Body."
+    assert continue_chunk(None, "First.\n\nShared.") == "First.\n\nShared."
+    assert continue_chunk("First.\n\nShared.", "Shared.\n\n\n\nNext.") == "\n\nNext."
+
+
+def test_edits_are_yielded_in_order_whatever_order_they_finish_in():
+    async def scenario():
+        progress = []
+
+        async def edit(index):
+            await asyncio.sleep(0.01 * (3 - index))
+            return f"Edited {index}."
+
+        pieces = [piece async for piece in edit_chunks_in_order(["a", "b", "c"], edit, 3, progress.append)]
+        return "".join(pieces), progress
+
+    text, progress = asyncio.run(scenario())
+    assert text == "Edited 0.\n\nEdited 1.\n\nEdited 2."
+    assert [event["chunks_done"] for event in progress] == [0, 1, 2, 3]
+
+
+def test_failed_chunk_cancels_the_rest():
+    async def scenario():
+        cancelled = []
+
+        async def edit(index):
+            if index == 0:
+                raise ValueError("generation failed")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(index)
+                raise
+
+        with pytest.raises(ValueError):
+            async for _ in edit_chunks_in_order(["a", "b", "c"], edit, 3):
+                pass
+        return sorted(cancelled)
+
+    assert asyncio.run(scenario()) == [1, 2]
@@ -0,0 +1,51 @@
+"""
+Tests for ExtractionPool timeouts: runaway tasks and tasks queued behind them.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from extraction_pool import ExtractionPool
+
+
+def pause(seconds: float) -> str:
+    time.sleep(seconds)
+    return "parsed"
+
+
+@pytest.mark.parametrize("mode", ["process", "thread"])
+def test_queued_tasks_are_not_timed_out_while_waiting(mode):
+    async def scenario():
+        pool = ExtractionPool(mode, max_workers=1, timeout=0.5)
+        results = await asyncio.gather(*[pool.run(pause, 0.3) for _ in range(3)])
+        pool.shutdown()
+        return results
+
+    assert asyncio.run(scenario()) == ["parsed"] * 3
+
+
+def test_timed_out_process_is_killed_and_its_neighbours_rerun():
+    async def scenario():
+        pool = ExtractionPool("process", max_workers=2, timeout=0.5)
+        await pool.run(pause, 0)
+
+        async def started_later():
+            await asyncio.sleep(0.3)
+            return await pool.run(pause, 0.3)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(pool.run(pause, 30), started_later(), return_exceptions=True)
+        elapsed = time.perf_counter() - started
+        after = await pool.run(pause, 0)
+        pool.shutdown()
+        return results, elapsed, after, pool.stats()
+
+    (runaway, neighbour), elapsed, after, stats = asyncio.run(scenario())
+    assert runaway.status_code == 504
+    assert neighbour == "parsed"
+    assert after == "parsed"
+    # Killed after 0.2s of its 0.3s parse, the neighbour ran again from the start
+    assert 0.75 < elapsed < 5
+    assert stats["timed_out"] == 1 and stats["failed"] == 0
@@ -0,0 +1,92 @@
+"""
+Tests for GenerationScheduler: admission, rejection and queue positions.
+"""
+
+import asyncio
+
+import pytest
+
+from generation_scheduler import GenerationScheduler, QueueFullError, QueueTimeoutError
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    async def scenario():
+        scheduler = GenerationScheduler(max_concurrency=1, max_queue=1, queue_timeout=5)
+        running = scheduler.submit()
+        queued = scheduler.submit()
+        with pytest.raises(QueueFullError) as rejected:
+            scheduler.submit()
+        scheduler.release(queued)
+        scheduler.release(running)
+        return rejected.value, scheduler.stats()
+
+    error, stats = asyncio.run(scenario())
+    assert error.status_code == 429
+    assert int(error.headers["Retry-After"]) >= 1
+    assert stats["rejected"] == 1 and stats["active"] == 0 and stats["queued"] == 0
+
+
+def test_queue_timeout_is_rejected_with_retry_after():
+    async def scenario():
+        scheduler = GenerationScheduler(max_concurrency=1, max_queue=1, queue_timeout=0.05)
+        async with scheduler.slot():
+            with pytest.raises(QueueTimeoutError) as timed_out:
+                async with scheduler.slot():
+                    pass
+        return timed_out.value, scheduler.stats()
+
+    error, stats = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert int(error.headers["Retry-After"]) >= 1
+    assert stats["timed_out"] == 1 and stats["queued"] == 0 and stats["active"] == 0
+
+
+def test_queue_positions_count_down_to_the_slot():
+    async def scenario():
+        scheduler = GenerationScheduler(max_concurrency=1, max_queue=3, queue_timeout=5)
+        running = scheduler.submit()
+        ahead = scheduler.submit()
+        ticket = scheduler.submit()
+        positions = []
+
+        async def follow():
+            async for position in scheduler.queue_positions(ticket, interval=0.01):
+                positions.append(position)
+
+        follower = asyncio.ensure_future(follow())
+        await asyncio.sleep(0.03)
+        scheduler.release(running)
+        await asyncio.sleep(0.03)
+        scheduler.release(ahead)
+        await follower
+        granted = scheduler.position(ticket)
+        scheduler.release(ticket)
+        return positions, granted
+
+    positions, granted = asyncio.run(scenario())
+    assert positions == [2, 1]
+    assert granted == 0
+
+
+def test_cancelled_waiter_leaves_the_queue_without_taking_a_slot():
+    async def scenario():
+        scheduler = GenerationScheduler(max_concurrency=1, max_queue=2, queue_timeout=5)
+        order = []
+
+        async def generate(name, hold):
+            async with scheduler.slot():
+                order.append(name)
+                await asyncio.sleep(hold)
+
+        first = asyncio.ensure_future(generate("first", 0.05))
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(generate("cancelled", 0))
+        last = asyncio.ensure_future(generate("last", 0))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        await asyncio.gather(first, last)
+        return order, scheduler.stats()
+
+    order, stats = asyncio.run(scenario())
+    assert order == ["first", "last"]
+    assert stats["active"] == 0 and stats["queued"] == 0
@@ -0,0 +1,91 @@
+"""
+Tests for JobManager: outcomes, progress events and cancellation.
+"""
+
+import asyncio
+
+from fastapi import HTTPException
+
+from job_manager import JobManager
+
+
+async def follow(manager, job):
+    return [event["status"] for event in [event async for event in manager.events(job)]]
+
+
+def test_job_reports_progress_and_result():
+    async def scenario():
+        manager = JobManager()
+
+        async def work(report):
+            report({"stage": "editing"})
+            return "edited"
+
+        job = manager.submit(work)
+        statuses = await follow(manager, job)
+        return statuses, job.to_dict()
+
+    statuses, job = asyncio.run(scenario())
+    assert statuses == ["running", "running", "succeeded"]
+    assert job["result"] == "edited" and job["progress"]["status"] == "succeeded"
+
+
+def test_failed_job_keeps_the_error():
+    async def scenario():
+        manager = JobManager()
+
+        async def work(report):
+            raise HTTPException(status_code=503, detail="AI service unavailable")
+
+        job = manager.submit(work)
+        await follow(manager, job)
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == "failed" and job.error == "AI service unavailable"
+
+
+def test_running_job_is_cancelled():
+    async def scenario():
+        manager = JobManager()
+
+        async def work(report):
+            await asyncio.sleep(10)
+
+        job = manager.submit(work)
+        subscriber = asyncio.ensure_future(follow(manager, job))
+        await asyncio.sleep(0.01)
+        return await manager.cancel(job.id), job.status, await subscriber
+
+    assert asyncio.run(scenario()) == (True, "cancelled", ["running", "cancelled"])
+
+
+def test_job_cancelled_before_it_starts_ends_cancelled():
+    async def scenario():
+        manager = JobManager(retention=0.01)
+
+        async def work(report):
+            return "never"
+
+        job = manager.submit(work)
+        subscriber = asyncio.ensure_future(follow(manager, job))
+        cancelled = await manager.cancel(job.id)
+        statuses = await asyncio.wait_for(subscriber, 1)
+        await asyncio.sleep(0.02)
+        return cancelled, job.status, job.finished_at is not None, statuses, manager.get(job.id)
+
+    assert asyncio.run(scenario()) == (True, "cancelled", True, ["cancelled"], None)
+
+
+def test_shutdown_cancels_jobs_that_never_started():
+    async def scenario():
+        manager = JobManager()
+
+        async def work(report):
+            return "never"
+
+        jobs = [manager.submit(work) for _ in range(3)]
+        await manager.shutdown()
+        return [job.status for job in jobs]
+
+    assert asyncio.run(scenario()) == ["cancelled"] * 3
@@ -0,0 +1,201 @@
+"""
+Tests for OllamaPool: server selection, sticky routing, ejection and probing.
+
+Each server is an ``OllamaClient`` whose transport is an
+``httpx.MockTransport`` handler, so no sockets are opened.
+"""
+
+import asyncio
+from typing import Callable, Dict
+
+import httpx
+import pytest
+
+from llm_backend import OllamaPool
+from ollama_client import OllamaClient, OllamaError
+
+GENERATED = {"response": "ok", "done": True}
+
+
+def make_pool(handlers: Dict[str, Callable], **kwargs) -> OllamaPool:
+    """Build a pool over stub servers, one handler per URL."""
+    options = {"max_failures": 2, "ejection_time": 30, "probe_interval": 30, "sticky_slack": 2, **kwargs}
+    return OllamaPool(
+        list(handlers),
+        lambda url: OllamaClient(url, transport=httpx.MockTransport(handlers[url])),
+        **options,
+    )
+
+
+def ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=GENERATED)
+
+
+def unavailable(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(503, text="overloaded")
+
+
+def model_not_found(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(404, json={"error": "model 'nope' not found"})
+
+
+def refuse(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectError("connection refused", request=request)
+
+
+def stats_by_url(pool: OllamaPool) -> Dict[str, dict]:
+    return {entry["url"]: entry for entry in pool.stats()}
+
+
+def test_requests_go_to_the_least_outstanding_server():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow(request):
+            await release.wait()
+            return httpx.Response(200, json=GENERATED)
+
+        pool = make_pool({"http://a": slow, "http://b": slow, "http://c": slow})
+        pending = [asyncio.create_task(pool.post("/api/generate", json={})) for _ in range(6)]
+        await asyncio.sleep(0.05)
+        outstanding = [entry["outstanding"] for entry in pool.stats()]
+        release.set()
+        await asyncio.gather(*pending)
+        await pool.aclose()
+        return outstanding, [entry["outstanding"] for entry in pool.stats()]
+
+    during, after = asyncio.run(scenario())
+    assert during == [2, 2, 2]
+    assert after == [0, 0, 0]
+
+
+def test_route_key_sticks_to_one_server_until_it_is_too_busy():
+    async def scenario():
+        seen = []
+
+        def record(request):
+            seen.append(f"http://{request.url.host}")
+            return httpx.Response(200, json=GENERATED)
+
+        pool = make_pool({"http://a": record, "http://b": record, "http://c": record}, sticky_slack=1)
+        for _ in range(5):
+            await pool.post("/api/generate", json={}, route_key="profile-1")
+        preferred = set(seen)
+
+        # Within the slack the key keeps its server; beyond it, the least loaded wins
+        endpoint = next(endpoint for endpoint in pool.endpoints if endpoint.url in preferred)
+        endpoint.outstanding = 1
+        seen.clear()
+        await pool.post("/api/generate", json={}, route_key="profile-1")
+        within_slack = set(seen)
+        endpoint.outstanding = 2
+        seen.clear()
+        await pool.post("/api/generate", json={}, route_key="profile-1")
+        beyond_slack = set(seen)
+        await pool.aclose()
+        return preferred, within_slack, beyond_slack
+
+    preferred, within_slack, beyond_slack = asyncio.run(scenario())
+    assert len(preferred) == 1
+    assert within_slack == preferred
+    assert beyond_slack and beyond_slack != preferred
+
+
+def test_route_key_keeps_its_server_when_another_is_ejected():
+    pool = make_pool({"http://a": ok, "http://b": ok, "http://c": ok})
+    keys = [f"profile-{index}" for index in range(20)]
+    before = {key: pool._pick(key, set()).url for key in keys}
+
+    ejected = pool.endpoints[0]
+    pool._eject(ejected)
+    after = {key: pool._pick(key, set()).url for key in keys}
+
+    assert len(set(before.values())) > 1
+    for key in keys:
+        if before[key] != ejected.url:
+            assert after[key] == before[key]
+        else:
+            assert after[key] != ejected.url
+
+
+def test_server_failures_eject_and_ejection_expires():
+    async def scenario():
+        pool = make_pool({"http://a": unavailable, "http://b": ok}, ejection_time=0.1)
+        statuses = [(await pool.post("/api/generate", json={})).status_code for _ in range(4)]
+        ejected = stats_by_url(pool)["http://a"]
+        await asyncio.sleep(0.15)
+        readmitted = stats_by_url(pool)["http://a"]["available"]
+        await pool.aclose()
+        return statuses, ejected, readmitted
+
+    statuses, ejected, readmitted = asyncio.run(scenario())
+    assert statuses.count(503) == 2
+    assert not ejected["available"]
+    assert ejected["errors"] == 2
+    assert readmitted
+
+
+def test_stream_failures_count_toward_ejection():
+    async def scenario():
+        pool = make_pool({"http://a": unavailable})
+        for _ in range(2):
+            with pytest.raises(OllamaError):
+                async for _ in pool.stream_generate({"model": "llama3:8b"}):
+                    pass
+        await pool.aclose()
+        return stats_by_url(pool)["http://a"]
+
+    assert not asyncio.run(scenario())["available"]
+
+
+def test_client_errors_do_not_eject():
+    async def scenario():
+        pool = make_pool({"http://a": model_not_found, "http://b": model_not_found})
+        for _ in range(5):
+            with pytest.raises(OllamaError) as raised:
+                async for _ in pool.stream_generate({"model": "nope"}):
+                    pass
+            assert raised.value.status_code == 404
+            assert (await pool.post("/api/generate", json={"model": "nope"})).status_code == 404
+        await pool.aclose()
+        return pool.stats()
+
+    assert all(entry["available"] and entry["errors"] == 0 for entry in asyncio.run(scenario()))
+
+
+def test_connect_errors_fail_over_to_the_next_server():
+    async def scenario():
+        pool = make_pool({"http://a": refuse, "http://b": ok})
+        responses = [await pool.post("/api/generate", json={}, route_key=str(index)) for index in range(4)]
+        chunks = [chunk async for chunk in pool.stream_generate({})]
+        await pool.aclose()
+        return responses, chunks, stats_by_url(pool)
+
+    responses, chunks, stats = asyncio.run(scenario())
+    assert all(response.status_code == 200 for response in responses)
+    assert chunks == [GENERATED]
+    assert not stats["http://a"]["available"]
+
+
+def test_probe_loop_ejects_and_restores_servers():
+    async def scenario():
+        healthy = {"value": False}
+
+        def version(request):
+            if request.url.path == "/api/version" and healthy["value"]:
+                return httpx.Response(200, json={"version": "0.0.0"})
+            return httpx.Response(500, text="starting")
+
+        pool = make_pool({"http://a": version, "http://b": ok}, probe_interval=0.02)
+        await pool.start()
+        await asyncio.sleep(0.05)
+        ejected = stats_by_url(pool)["http://a"]["available"]
+        healthy["value"] = True
+        await asyncio.sleep(0.05)
+        restored = stats_by_url(pool)["http://a"]["available"]
+        await pool.aclose()
+        return ejected, restored
+
+    ejected, restored = asyncio.run(scenario())
+    assert not ejected
+    assert restored
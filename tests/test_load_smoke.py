@@ -0,0 +1,85 @@
+"""
+Smoke tests that drive both apps through the load benchmark.
+
+Each target gets a few concurrent edit, streamed edit and extraction
+requests against the mock Ollama server from ``benchmarks/mock_ollama.py``,
+exercising the scheduler, caches and Ollama client end to end, plus one
+background job followed to completion.
+"""
+
+import asyncio
+import json
+import logging
+import os
+
+import httpx
+import pytest
+
+import load
+
+SCENARIOS = ("edit", "stream", "extract")
+
+
+@pytest.fixture(scope="module")
+def mock_port():
+    """Start the mock Ollama server for the module and restore the environment afterwards."""
+    environ = dict(os.environ)
+    args = load.build_parser().parse_args([])
+    port = load.free_port()
+    process = load.start_mock(args, port)
+    load.configure_environment(args, port)
+    yield port
+    process.kill()
+    process.wait()
+    os.environ.clear()
+    os.environ.update(environ)
+
+
+@pytest.mark.parametrize("target", sorted(load.TARGETS))
+def test_target_serves_every_scenario(mock_port, target):
+    arguments = ["--target", target, "--requests", "6", "--concurrency", "3", "--docx-paragraphs", "20", "--timeout", "60"]
+    app = load.TARGETS[target]()
+
+    async def run_all():
+        results = {}
+        for scenario in SCENARIOS:
+            args = load.build_parser().parse_args(arguments + ["--scenario", scenario])
+            results[scenario] = await load.run_load(app, args)
+        return results, await extract_one(), await run_job()
+
+    async def extract_one():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            extract_args = load.build_parser().parse_args(arguments + ["--scenario", "extract"])
+            path, kwargs = load.build_requests(extract_args)[0]
+            # Generated documents carry zip timestamps, so send the same bytes twice rather than rebuilding them
+            first = (await client.post(path, **kwargs)).json()["data"]
+            second = (await client.post(path, **kwargs)).json()["data"]
+            return first, second
+
+    async def run_job():
+        await app.router.startup()
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                _, kwargs = load.build_requests(load.build_parser().parse_args(["--requests", "1"]))[0]
+                response = await client.post("/api/jobs", **kwargs)
+                assert response.status_code == 202
+                job_id = response.json()["data"]["job_id"]
+                events = await client.get(f"/api/jobs/{job_id}/events", timeout=60)
+                statuses = [json.loads(line).get("status") for line in events.text.splitlines() if line]
+                return statuses[-1], (await client.get(f"/api/jobs/{job_id}")).json()["data"]
+        finally:
+            await app.router.shutdown()
+
+    logging.disable(logging.INFO)
+    try:
+        results, extracted, (final_status, job) = asyncio.run(run_all())
+    finally:
+        logging.disable(logging.NOTSET)
+
+    for scenario in SCENARIOS:
+        assert results[scenario]["outcomes"] == {"200": 6}, (scenario, results[scenario])
+    first, second = extracted
+    assert first["text"] and first["text"] == second["text"]
+    assert second["cached"] is True and len(first["sha256"]) == 64 and second["sha256"] == first["sha256"]
+    assert final_status == "succeeded", job
+    assert job["result"]["edited_article"]
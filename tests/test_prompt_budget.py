@@ -0,0 +1,54 @@
+"""
+Tests for PromptBudget: fair sharing, excerpts and the budget report.
+"""
+
+from prompt_budget import EXCERPT_MARKER, PromptBudget
+
+
+def article(sentences: int, word: str = "style") -> str:
+    return " ".join(f"Sentence {index} is about {word}." for index in range(sentences))
+
+
+def test_references_within_budget_are_kept_whole():
+    references = [article(5), article(8)]
+    fitted, report = PromptBudget(max_reference_tokens=1000).fit(references)
+    assert fitted == references
+    assert not report["truncated"]
+    assert [entry["status"] for entry in report["articles"]] == ["full", "full"]
+
+
+def test_short_articles_stay_whole_and_long_ones_share_the_rest():
+    short, long_a, long_b = article(3), article(400, "tone"), article(400, "voice")
+    budget = PromptBudget(max_reference_tokens=600)
+    fitted, report = budget.fit([short, long_a, long_b])
+
+    assert fitted[0] == short
+    assert [entry["status"] for entry in report["articles"]] == ["full", "excerpted", "excerpted"]
+    assert report["final_tokens"] <= 600 < report["original_tokens"]
+    # The long articles split what the short one left, less what sentence-boundary cuts drop
+    share = (600 - report["articles"][0]["kept_tokens"]) // 2
+    assert all(0.8 * share <= entry["kept_tokens"] <= share for entry in report["articles"][1:])
+
+
+def test_excerpt_keeps_opening_middle_and_ending():
+    text = article(300)
+    excerpt = PromptBudget().excerpt(text, 200)
+    assert excerpt.count(EXCERPT_MARKER) == 2
+    assert excerpt.startswith("Sentence 0 ")
+    assert excerpt.endswith("Sentence 299 is about style.")
+    assert PromptBudget.estimate_tokens(excerpt) <= 200
+
+
+def test_articles_beyond_the_minimal_excerpts_are_dropped():
+    references = [article(100) for _ in range(5)]
+    fitted, report = PromptBudget(max_reference_tokens=200, min_excerpt_tokens=64).fit(references)
+    assert len(fitted) == 3
+    assert [entry["status"] for entry in report["articles"]][3:] == ["dropped", "dropped"]
+
+
+def test_fitted_references_fit_again_unchanged():
+    budget = PromptBudget(max_reference_tokens=500)
+    fitted, _ = budget.fit([article(3), article(300), article(200)])
+    refitted, report = budget.fit(fitted)
+    assert refitted == fitted
+    assert not report["truncated"]
@@ -0,0 +1,120 @@
+"""
+Tests for TieredCache: shared misses, cancellation and the disk tier.
+"""
+
+import asyncio
+
+import pytest
+
+from tiered_cache import TieredCache
+
+
+def test_concurrent_misses_share_one_computation():
+    async def scenario():
+        cache = TieredCache(max_entries=4, ttl=60)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*[cache._get_or_compute("key", compute) for _ in range(3)])
+        return results, len(calls), await cache._get_or_compute("key", compute)
+
+    results, calls, cached = asyncio.run(scenario())
+    assert [value for value, _ in results] == ["value"] * 3
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    assert calls == 1
+    assert cached == ("value", True)
+
+
+def test_cancelled_waiter_does_not_fail_the_others():
+    async def scenario():
+        cache = TieredCache(max_entries=4, ttl=60)
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return "value"
+
+        first = asyncio.ensure_future(cache._get_or_compute("key", compute))
+        second = asyncio.ensure_future(cache._get_or_compute("key", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return await second, first.cancelled(), await cache.get("key")
+
+    assert asyncio.run(scenario()) == (("value", True), True, "value")
+
+
+def test_computation_is_cancelled_once_every_waiter_left():
+    async def scenario():
+        cache = TieredCache(max_entries=4, ttl=60)
+        started = asyncio.Event()
+        stopped = []
+
+        async def compute():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                stopped.append(True)
+                raise
+
+        waiter = asyncio.ensure_future(cache._get_or_compute("key", compute))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.sleep(0.01)
+
+        async def fresh():
+            return "fresh"
+
+        return stopped, await cache._get_or_compute("key", fresh)
+
+    stopped, result = asyncio.run(scenario())
+    assert stopped == [True]
+    assert result == ("fresh", False)
+
+
+def test_failures_reach_every_waiter_and_are_not_cached():
+    async def scenario():
+        cache = TieredCache(max_entries=4, ttl=60)
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise ValueError("parse failed")
+
+        results = await asyncio.gather(*[cache._get_or_compute("key", fail) for _ in range(2)], return_exceptions=True)
+        return results, await cache.get("key")
+
+    results, cached = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert cached is None
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    path = str(tmp_path / "cache.db")
+
+    async def scenario():
+        await TieredCache(max_entries=4, ttl=60, disk_path=path).set("key", {"text": "stored"})
+        reopened = TieredCache(max_entries=4, ttl=60, disk_path=path)
+        return await reopened.get("key"), reopened.stats()
+
+    value, stats = asyncio.run(scenario())
+    assert value == {"text": "stored"}
+    assert stats["disk_hits"] == 1
+
+
+@pytest.mark.parametrize("max_entries", [1, 2])
+def test_memory_tier_evicts_the_least_recently_used(max_entries):
+    async def scenario():
+        cache = TieredCache(max_entries=max_entries, ttl=60)
+        await cache.set("old", 1)
+        await cache.set("new", 2)
+        return await cache.get("old"), await cache.get("new")
+
+    old, new = asyncio.run(scenario())
+    assert new == 2
+    assert old == (None if max_entries == 1 else 1)
@@ -0,0 +1,26 @@
+"""
+Tests for the tracer's JSON-lines export.
+"""
+
+import asyncio
+import json
+
+from tracing import Tracer
+
+
+def test_finished_traces_are_written_off_the_event_loop(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(enabled=True, export_path=str(path))
+
+    async def scenario():
+        for index in range(3):
+            trace = tracer.begin(f"GET /{index}")
+            with tracer.span("work", index=index):
+                pass
+            tracer.finish(trace)
+        await asyncio.to_thread(tracer.exporter.flush)
+
+    asyncio.run(scenario())
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["GET /0", "GET /1", "GET /2"]
+    assert lines[0]["spans"][0]["attributes"] == {"index": 0}
@@ -0,0 +1,260 @@
+"""
+Tiered Cache Module
+
+Shared machinery for the content-addressed caches: an in-memory LRU tier,
+an optional SQLite tier on disk and de-duplication of concurrent misses.
+"""
+
+import asyncio
+import contextlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+
+class _Computation:
+    """A cache miss being computed, shared by every request waiting for it."""
+
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class TieredCache:
+    """
+    Two-tier key/value cache with expiry and LRU eviction.
+
+    Entries expire after ``ttl`` seconds in both tiers; each tier evicts
+    its least recently used entries once it holds more than its limit.
+    Concurrent misses for the same key share a single computation.
+    Subclasses name the disk table, build their keys and may change how
+    values are serialized or which results are worth storing.
+    """
+
+    table = "entries"
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        disk_path: Optional[str] = None,
+        max_disk_entries: int = 1000,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum entries held in memory
+            ttl (float): Seconds an entry stays valid
+            disk_path (str): SQLite database file; None disables the disk tier
+            max_disk_entries (int): Maximum entries kept on disk
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self.max_disk_entries = max_disk_entries
+
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Optional[str]], _Computation] = {}
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        if self.disk_path:
+            self._init_disk()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a value, promoting disk hits into memory.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Any]: Cached value, or None on a miss
+        """
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > time.time():
+                self._memory.move_to_end(key)
+                self._hits += 1
+                return value
+            del self._memory[key]
+
+        if self.disk_path:
+            value = await asyncio.to_thread(self._disk_get, key)
+            if value is not None:
+                self._remember(key, value)
+                self._hits += 1
+                self._disk_hits += 1
+                return value
+
+        self._misses += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Store a value in every enabled tier.
+
+        Args:
+            key (str): Cache key
+            value (Any): Value to store
+        """
+        self._remember(key, value)
+        if self.disk_path:
+            await asyncio.to_thread(self._disk_set, key, value)
+
+    async def _get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        group: Optional[str] = None,
+    ) -> Tuple[Any, bool]:
+        """
+        Return the cached value or compute and store it.
+
+        The computation runs in its own task that every request waiting on
+        the key shares through ``asyncio.shield``, so a cancelled caller
+        (client disconnect, deleted job) only drops its own wait; the task
+        is cancelled once nobody is waiting for it any more. Failures reach
+        every waiter and are not cached.
+
+        Only callers passing the same ``group`` share a computation, for
+        ``compute`` closures whose behaviour depends on the caller (such as
+        how they wait for a generation slot); the result is stored under
+        ``key`` either way.
+
+        Args:
+            key (str): Cache key
+            compute (Callable[[], Awaitable[Any]]): Produces the value on a miss
+            group (str): Callers that may share a computation of this key
+
+        Returns:
+            Tuple[Any, bool]: The value and whether this caller did not
+            compute it (cache hit or a concurrent computation)
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            return cached, True
+
+        flight = (key, group)
+        computation = self._inflight.get(flight)
+        shared = computation is not None and not computation.task.cancelled()
+        if not shared:
+            computation = _Computation(asyncio.ensure_future(self._compute_and_store(key, compute)))
+            self._inflight[flight] = computation
+            computation.task.add_done_callback(lambda _: self._forget(flight, computation))
+
+        computation.waiters += 1
+        try:
+            return await asyncio.shield(computation.task), shared
+        finally:
+            computation.waiters -= 1
+            if computation.waiters == 0 and not computation.task.done():
+                computation.task.cancel()
+
+    async def _compute_and_store(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``compute`` and cache the result if it is worth keeping."""
+        value = await compute()
+        if self._should_store(value):
+            await self.set(key, value)
+        return value
+
+    def _forget(self, flight: Tuple[str, Optional[str]], computation: _Computation) -> None:
+        """Drop a finished computation unless a newer one replaced it."""
+        if self._inflight.get(flight) is computation:
+            del self._inflight[flight]
+
+    def clear(self) -> None:
+        """Drop every entry from memory and disk."""
+        self._memory.clear()
+        if self.disk_path:
+            with self._connect() as conn:
+                conn.execute(f"DELETE FROM {self.table}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict[str, Any]: Hit/miss counts, hit ratio and tier sizes
+        """
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "disk_enabled": bool(self.disk_path),
+        }
+
+    def _should_store(self, value: Any) -> bool:
+        """Whether a computed value is cached."""
+        return True
+
+    def _encode(self, value: Any) -> str:
+        """Serialize a value for the disk tier."""
+        return json.dumps(value)
+
+    def _decode(self, text: str) -> Any:
+        """Deserialize a value read from the disk tier."""
+        return json.loads(text)
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Insert into the memory tier, evicting the least recently used."""
+        self._memory[key] = (value, time.time() + self.ttl)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection to the disk tier and commit on success."""
+        conn = sqlite3.connect(self.disk_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_disk(self) -> None:
+        """Create the disk tier schema if needed."""
+        with self._connect() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_accessed ON {self.table} (accessed_at)")
+
+    def _disk_get(self, key: str) -> Optional[Any]:
+        """Read a live entry from disk and refresh its access time."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT value FROM {self.table} WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            return self._decode(row[0])
+
+    def _disk_set(self, key: str, value: Any) -> None:
+        """Write an entry to disk, then drop expired and excess entries."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, self._encode(value), now + self.ttl, now),
+            )
+            conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key NOT IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_disk_entries,),
+            )
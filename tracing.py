@@ -0,0 +1,394 @@
+"""
+Tracing Module
+
+Lightweight per-request tracing: nested timing spans collected for the
+current request, reported in a ``Server-Timing`` header, written to a
+local JSON-lines file and mirrored to OpenTelemetry when it is installed.
+"""
+
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # OpenTelemetry is optional; spans are still recorded locally
+    otel_trace = None
+
+logger = logging.getLogger(__name__)
+
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("current_trace", default=None)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    def __init__(self, name: str, parent_id: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None):
+        """
+        Start the span.
+
+        Args:
+            name (str): Operation name, e.g. ``analyze_style``
+            parent_id (str): ID of the enclosing span, if any
+            attributes (Dict[str, Any]): Initial attributes
+        """
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        Attach a value to the span.
+
+        Args:
+            key (str): Attribute name
+            value (Any): JSON-serializable value
+        """
+        self.attributes[key] = value
+
+    def end(self, duration: Optional[float] = None) -> None:
+        """
+        Finish the span.
+
+        Args:
+            duration (float): Seconds to record instead of the time since start
+        """
+        self.duration = time.perf_counter() - self._started if duration is None else duration
+
+    def to_dict(self, trace_started_at: float) -> Dict[str, Any]:
+        """
+        Serialize the span.
+
+        Args:
+            trace_started_at (float): Start of the trace (epoch seconds)
+
+        Returns:
+            Dict[str, Any]: Name, IDs, offset and duration in milliseconds,
+            attributes and error
+        """
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "offset_ms": round((self.started_at - trace_started_at) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """Spans recorded while handling one request (or one background task)."""
+
+    def __init__(self, name: str):
+        """
+        Start the trace.
+
+        Args:
+            name (str): What is traced, e.g. ``POST /api/generate-edit``
+        """
+        self.name = name
+        self.trace_id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.spans: List[Span] = []
+        self.finished = False
+        self.duration: Optional[float] = None
+
+    def elapsed(self) -> float:
+        """Seconds since the trace started."""
+        return time.perf_counter() - self._started
+
+    def server_timing(self) -> str:
+        """
+        Render finished spans as a ``Server-Timing`` header value.
+
+        Spans with the same name (e.g. one ``generate`` per chunk) are
+        summed, with the count in the description; ``total`` is the time
+        so far.
+
+        Returns:
+            str: Header value, e.g. ``generate;dur=812.4, total;dur=815.0``
+        """
+        totals: Dict[str, List[float]] = {}
+        for span in self.spans:
+            if span.duration is not None:
+                entry = totals.setdefault(_metric_name(span.name), [0.0, 0])
+                entry[0] += span.duration
+                entry[1] += 1
+
+        metrics = []
+        for name, (duration, count) in totals.items():
+            description = f';desc="{count}x"' if count > 1 else ""
+            metrics.append(f"{name};dur={duration * 1000:.1f}{description}")
+        metrics.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the trace.
+
+        Returns:
+            Dict[str, Any]: Trace ID, name, start time, duration and spans
+        """
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "spans": [span.to_dict(self.started_at) for span in self.spans],
+        }
+
+
+class JSONFileExporter:
+    """
+    Appends each finished trace to a file as one JSON line.
+
+    Writes are handed to a single background thread, so finishing a trace
+    never blocks the event loop on disk and lines keep their order.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the exporter.
+
+        Args:
+            path (str): File to append to; created if missing
+        """
+        self.path = path
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trace-export")
+
+    def export(self, trace: Trace) -> None:
+        """
+        Queue one trace for writing.
+
+        Args:
+            trace (Trace): Finished trace
+        """
+        self._writer.submit(self._write, json.dumps(trace.to_dict(), default=str) + "\n")
+
+    def flush(self) -> None:
+        """Wait until every queued trace is written."""
+        self._writer.submit(lambda: None).result()
+
+    def _write(self, line: str) -> None:
+        """Append a line to the export file (runs in the writer thread)."""
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError as e:
+            logger.warning(f"Could not export trace to {self.path}: {e}")
+
+
+class Tracer:
+    """
+    Records spans into the trace of the current request.
+
+    The current trace and span live in context variables, so spans opened
+    in concurrently running tasks (chunked edits, batch items) nest under
+    the span that started them. Spans opened outside any trace, or with
+    ``root=True`` for background jobs that outlive their request, start a
+    trace of their own.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        export_path: Optional[str] = None,
+        service_name: str = "consistly"
+    ):
+        """
+        Initialize the tracer.
+
+        Args:
+            enabled (bool): Record spans at all (``TRACING_ENABLED``)
+            export_path (str): JSON-lines file for finished traces; empty
+                disables the local export (``TRACING_EXPORT_PATH``)
+            service_name (str): Instrumentation name for OpenTelemetry
+        """
+        self.enabled = enabled if enabled is not None else os.getenv("TRACING_ENABLED", "true").lower() != "false"
+        export_path = export_path if export_path is not None else os.getenv("TRACING_EXPORT_PATH", "")
+        self.exporter = JSONFileExporter(export_path) if export_path else None
+        # A no-op unless an OpenTelemetry SDK and exporter are configured
+        self._otel = otel_trace.get_tracer(service_name) if otel_trace is not None else None
+
+    def begin(self, name: str) -> Optional[Trace]:
+        """
+        Start a trace and make it current.
+
+        Args:
+            name (str): What is traced
+
+        Returns:
+            Optional[Trace]: The trace, or None when tracing is disabled
+        """
+        if not self.enabled:
+            return None
+        trace = Trace(name)
+        _current_trace.set(trace)
+        _current_span.set(None)
+        return trace
+
+    def finish(self, trace: Optional[Trace]) -> None:
+        """
+        Finish a trace and export it.
+
+        Args:
+            trace (Trace): Trace from ``begin``
+        """
+        if trace is None or trace.finished:
+            return
+        trace.finished = True
+        trace.duration = trace.elapsed()
+        if _current_trace.get() is trace:
+            _current_trace.set(None)
+        if self.exporter is not None:
+            self.exporter.export(trace)
+
+    @contextlib.contextmanager
+    def span(self, name: str, root: bool = False, **attributes: Any) -> Iterator[Span]:
+        """
+        Time the enclosed block as a span of the current trace.
+
+        Args:
+            name (str): Operation name
+            root (bool): Start a new trace even inside a request, for
+                background work that outlives it
+            **attributes: Initial span attributes
+
+        Yields:
+            Span: The span, for adding attributes
+        """
+        if not self.enabled:
+            yield Span(name, attributes=attributes)
+            return
+
+        trace = _current_trace.get()
+        own_trace = root or trace is None or trace.finished
+        if own_trace:
+            trace = Trace(name)
+        parent = None if own_trace else _current_span.get()
+
+        span = Span(name, parent.span_id if parent else None, attributes)
+        trace.spans.append(span)
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(span)
+        otel_span = self._otel.start_as_current_span(name) if self._otel is not None else None
+        otel_current = otel_span.__enter__() if otel_span is not None else None
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            if otel_current is not None:
+                otel_current.record_exception(e)
+            raise
+        finally:
+            span.end()
+            if otel_span is not None:
+                for key, value in span.attributes.items():
+                    if value is not None:
+                        otel_current.set_attribute(key, value if isinstance(value, (bool, int, float, str)) else str(value))
+                otel_span.__exit__(None, None, None)
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            if own_trace:
+                self.finish(trace)
+
+    def record(self, name: str, seconds: float, **attributes: Any) -> None:
+        """
+        Add an already-measured span ending now, e.g. a phase Ollama timed.
+
+        Args:
+            name (str): Operation name
+            seconds (float): Duration
+            **attributes: Span attributes
+        """
+        trace = _current_trace.get()
+        if not self.enabled or trace is None or trace.finished:
+            return
+        parent = _current_span.get()
+        span = Span(name, parent.span_id if parent else None, attributes)
+        span.started_at -= seconds
+        span.end(seconds)
+        trace.spans.append(span)
+
+        if self._otel is not None:
+            end_ns = time.time_ns()
+            otel_span = self._otel.start_span(name, start_time=end_ns - int(seconds * 1e9))
+            for key, value in attributes.items():
+                if value is not None:
+                    otel_span.set_attribute(key, value)
+            otel_span.end(end_time=end_ns)
+
+    def record_ollama_phases(self, response: Dict[str, Any]) -> None:
+        """
+        Record the load, prompt-eval and generation phases of an Ollama response.
+
+        Args:
+            response (Dict[str, Any]): Final Ollama response object, with
+                durations in nanoseconds
+        """
+        for phase, count_key in (("load", None), ("prompt_eval", "prompt_eval_count"), ("eval", "eval_count")):
+            duration_ns = response.get(f"{phase}_duration")
+            if duration_ns:
+                attributes = {"tokens": response[count_key]} if count_key and count_key in response else {}
+                self.record(f"ollama_{phase}", duration_ns / 1e9, **attributes)
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware that traces each HTTP request.
+
+    The response carries a ``Server-Timing`` header with the spans finished
+    before it started, so browsers show the breakdown in their network
+    panel. For streamed responses that covers only the work done before the
+    first byte; the exported trace has every span.
+    """
+
+    def __init__(self, app, tracer: Tracer):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            tracer (Tracer): Tracer that starts and exports the traces
+        """
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        trace = self.tracer.begin(f"{scope['method']} {scope['path']}")
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            self.tracer.finish(trace)
+
+
+def _metric_name(name: str) -> str:
+    """Make a span name a valid ``Server-Timing`` metric token."""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
@@ -0,0 +1,85 @@
+"""
+Upload Stream Module
+
+Reads uploaded files in bounded chunks, rejecting oversized uploads as
+soon as they cross the limit and hashing the content on the way in.
+"""
+
+import hashlib
+import os
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile
+
+
+class UploadTooLarge(HTTPException):
+    """Raised when an upload exceeds the size limit (HTTP 413)."""
+
+    def __init__(self, max_size: int):
+        super().__init__(status_code=413, detail=f"File too large (max {max_size // (1024 * 1024)}MB)")
+        self.max_size = max_size
+
+
+class IngestedUpload:
+    """An upload read into memory with its size and SHA-256 digest."""
+
+    def __init__(self, filename: str, content: bytearray, sha256: str):
+        self.filename = filename
+        self.content = content
+        self.sha256 = sha256
+
+    @property
+    def size(self) -> int:
+        """Content length in bytes."""
+        return len(self.content)
+
+
+async def read_upload(file: UploadFile, max_size: int, chunk_size: Optional[int] = None) -> IngestedUpload:
+    """
+    Read an upload chunk by chunk, enforcing ``max_size``.
+
+    The declared size is checked before reading anything. While reading,
+    the upload is abandoned at the first chunk that crosses the limit, so
+    an oversized file is never read much past ``max_size``.
+
+    Chunks are copied into one buffer preallocated at the declared size,
+    so the content is held once and reading peaks at the upload plus one
+    chunk (without a declared size the buffer grows as chunks arrive).
+    This is on top of the body Starlette has already spooled while parsing
+    the form: in memory up to 1 MiB per file, in a temporary file above
+    that. Parsers that wrap the content in ``io.BytesIO`` and process-pool
+    workers that receive it pickled each hold one more copy while they run.
+
+    Args:
+        file (UploadFile): The uploaded file
+        max_size (int): Maximum accepted size in bytes
+        chunk_size (int): Bytes read per chunk (``UPLOAD_CHUNK_SIZE``, 64 KiB)
+
+    Returns:
+        IngestedUpload: Content, size and SHA-256 hex digest
+
+    Raises:
+        UploadTooLarge: If the upload is larger than ``max_size``
+    """
+    chunk_size = chunk_size or int(os.getenv("UPLOAD_CHUNK_SIZE", 64 * 1024))
+
+    if file.size is not None and file.size > max_size:
+        raise UploadTooLarge(max_size)
+
+    digest = hashlib.sha256()
+    content = bytearray(file.size or 0)
+    received = 0
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        end = received + len(chunk)
+        if end > max_size:
+            raise UploadTooLarge(max_size)
+        digest.update(chunk)
+        # Same-length slice assignment copies in place; past the end it grows the buffer
+        content[received:end] = chunk
+        received = end
+
+    del content[received:]
+    return IngestedUpload(file.filename or "", content, digest.hexdigest())